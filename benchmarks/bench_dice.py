@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark dice coefficient of one query against thousands of candidates.
+
+Compares the original per-call implementation with L{misc.BigramProfile},
+with cold and warm profile caches.
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import misc
+
+
+def reference_dice(a, b, ignore_case=True):
+    """
+    Dice coefficient as it was computed before L{misc.BigramProfile}
+    """
+    if not len(a) or not len(b):
+        return 0.0
+
+    if ignore_case:
+        a = a.lower()
+        b = b.lower()
+
+    if len(a) == 1:
+        a = a + u'.'
+    if len(b) == 1:
+        b = b + u'.'
+
+    a_bigrams = set(a[i:i + 2] for i in range(len(a) - 1))
+    b_bigrams = set(b[i:i + 2] for i in range(len(b) - 1))
+    overlap = len(a_bigrams & b_bigrams)
+    return overlap * 2.0 / (len(a_bigrams) + len(b_bigrams))
+
+
+def candidates(count, seed=0):
+    rand = random.Random(seed)
+    alphabet = string.ascii_letters + ' '
+    return [''.join(rand.choice(alphabet)
+                    for _ in range(rand.randint(5, 40)))
+            for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--candidates', type=int, default=5000)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    query = 'The Big Bang Theory'
+    names = candidates(args.candidates)
+
+    assert ([reference_dice(name, query) for name in names] ==
+            [misc.dice_coefficient(name, query) for name in names])
+
+    def reference():
+        for name in names:
+            reference_dice(name, query)
+
+    def cold():
+        misc._profiles.clear()
+        profile = misc.BigramProfile(query)
+        for name in names:
+            misc.BigramProfile(name).dice(profile)
+
+    profiles = [misc.BigramProfile(name) for name in names]
+
+    def warm():
+        profile = misc.bigram_profile(query)
+        for candidate in profiles:
+            candidate.dice(profile)
+
+    for name, func in [('reference', reference),
+                       ('profile (cold)', cold),
+                       ('profile (warm)', warm)]:
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print '%-16s %8.2f ms for %d candidates' % (
+            name, best * 1000, len(names))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark gzip transfers of XML-RPC requests and answers.
+
+A local stand-in for OpenSubtitles answers CheckMovieHash2, SearchSubtitles
+and DownloadSubtitles for a batch of hashes, with answers shaped like the
+real ones, over a link throttled to the given bandwidth. The same batch is
+sent uncompressed, gzipped both ways, and to a server refusing gzipped
+requests (so the transport falls back to uncompressed requests).
+
+Bytes are counted by the server: request bodies, and whole answers.
+"""
+
+import argparse
+import base64
+import os
+import random
+import sys
+import threading
+import time
+import xmlrpclib
+import zlib
+from SimpleXMLRPCServer import SimpleXMLRPCRequestHandler
+from SimpleXMLRPCServer import SimpleXMLRPCServer
+from SocketServer import ThreadingMixIn
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import network
+
+WORDS = ['the', 'you', 'what', 'this', 'know', 'come', 'here', 'right',
+         'think', 'going', 'want', 'tell', 'never', 'again', 'really']
+
+
+class Throttled(object):
+    """
+    Socket file writing at a limited bandwidth, counting what it writes
+    """
+    def __init__(self, wfile, server):
+        self.wfile = wfile
+        self.server = server
+
+    def write(self, data):
+        self.server.throttle(len(data), 'received')
+        self.wfile.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.wfile, name)
+
+
+class Handler(SimpleXMLRPCRequestHandler):
+    def setup(self):
+        SimpleXMLRPCRequestHandler.setup(self)
+        self.wfile = Throttled(self.wfile, self.server)
+
+    def decode_request_content(self, data):
+        self.server.throttle(len(data), 'sent')
+        if self.server.refuse_gzip and self.headers.get(
+                'content-encoding', 'identity') != 'identity':
+            self.send_response(415, 'Unsupported Media Type')
+            self.send_header('Content-length', '0')
+            self.end_headers()
+            return None
+        return SimpleXMLRPCRequestHandler.decode_request_content(self, data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandIn(ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+
+    def __init__(self, bandwidth, refuse_gzip=False, seed=0):
+        SimpleXMLRPCServer.__init__(self, ('127.0.0.1', 0), Handler,
+                                    logRequests=False)
+        self.bandwidth = bandwidth
+        self.refuse_gzip = refuse_gzip
+        self.rand = random.Random(seed)
+        self.counts = {'sent': 0, 'received': 0}
+        self.lock = threading.Lock()
+        self.register_function(self.check, 'CheckMovieHash2')
+        self.register_function(self.search, 'SearchSubtitles')
+        self.register_function(self.download, 'DownloadSubtitles')
+
+    def throttle(self, size, direction):
+        with self.lock:
+            self.counts[direction] += size
+        if self.bandwidth:
+            time.sleep(size / self.bandwidth)
+
+    def text(self, words):
+        return ' '.join(self.rand.choice(WORDS) for _ in range(words))
+
+    def check(self, token, hashes):
+        data = dict((moviehash, [{
+            'MovieHash': moviehash,
+            'MovieImdbID': str(self.rand.randint(1, 10 ** 7)),
+            'MovieName': self.text(3).title(),
+            'MovieYear': str(self.rand.randint(1950, 2019)),
+            'MovieKind': 'episode',
+            'SeriesSeason': str(self.rand.randint(1, 10)),
+            'SeriesEpisode': str(self.rand.randint(1, 24)),
+            'SeenCount': str(self.rand.randint(1, 1000)),
+            'SubCount': str(self.rand.randint(1, 50)),
+        }]) for moviehash in hashes)
+        return {'status': '200 OK', 'data': data, 'seconds': '0.01'}
+
+    def search(self, token, criteria):
+        data = []
+        for criterion in criteria:
+            for _ in range(5):
+                data.append({
+                    'MovieHash': criterion['moviehash'],
+                    'SubLanguageID': criterion['sublanguageid'],
+                    'IDSubtitleFile': str(self.rand.randint(1, 10 ** 10)),
+                    'SubFileName': self.text(4).replace(' ', '.') + '.srt',
+                    'MovieReleaseName': self.text(6),
+                    'SubAuthorComment': self.text(10),
+                    'SubDownloadLink': 'http://dl.opensubtitles.org/en/'
+                    'download/src-api/vrf-%x/filead/%d.gz' % (
+                        self.rand.getrandbits(40),
+                        self.rand.randint(1, 10 ** 10)),
+                    'SubAddDate': '2011-03-02 10:42:15',
+                    'SubRating': '0.0',
+                    'SubDownloadsCnt': str(self.rand.randint(1, 10 ** 5)),
+                    'UserNickName': self.text(1),
+                    'LanguageName': 'English',
+                    'SubFormat': 'srt',
+                    'SubEncoding': 'UTF-8',
+                })
+        return {'status': '200 OK', 'data': data, 'seconds': '0.05'}
+
+    def download(self, token, ids):
+        data = []
+        for subtitleid in ids:
+            lines = ['%d\n00:00:%02d,000 --> 00:00:%02d,500\n%s\n' % (
+                number, number % 60, number % 60, self.text(8))
+                for number in range(600)]
+            data.append({
+                'idsubtitlefile': subtitleid,
+                'data': base64.b64encode(zlib.compress('\n'.join(lines))),
+            })
+        return {'status': '200 OK', 'data': data, 'seconds': '0.05'}
+
+
+def batch(proxy, hashes):
+    proxy.CheckMovieHash2('token', hashes)
+    answer = proxy.SearchSubtitles('token', [
+        {'moviehash': moviehash, 'moviebytesize': '734003200',
+         'sublanguageid': 'eng'} for moviehash in hashes])
+    ids = list(set(result['IDSubtitleFile'] for result in answer['data']))
+    proxy.DownloadSubtitles('token', ids[:len(hashes)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--hashes', type=int, default=200)
+    parser.add_argument('--bandwidth', type=float, default=1024,
+                        help='KB/s of the link, 0 for unlimited')
+    args = parser.parse_args()
+
+    rand = random.Random(0)
+    hashes = ['%016x' % rand.getrandbits(64) for _ in range(args.hashes)]
+
+    runs = [
+        ('plain', False, None, False),
+        ('gzip', False, network.DEFAULT_ENCODE_THRESHOLD, True),
+        ('refusing', True, network.DEFAULT_ENCODE_THRESHOLD, True),
+    ]
+    for label, refuse_gzip, threshold, accept_gzip in runs:
+        server = StandIn(args.bandwidth * 1024, refuse_gzip)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        transport = network.TimeoutTransport(encode_threshold=threshold,
+                                             accept_gzip=accept_gzip)
+        proxy = xmlrpclib.ServerProxy(
+            'http://127.0.0.1:%d/RPC2' % server.server_address[1],
+            transport=transport)
+        begin = time.time()
+        batch(proxy, hashes)
+        elapsed = time.time() - begin
+        server.shutdown()
+        server.server_close()
+
+        print '%-9s %8.1f KB sent %8.1f KB received %8.2f s' % (
+            label, server.counts['sent'] / 1024.0,
+            server.counts['received'] / 1024.0, elapsed)
+
+
+if __name__ == '__main__':
+    main()
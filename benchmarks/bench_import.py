@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark import time of iso639 and of the CLI modules.
+
+Each import runs in a fresh interpreter, and the time of an empty
+interpreter is subtracted. The first L{iso639.find_language} call, which
+unpacks the table and builds the index it needs, is timed separately.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+STATEMENTS = [
+    ('interpreter', 'pass'),
+    ('import iso639', 'import iso639'),
+    ('first lookup', 'import iso639; iso639.find_language("fr")'),
+    ('import subgetter', 'import subgetter'),
+]
+
+
+def timed(statement, repeat):
+    best = None
+    for _ in range(repeat):
+        begin = time.time()
+        subprocess.check_call([sys.executable, '-c', statement], cwd=ROOT)
+        elapsed = time.time() - begin
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-r', '--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    # Make sure .pyc files exist, as they would once installed
+    subprocess.check_call([sys.executable, '-m', 'compileall', '-q', ROOT])
+
+    baseline = None
+    for label, statement in STATEMENTS:
+        elapsed = timed(statement, args.repeat)
+        if baseline is None:
+            baseline = elapsed
+            print '%-18s %8.2f ms' % (label, elapsed * 1000)
+        else:
+            print '%-18s %8.2f ms (+%.2f ms)' % (
+                label, elapsed * 1000, (elapsed - baseline) * 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark peak memory of a run against the number of files.
+
+Each run happens in a fresh interpreter, on a directory of sparse movie
+files, with a fake provider answering instantly with an 8 KB subtitle for
+every file. Peak RSS should stay roughly the same whatever the number of
+files, since the pipeline only holds a bounded window of them. What is
+left grows with the listing of the directory being walked, here all the
+files are in the same one.
+
+With --resume, the run resumes from the journal of a previous run that
+settled every file, and is compacted when it finishes: what grows then is
+the index of the settled files, see L{journal}.
+"""
+
+import argparse
+import logging
+import os
+import resource
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+
+SUBTITLE = 'x' * 8192
+
+
+class FakeOSDb(object):
+    def check_hashes(self, hashes):
+        return dict((moviehash, [{'MovieName': 'Movie Name',
+                                  'MovieYear': '2010',
+                                  'MovieKind': 'movie',
+                                  'SeriesSeason': '0',
+                                  'SeriesEpisode': '0',
+                                  'MovieImdbID': '1'}])
+                    for moviehash in hashes)
+
+    def search_on_imdb(self, query):
+        return []
+
+    def download_subtitles_languages(self, movies, languages):
+        return dict(((movie['hash'], language), SUBTITLE)
+                    for movie in movies for language in languages)
+
+
+def make_files(directory, count):
+    for index in range(count):
+        path = os.path.join(directory, 'Movie.Name.2010.%07d.avi' % index)
+        with open(path, 'wb') as f:
+            # Distinct hashes, without writing whole files
+            f.write(struct.pack('<q', index))
+            f.truncate(256 * 1024)
+
+
+def previous_run(path, directory):
+    """
+    Write the journal of a run that settled every file of directory
+    """
+    import json
+    import subgetter
+
+    with open(path, 'wb') as f:
+        for moviepath in subgetter.find_movies([directory]):
+            stat = os.stat(moviepath)
+            for record in (['h', moviepath, '%016x' % stat.st_ino,
+                            stat.st_size, stat.st_mtime],
+                           ['i', moviepath, 'Movie Name', 'movie', 1, 0, 0],
+                           ['f', moviepath, 'eng'],
+                           ['w', moviepath, 'eng']):
+                f.write(json.dumps(record) + '\n')
+
+
+def child(count, resume):
+    logging.basicConfig(level=logging.WARNING)
+    import journal
+    import subgetter
+
+    directory = tempfile.mkdtemp()
+    try:
+        make_files(directory, count)
+        path = os.path.join(directory, 'journal')
+        if resume:
+            previous_run(path, directory)
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        begin = time.time()
+        checkpoints = journal.Journal(path, resume=resume, languages=['eng'])
+        files = subgetter.build_pipeline(
+            FakeOSDb(), subgetter.AutomaticAsker(0.7),
+            [subgetter.select_language('eng')], checkpoints=checkpoints)
+        files.run(subgetter.find_movies([directory]),
+                  output=lambda written: None)
+        checkpoints.close(finished=True)
+        elapsed = time.time() - begin
+        sys.stdout = stdout
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print '%d %d %f' % (baseline, peak, elapsed)
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--counts', default='500,2000,8000',
+                        help='Comma separated numbers of files')
+    parser.add_argument('--resume', action='store_true',
+                        help='Resume from the journal of a previous run')
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(args.child, args.resume)
+        return
+
+    print '%8s %12s %12s %10s' % ('files', 'start (KB)', 'peak (KB)',
+                                  'files/s')
+    for count in [int(count) for count in args.counts.split(',')]:
+        output = subprocess.check_output(
+            [sys.executable, __file__, '--child', str(count)] +
+            (['--resume'] if args.resume else []))
+        baseline, peak, elapsed = output.split()
+        print '%8d %12s %12s %10.0f' % (count, baseline, peak,
+                                        count / float(elapsed))
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark release name parsing over synthetic release names.
+
+Times L{release.parse} on unique names (cold), and again on the same names
+(memoized).
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import release
+
+WORDS = ['the', 'big', 'bang', 'theory', 'lost', 'house', 'office', 'dark',
+         'knight', 'game', 'of', 'thrones', 'breaking', 'bad', 'wire']
+QUALITY = ['720p', '1080p', '2160p', 'HDTV', 'WEB-DL', 'BluRay', 'x264',
+           'XviD', 'HEVC', 'PROPER']
+GROUPS = ['LOL', 'DIMENSION', 'KILLERS', 'SPARKS', 'NTb']
+EXTENSIONS = ['avi', 'mkv', 'mp4']
+
+
+def release_names(count, seed=0):
+    rand = random.Random(seed)
+    names = []
+    for number in range(count):
+        title = '.'.join(rand.choice(WORDS).capitalize()
+                         for _ in range(rand.randint(1, 4)))
+        kind = rand.randint(0, 3)
+        if kind == 0:
+            marker = 'S%02dE%02d' % (rand.randint(1, 20), rand.randint(1, 24))
+        elif kind == 1:
+            marker = '%dx%02d' % (rand.randint(1, 20), rand.randint(1, 24))
+        elif kind == 2:
+            episode = rand.randint(1, 23)
+            marker = 'S%02dE%02dE%02d' % (rand.randint(1, 20), episode,
+                                         episode + 1)
+        else:
+            marker = str(rand.randint(1950, 2019))
+        quality = '.'.join(rand.sample(QUALITY, rand.randint(1, 3)))
+        # The number keeps names unique, so the cold run parses them all
+        names.append('%s.%s.%s.%d-%s.%s' % (
+            title, marker, quality, number, rand.choice(GROUPS),
+            rand.choice(EXTENSIONS)))
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--names', type=int, default=100000)
+    args = parser.parse_args()
+
+    names = release_names(args.names)
+    release.CACHE_SIZE = max(release.CACHE_SIZE, len(names))
+    release._cache.clear()
+
+    for label in ('cold', 'memoized'):
+        begin = time.time()
+        for name in names:
+            release.parse(name)
+        elapsed = time.time() - begin
+        print '%-9s %8.2f s for %d names (%.1f us/name)' % (
+            label, elapsed, len(names), elapsed * 1e6 / len(names))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark decoding of SearchSubtitles answers.
+
+Times stock C{xmlrpclib} against L{xmlrpcstream}, keeping every field,
+keeping only the fields we use, and also stopping at the first subtitle
+of each (hash, language). Answers are fed in the chunks the transport
+reads.
+
+Answers are synthetic, shaped like the ones of OpenSubtitles, unless a
+cassette recorded with --record is given: its SearchSubtitles answers are
+then used.
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import sys
+import time
+import xmlrpclib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import opensubtitles
+import xmlrpcstream
+
+CHUNK_SIZE = 1024
+"Size of the chunks xmlrpclib transports read"
+LANGUAGES = ['eng', 'fre', 'spa', 'ger', 'ita', 'por', 'dut', 'pol']
+# Fields of a result, besides the ones computed in search_answer
+FIELDS = ['MatchedBy', 'IDSubMovieFile', 'MovieByteSize', 'MovieTimeMS',
+          'SubFileName', 'SubActualCD', 'SubSize', 'SubHash', 'SubLastTS',
+          'SubTSGroup', 'IDSubtitle', 'UserID', 'SubFormat', 'SubSumCD',
+          'SubAuthorComment', 'SubAddDate', 'SubBad', 'SubRating',
+          'SubSumVotes', 'SubDownloadsCnt', 'MovieReleaseName', 'MovieFPS',
+          'IDMovie', 'MovieName', 'MovieNameEng', 'MovieYear',
+          'MovieImdbRating', 'SubFeatured', 'UserNickName', 'SubTranslator',
+          'ISO639', 'LanguageName', 'SubComments', 'SubHearingImpaired',
+          'UserRank', 'SeriesSeason', 'SeriesEpisode', 'MovieKind', 'SubHD',
+          'SeriesIMDBParent', 'SubEncoding', 'SubAutoTranslation',
+          'SubForeignPartsOnly', 'SubFromTrusted', 'QueryCached',
+          'SubTSGroupHash', 'SubDownloadLink', 'ZipDownloadLink',
+          'SubtitlesLink', 'QueryNumber', 'Score']
+
+
+def search_answer(hashes, languages, subtitles, seed=0):
+    """
+    @return: SearchSubtitles answer with some subtitles for each hash and
+    language, grouped by hash like the ones of OpenSubtitles
+    """
+    rand = random.Random(seed)
+    data = []
+    for number in range(hashes):
+        moviehash = '%016x' % rand.getrandbits(64)
+        for language in languages:
+            for _ in range(subtitles):
+                result = dict((field, '%x' % rand.getrandbits(rand.randint(
+                    4, 160))) for field in FIELDS)
+                result.update({
+                    'MovieHash': moviehash,
+                    'SubLanguageID': language,
+                    'IDSubtitleFile': str(rand.randint(1, 10 ** 10)),
+                    'IDMovieImdb': str(1000000 + number),
+                })
+                data.append(result)
+    answer = {'status': '200 OK', 'data': data, 'seconds': '0.123'}
+    return xmlrpclib.dumps((answer,), methodresponse=True)
+
+
+def recorded_answers(path):
+    """
+    @return: SearchSubtitles answers of a cassette
+    """
+    answers = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            exchange = json.loads(line)
+            if (exchange['kind'] == 'xmlrpc' and
+                    'SearchSubtitles' in exchange['data']):
+                answers.append(base64.b64decode(exchange['body']))
+    return answers
+
+
+def decode(parser, unmarshaller, body):
+    for start in xrange(0, len(body), CHUNK_SIZE):
+        parser.feed(body[start:start + CHUNK_SIZE])
+    parser.close()
+    return unmarshaller.close()
+
+
+def first_subtitles(wanted):
+    remaining = set(wanted)
+
+    def enough(data):
+        remaining.discard((data.get('MovieHash'), data.get('SubLanguageID')))
+        return not remaining
+    return enough
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--hashes', type=int, default=100)
+    parser.add_argument('--languages', type=int, default=2)
+    parser.add_argument('--subtitles', type=int, default=10,
+                        help='Subtitles per hash and language')
+    parser.add_argument('--cassette', help='Use the answers recorded there')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.cassette:
+        bodies = recorded_answers(args.cassette)
+    else:
+        bodies = [search_answer(args.hashes, LANGUAGES[:args.languages],
+                                args.subtitles)]
+    size = sum(len(body) for body in bodies)
+    print '%d answers, %.1f KB' % (len(bodies), size / 1024.0)
+
+    wanted = {}
+    for body in bodies:
+        data = xmlrpclib.loads(body)[0][0]['data'] or []
+        wanted[body] = set((result['MovieHash'], result['SubLanguageID'])
+                           for result in data)
+
+    fields = opensubtitles.OpenSubtitles.SEARCH_FIELDS
+    decoders = [
+        ('xmlrpclib', lambda body: xmlrpclib.getparser()),
+        ('stream', lambda body: xmlrpcstream.getparser()),
+        ('fields', lambda body: xmlrpcstream.getparser(fields)),
+        ('first', lambda body: xmlrpcstream.getparser(
+            fields, first_subtitles(wanted[body]))),
+    ]
+    reference = None
+    for label, getparser in decoders:
+        best = None
+        for _ in range(args.repeat):
+            begin = time.time()
+            for body in bodies:
+                parser, unmarshaller = getparser(body)
+                decode(parser, unmarshaller, body)
+            elapsed = time.time() - begin
+            best = elapsed if best is None else min(best, elapsed)
+        reference = reference or best
+        print '%-10s %8.1f ms (%.1f MB/s, x%.1f)' % (
+            label, best * 1000, size / best / 1024 / 1024, reference / best)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+"""
+Record and replay network exchanges of the providers.
+
+In record mode, every HTTP request made by L{tvsubtitles} and every
+XML-RPC call made by L{opensubtitles} goes to the network as usual, and
+the answer is appended to a cassette file. In replay mode, the answers are
+served from the cassette, optionally after an injected latency, and nothing
+touches the network.
+
+Replayed XML-RPC answers are still parsed by C{xmlrpclib}, and replayed
+pages are still scraped by the regexes of L{tvsubtitles}, so that the CPU
+side of the pipeline can be timed without network access.
+
+Each line of a cassette is a JSON object::
+
+    {"kind": "http" or "xmlrpc", "url": ..., "data": ..., "body": base64}
+"""
+
+import base64
+import collections
+import json
+import logging
+import threading
+import time
+import xmlrpclib
+
+import network
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+
+class CassetteMiss(Exception):
+    """
+    Raised in replay mode when a request is not in the cassette
+    """
+
+
+class Cassette(object):
+    """
+    Cassette file of recorded exchanges.
+
+    Identical requests are replayed in the order they were recorded, and
+    the last answer is reused once they are exhausted.
+    """
+    def __init__(self, path, mode=REPLAY, latency=0.0):
+        """
+        Open cassette
+
+        @param path: Path of the cassette file
+        @param mode: L{RECORD} or L{REPLAY}
+        @param latency: Seconds to wait before serving each replayed answer
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError('Invalid cassette mode: %s' % mode)
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.logger = logging.getLogger(__name__)
+        self.exchanges = collections.defaultdict(collections.deque)
+        self.last = {}
+        self.lock = threading.Lock()
+
+        if mode == REPLAY:
+            self.__load()
+
+    def __load(self):
+        with open(self.path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                exchange = json.loads(line)
+                key = (exchange['kind'], exchange['url'], exchange['data'])
+                self.exchanges[key].append(
+                    base64.b64decode(exchange['body']))
+
+    def __record(self, kind, url, data, body):
+        exchange = {
+            'kind': kind,
+            'url': url,
+            'data': data,
+            'body': base64.b64encode(body),
+        }
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(exchange) + '\n')
+
+    def __replay(self, kind, url, data):
+        key = (kind, url, data)
+        if self.exchanges[key]:
+            self.last[key] = self.exchanges[key].popleft()
+        elif key not in self.last:
+            raise CassetteMiss('%s %s not in cassette' % (kind, url))
+
+        return self.last[key]
+
+    def play(self, kind, url, data, fetch):
+        """
+        Get the answer to a request
+
+        @param kind: Kind of exchange ('http' or 'xmlrpc')
+        @param url: Url of the request
+        @param data: Body of the request, None for GET
+        @param fetch: Function without arguments doing the actual request,
+        only called in record mode
+        @return: Body of the answer
+        """
+        if self.mode == REPLAY:
+            if self.latency:
+                time.sleep(self.latency)
+            self.logger.debug('Replay: %s %s', kind, url)
+            with self.lock:
+                return self.__replay(kind, url, data)
+
+        body = fetch()
+        with self.lock:
+            self.__record(kind, url, data, body)
+        return body
+
+    def transport(self, connect_timeout=network.DEFAULT_CONNECT_TIMEOUT,
+                  read_timeout=network.DEFAULT_READ_TIMEOUT,
+                  encode_threshold=network.DEFAULT_ENCODE_THRESHOLD):
+        """
+        @param connect_timeout: Seconds to wait for a connection when
+        recording
+        @param read_timeout: Seconds to wait for data when recording
+        @param encode_threshold: Size in bytes above which requests are
+        gzipped when recording, None to never gzip them
+        @return: C{xmlrpclib} transport recording to or replaying from this
+        cassette
+        """
+        return CassetteTransport(self, connect_timeout, read_timeout,
+                                 encode_threshold)
+
+
+class CassetteTransport(network.TimeoutTransport):
+    """
+    XML-RPC transport going through a L{Cassette}.
+
+    Raw XML answers are recorded (uncompressed), and replayed answers are
+    fed to the usual C{xmlrpclib} parser.
+    """
+    def __init__(self, cassette, connect_timeout=None, read_timeout=None,
+                 encode_threshold=None):
+        network.TimeoutTransport.__init__(self, connect_timeout, read_timeout,
+                                          encode_threshold)
+        self.cassette = cassette
+        self.__body = None
+
+    def request(self, host, handler, request_body, verbose=0):
+        url = 'http://%s%s' % (host, handler)
+
+        def fetch():
+            self.__body = None
+            network.TimeoutTransport.request(
+                self, host, handler, request_body, verbose)
+            return self.__body
+
+        body = self.cassette.play('xmlrpc', url, request_body, fetch)
+
+        return self.__parse(body)
+
+    def parse_response(self, response):
+        # Called by the real transport in record mode: keep the raw answer
+        # so that it is recorded and parsed like a replayed one.
+        if response.getheader('Content-Encoding', '') == 'gzip':
+            response = xmlrpclib.GzipDecodedResponse(response)
+        self.__body = response.read()
+        return None
+
+    def __parse(self, body):
+        parser, unmarshaller = self.getparser()
+        parser.feed(body)
+        parser.close()
+
+        return unmarshaller.close()
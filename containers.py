@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+"""
+Probe media containers for the subtitle tracks they carry.
+
+Only the headers are read, through a L{readers.Reader}:
+
+  - Matroska (mkv, webm): the top level elements of the Segment are
+    skipped over until the Tracks element, found directly or through the
+    SeekHead, and only Tracks is read.
+  - MP4 (mp4, m4v, mov): top level boxes are skipped over until the moov
+    box, and only its track headers are read.
+
+Forced tracks (that only cover foreign parts) and disabled tracks don't
+count as subtitles.
+"""
+
+import logging
+import struct
+
+import iso639
+import readers
+
+HEADER_MAX_SIZE = 16 * 1024 * 1024
+"Largest Tracks element, or moov box, we read at once"
+
+# Matroska element ids
+EBML = 0x1A45DFA3
+SEGMENT = 0x18538067
+SEEK_HEAD = 0x114D9B74
+SEEK = 0x4DBB
+SEEK_ID = 0x53AB
+SEEK_POSITION = 0x53AC
+TRACKS = 0x1654AE6B
+CLUSTER = 0x1F43B675
+TRACK_ENTRY = 0xAE
+TRACK_TYPE = 0x83
+FLAG_ENABLED = 0xB9
+FLAG_FORCED = 0x55AA
+LANGUAGE = 0x22B59C
+LANGUAGE_IETF = 0x22B59D
+
+MATROSKA_SUBTITLE = 0x11
+MP4_SUBTITLE_HANDLERS = ('sbtl', 'subt', 'clcp')
+MP4_BRANDS = ('ftyp', 'moov', 'mdat', 'free', 'skip', 'wide')
+
+
+def subtitle_languages(reader):
+    """
+    List the languages of the subtitle tracks of a movie file
+
+    @param reader: L{readers.Reader} of the file
+    @return: Set of three letters codes (as in L{iso639}), empty if the
+    container isn't known or has no subtitle track
+    """
+    head = reader.read(0, 8)
+    if len(head) < 8:
+        return set()
+
+    if struct.unpack('>I', head[:4])[0] == EBML:
+        codes = _matroska_languages(reader)
+    elif head[4:8] in MP4_BRANDS:
+        codes = _mp4_languages(reader)
+    else:
+        return set()
+
+    languages = set()
+    for code in codes:
+        language = _find_language(code)
+        if language:
+            languages.add(language)
+    return languages
+
+
+def probe(location):
+    """
+    L{subtitle_languages} of a location, errors aside
+
+    @param location: See L{readers.open_reader}
+    @return: Set of three letters codes, empty if the file can't be read
+    """
+    try:
+        with readers.open_reader(location) as reader:
+            return subtitle_languages(reader)
+    except Exception as e:
+        logging.getLogger(__name__).debug('Unable to probe %s: %s',
+                                          location, e)
+        return set()
+
+
+def _find_language(code):
+    # IETF tags (en-US, pt-BR...) start with the ISO 639 code
+    code = code.split('\0')[0].split('-')[0].strip().lower()
+    if len(code) not in (2, 3):
+        return None
+    language = iso639.find_language(code, '2L' if len(code) == 2 else '3L')
+    return language and language['3L'] or None
+
+
+def _vint(data, position, marker=False):
+    """
+    Decode an EBML variable size integer
+
+    @param data: Bytes
+    @param position: Position of the integer in data
+    @param marker: Keep the length marker (for element ids)
+    @return: Tuple (value, length), value is None for unknown sizes
+    """
+    first = ord(data[position])
+    length = 1
+    while length <= 8 and not first & (0x80 >> (length - 1)):
+        length += 1
+    if length > 8 or position + length > len(data):
+        raise Exception('Bad EBML integer')
+
+    value = first if marker else first & (0xFF >> length)
+    for byte in data[position + 1:position + length]:
+        value = (value << 8) | ord(byte)
+    if not marker and value == (1 << (7 * length)) - 1:
+        value = None
+    return value, length
+
+
+def _element(reader, offset):
+    """
+    @return: Tuple (id, size, data offset) of the element at offset
+    """
+    header = reader.read(offset, 12)
+    element, id_length = _vint(header, 0, marker=True)
+    size, size_length = _vint(header, id_length)
+    return element, size, offset + id_length + size_length
+
+
+def _children(reader, start, end):
+    """
+    @return: Iterator of (id, size, data offset) of the elements in a range
+    """
+    offset = start
+    while offset < end:
+        element, size, data = _element(reader, offset)
+        if size is None:
+            size = end - data
+        yield element, size, data
+        offset = data + size
+
+
+def _unsigned(data):
+    value = 0
+    for byte in data:
+        value = (value << 8) | ord(byte)
+    return value
+
+
+def _matroska_languages(reader):
+    element, size, data = _element(reader, 0)
+    element, size, segment = _element(reader, data + size)
+    if element != SEGMENT:
+        return []
+    end = reader.size if size is None else min(segment + size, reader.size)
+
+    tracks = None
+    for element, size, data in _children(reader, segment, end):
+        if element == TRACKS:
+            tracks = (size, data)
+            break
+        if element == SEEK_HEAD and size <= HEADER_MAX_SIZE:
+            seeks = readers.BytesReader(reader.read(data, size))
+            for position in _matroska_seeks(seeks, TRACKS):
+                element, size, data = _element(reader, segment + position)
+                if element == TRACKS:
+                    tracks = (size, data)
+            if tracks:
+                break
+        if element == CLUSTER:
+            # Media data started, and we don't know where Tracks is
+            return []
+
+    if not tracks or tracks[0] > HEADER_MAX_SIZE:
+        return []
+    body = readers.BytesReader(reader.read(tracks[1], tracks[0]))
+
+    languages = []
+    for element, size, data in _children(body, 0, body.size):
+        if element != TRACK_ENTRY:
+            continue
+        fields = {FLAG_ENABLED: '\x01', LANGUAGE: 'eng'}
+        for field, length, position in _children(body, data, data + size):
+            fields[field] = body.read(position, length)
+        if (_unsigned(fields.get(TRACK_TYPE, '')) == MATROSKA_SUBTITLE and
+                _unsigned(fields[FLAG_ENABLED]) and
+                not _unsigned(fields.get(FLAG_FORCED, ''))):
+            languages.append(fields.get(LANGUAGE_IETF) or fields[LANGUAGE])
+    return languages
+
+
+def _matroska_seeks(reader, wanted):
+    """
+    @return: Positions, relative to the segment, given by a SeekHead for an
+    element id
+    """
+    for element, size, data in _children(reader, 0, reader.size):
+        if element != SEEK:
+            continue
+        fields = {}
+        for field, length, position in _children(reader, data, data + size):
+            fields[field] = reader.read(position, length)
+        if _unsigned(fields.get(SEEK_ID, '')) == wanted:
+            yield _unsigned(fields.get(SEEK_POSITION, ''))
+
+
+def _boxes(reader, start, end):
+    """
+    @return: Iterator of (type, data offset, end offset) of the MP4 boxes
+    in a range
+    """
+    offset = start
+    while offset + 8 <= end:
+        header = reader.read(offset, 16)
+        size, kind = struct.unpack('>I4s', header[:8])
+        header_size = 8
+        if size == 1:
+            (size,) = struct.unpack('>Q', header[8:16])
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size:
+            return
+        yield kind, offset + header_size, min(offset + size, end)
+        offset += size
+
+
+def _find_box(reader, start, end, wanted):
+    for kind, data, box_end in _boxes(reader, start, end):
+        if kind == wanted:
+            return data, box_end
+    return None
+
+
+def _mp4_languages(reader):
+    moov = _find_box(reader, 0, reader.size, 'moov')
+    if not moov:
+        return []
+    if moov[1] - moov[0] <= HEADER_MAX_SIZE:
+        reader = readers.BytesReader(reader.read(moov[0], moov[1] - moov[0]))
+        moov = (0, reader.size)
+
+    languages = []
+    for kind, data, end in _boxes(reader, moov[0], moov[1]):
+        if kind != 'trak':
+            continue
+        tkhd = _find_box(reader, data, end, 'tkhd')
+        mdia = _find_box(reader, data, end, 'mdia')
+        if not tkhd or not mdia:
+            continue
+        # Version and flags, the first flag tells if the track is enabled
+        if not ord(reader.read(tkhd[0] + 3, 1) or '\0') & 0x1:
+            continue
+
+        boxes = dict((kind, (box, box_end)) for kind, box, box_end
+                     in _boxes(reader, mdia[0], mdia[1]))
+        if 'hdlr' not in boxes or 'mdhd' not in boxes:
+            continue
+        if reader.read(boxes['hdlr'][0] + 8, 4) not in MP4_SUBTITLE_HANDLERS:
+            continue
+
+        if 'elng' in boxes:
+            start, box_end = boxes['elng']
+            languages.append(reader.read(start + 4, box_end - start - 4))
+            continue
+        start = boxes['mdhd'][0]
+        version = ord(reader.read(start, 1))
+        start += 4 + (28 if version == 1 else 16)
+        (packed,) = struct.unpack('>H', reader.read(start, 2))
+        languages.append(''.join(chr(((packed >> shift) & 0x1F) + 0x60)
+                                 for shift in (10, 5, 0)))
+    return languages
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+"""
+On-disk HTTP cache with conditional revalidation.
+
+Responses to GET requests are stored with their C{ETag} and
+C{Last-Modified} headers. Within the freshness window they are served
+directly from disk; after that, the request is sent with
+C{If-None-Match}/C{If-Modified-Since} and a C{304 Not Modified} answer is
+served from disk too.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import urllib2
+
+import misc
+
+DEFAULT_PATH = misc.cache_path('http')
+"Default location of the cache"
+DEFAULT_FRESHNESS = 24 * 60 * 60
+"Number of seconds during which a response is used without revalidation"
+
+
+class HTTPCache(object):
+    """
+    Cache GET responses on disk, and revalidate them once stale.
+    """
+    def __init__(self, path=DEFAULT_PATH, freshness=DEFAULT_FRESHNESS):
+        """
+        Create (or open) cache
+
+        @param path: Directory where responses are stored
+        @param freshness: Seconds before a response must be revalidated
+        """
+        self.path = path
+        self.freshness = freshness
+        self.logger = logging.getLogger(__name__)
+
+    def __paths(self, url):
+        key = hashlib.sha1(url).hexdigest()
+        base = os.path.join(self.path, key[:2], key[2:])
+        return base + '.meta', base + '.body'
+
+    def __load(self, url):
+        """
+        Load cached response for url
+
+        @return: Tuple (meta, body), (None, None) if not cached
+        """
+        metapath, bodypath = self.__paths(url)
+        try:
+            with open(metapath) as f:
+                meta = json.load(f)
+            with open(bodypath, 'rb') as f:
+                body = f.read()
+        except (IOError, ValueError):
+            return None, None
+
+        if meta.get('url') != url:
+            return None, None
+
+        return meta, body
+
+    def __save(self, url, meta, body):
+        metapath, bodypath = self.__paths(url)
+        if body is not None:
+            misc.atomic_write(bodypath, body)
+        misc.atomic_write(metapath, json.dumps(meta))
+
+    def fetch(self, url, opener=urllib2.urlopen):
+        """
+        Get the body of url, from the cache if possible
+
+        @param url: Url to GET
+        @param opener: Function used to send a urllib2.Request
+        @return: Body of the response
+        """
+        meta, body = self.__load(url)
+        now = time.time()
+
+        if meta and now - meta['date'] < self.freshness:
+            self.logger.debug('Cache fresh: %s', url)
+            return body
+
+        request = urllib2.Request(url)
+        if meta:
+            if meta.get('etag'):
+                request.add_header('If-None-Match', meta['etag'])
+            if meta.get('last_modified'):
+                request.add_header('If-Modified-Since', meta['last_modified'])
+
+        try:
+            response = opener(request)
+        except urllib2.HTTPError as e:
+            if e.code != 304 or not meta:
+                raise
+            self.logger.debug('Cache revalidated: %s', url)
+            meta['date'] = now
+            self.__save(url, meta, None)
+            return body
+
+        body = response.read()
+        headers = response.info()
+        meta = {
+            'url': url,
+            'date': now,
+            'etag': headers.getheader('ETag'),
+            'last_modified': headers.getheader('Last-Modified'),
+        }
+        self.__save(url, meta, body)
+        self.logger.debug('Cache stored: %s', url)
+
+        return body
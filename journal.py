@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+
+"""
+Append-only journal of the work done on each file, to resume a run.
+
+Every time a file goes through a stage, one short JSON line is appended::
+
+    ["h", path, hash, size, mtime]                     hashed
+    ["i", path, name, kind, imdbid, season, episode]   identified
+    ["f", path, language]                              subtitle found
+    ["n", path, language]                              subtitle not found
+    ["w", path, language]                              subtitle written
+    ["p", path, language]                              subtitle already there
+    ["d", path, size, mtime, [language, ...]]          settled languages
+
+A language is settled for a file once its subtitle is written, or was
+already there, next to the file or as one of its tracks. Subtitles not
+found are only recorded: whether to search again is up to
+L{misses.MissCache}.
+
+The last kind only appears in journals compacted by a resumed run, see
+L{Journal.close}: one record per file with settled languages, instead of
+the records of every stage.
+
+Lines are written as soon as they are recorded, so a crashing process
+loses nothing, but they are only fsync'ed every C{sync_every} records or
+C{sync_interval} seconds: a power loss can cost the last few records, which
+are then simply redone. A torn last line is ignored when loading.
+
+Each run writes its own file, C{<path>.<random>.run}, locked while it is
+going, so runs sharing a journal never clobber each other. The journal at
+C{<path>} is only replaced once a run has finished; an interrupted run
+leaves its file behind, for the next --resume to pick up along with the
+journal. Paths are recorded absolute, so a run can be resumed from another
+directory.
+
+Only the records of the previous runs are kept in memory, to be looked up
+when resuming: a new run doesn't grow with the number of files. And of
+those, only what can be skipped is kept: the languages settled for each
+file, with the size and modification time telling if it changed since.
+Hashes and identifications are only kept for files that aren't settled
+in all the languages of the run yet, mostly the few files a run had in
+flight when it was interrupted.
+"""
+
+import errno
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import misc
+
+DEFAULT_PATH = misc.cache_path('journal')
+"Default location of the journal"
+
+HASHED = 'h'
+IDENTIFIED = 'i'
+FOUND = 'f'
+NOT_FOUND = 'n'
+WRITTEN = 'w'
+PRESENT = 'p'
+SETTLED = 'd'
+
+RUN_SUFFIX = '.run'
+"Suffix of the files of the runs, next to the journal"
+
+
+def _absolute(path):
+    # URLs are absolute already
+    if misc.is_url(path):
+        return path
+    return os.path.abspath(path)
+
+
+def _locked(path):
+    """
+    @return: True if a running process holds the lock of a run file
+    """
+    try:
+        with open(path, 'rb') as f:
+            fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except IOError as e:
+        if e.errno in (errno.EAGAIN, errno.EACCES):
+            return True
+        if e.errno == errno.ENOENT:
+            return False
+        raise
+    return False
+
+
+class Journal(object):
+    """
+    Checkpoint journal, safe to use from several threads.
+    """
+    def __init__(self, path=DEFAULT_PATH, resume=False, sync_every=64,
+                 sync_interval=1.0, languages=None):
+        """
+        Open journal
+
+        @param path: Path of the journal file
+        @param resume: Load the records of the previous runs, the journal
+        and the files of interrupted runs, to carry on from there
+        @param languages: Languages of the run: the hash and identification
+        of a file are forgotten once all of them are settled. They are kept
+        for all files if not set
+        @param sync_every: Number of records after which we fsync
+        @param sync_interval: Seconds after which pending records are
+        fsync'ed
+        """
+        self.path = path
+        self.languages = None if languages is None else frozenset(languages)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+        # Files not settled in all languages yet: {path: (hash, size,
+        # mtime)} and {path: movie tuple}
+        self.hashes = {}
+        self.movies = {}
+        # {path: (size, mtime, frozenset of languages)}
+        self.settled = {}
+        # Shared frozensets of languages, files mostly have the same ones
+        self.language_sets = {}
+
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+        # Journals of the previous runs we carry on from
+        self.loaded = []
+        if resume:
+            self.loaded = [path] + self.__interrupted_runs()
+            count = sum(self.__load(loaded) for loaded in self.loaded)
+            self.logger.info('Loaded %d journal records', count)
+
+        fd, self.run_path = tempfile.mkstemp(
+            prefix=os.path.basename(path) + '.', suffix=RUN_SUFFIX,
+            dir=directory)
+        self.file = os.fdopen(fd, 'wb')
+        fcntl.flock(self.file, fcntl.LOCK_EX)
+
+        self.unsynced = 0
+        self.last_sync = time.time()
+
+    def __interrupted_runs(self):
+        """
+        @return: Files left by runs that were interrupted, oldest first
+        """
+        directory, name = os.path.split(self.path)
+        runs = []
+        for filename in os.listdir(directory or os.curdir):
+            if (filename.startswith(name + '.') and
+                    filename.endswith(RUN_SUFFIX)):
+                run = os.path.join(directory, filename)
+                if not _locked(run):
+                    runs.append(run)
+        return sorted(runs, key=os.path.getmtime)
+
+    def __load(self, path):
+        """
+        @return: Number of records loaded from path
+        """
+        try:
+            f = open(path, 'rb')
+        except IOError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return 0
+
+        count = 0
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self.__apply(record)
+                except (ValueError, TypeError, IndexError):
+                    self.logger.debug('Ignoring journal line: %r', line)
+                    continue
+                count += 1
+        return count
+
+    def __apply(self, record):
+        # Paths and names are byte strings everywhere else
+        record = [field.encode('utf-8') if isinstance(field, unicode)
+                  else field for field in record]
+        stage, path = record[0], record[1]
+        if stage == HASHED:
+            stamp = tuple(record[3:5])
+            settled = self.settled.get(path)
+            if settled and settled[:2] != stamp:
+                # The file changed, what we knew about it is obsolete
+                del self.settled[path]
+            elif settled and self.__complete(settled[2]):
+                return
+            previous = self.hashes.get(path)
+            if previous and previous[0] != record[2]:
+                self.movies.pop(path, None)
+            self.hashes[path] = tuple(record[2:5])
+        elif stage == IDENTIFIED:
+            settled = self.settled.get(path)
+            if not settled or not self.__complete(settled[2]):
+                self.movies[path] = tuple(record[2:7])
+        elif stage in (WRITTEN, PRESENT):
+            if path in self.settled:
+                size, mtime, languages = self.settled[path]
+            elif path in self.hashes:
+                _, size, mtime = self.hashes[path]
+                languages = frozenset()
+            else:
+                # Unknown file, it can't be checked for changes
+                return
+            self.__settle(path, size, mtime, languages | set([record[2]]))
+        elif stage == SETTLED:
+            self.__settle(path, record[2], record[3], frozenset(record[4]))
+
+    def __complete(self, languages):
+        """
+        @return: True if languages holds all the languages of the run
+        """
+        return self.languages is not None and self.languages <= languages
+
+    def __settle(self, path, size, mtime, languages):
+        languages = self.language_sets.setdefault(languages, languages)
+        self.settled[path] = (size, mtime, languages)
+        if self.__complete(languages):
+            # Nothing left to do on the file, it won't be hashed again
+            self.hashes.pop(path, None)
+            self.movies.pop(path, None)
+
+    def __append(self, record):
+        line = json.dumps(record, separators=(',', ':'))
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+            self.unsynced += 1
+            if (self.unsynced >= self.sync_every or
+                    time.time() - self.last_sync >= self.sync_interval):
+                self.__sync()
+
+    def __sync(self):
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.time()
+
+    def sync(self):
+        """
+        Make sure all records are on disk
+        """
+        with self.lock:
+            if self.unsynced:
+                self.__sync()
+
+    def close(self, finished=False):
+        """
+        Sync and close journal
+
+        @param finished: The run went through all its files: its records
+        replace the journal, compacted with the ones it carried on from.
+        Otherwise they are left for the next --resume
+        """
+        self.sync()
+        if finished:
+            if self.loaded:
+                self.__merge()
+            else:
+                os.rename(self.run_path, self.path)
+        # Closing releases the lock of our file, once it is in place
+        self.file.close()
+
+    def __merge(self):
+        """
+        Replace the journal by what we know, one record per file
+        """
+        self.__load(self.run_path)
+        merged = self.run_path + '.merge'
+        with open(merged, 'wb') as f:
+            for path, (size, mtime, languages) in self.settled.iteritems():
+                self.__write(f, [SETTLED, path, size, mtime,
+                                 sorted(languages)])
+            for path, (moviehash, size, mtime) in self.hashes.iteritems():
+                self.__write(f, [HASHED, path, moviehash, size, mtime])
+            for path, movie in self.movies.iteritems():
+                self.__write(f, [IDENTIFIED, path] + list(movie))
+            f.flush()
+            os.fsync(f.fileno())
+        os.rename(merged, self.path)
+        for path in self.loaded[1:] + [self.run_path]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def __write(f, record):
+        f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def hashed(self, path, moviehash):
+        """
+        Record that a file was hashed
+
+        @param path: Path of the movie file
+        @param moviehash: Its hash
+        """
+        path = _absolute(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Not a local file, the hash can't be checked when resuming
+            size = mtime = None
+        else:
+            size, mtime = stat.st_size, stat.st_mtime
+        self.__append([HASHED, path, moviehash, size, mtime])
+
+    def identified(self, path, movie):
+        """
+        Record the movie a file was identified as
+
+        @param path: Path of the movie file
+        @param movie: Movie it is
+        """
+        self.__append([IDENTIFIED, _absolute(path), movie.name, movie.kind,
+                       movie.imdbid, movie.season, movie.episode])
+
+    def found(self, path, language, found):
+        """
+        Record whether a subtitle was found
+
+        @param path: Path of the movie file
+        @param language: Language of the subtitle
+        @param found: True if found
+        """
+        self.__append([FOUND if found else NOT_FOUND, _absolute(path),
+                       language])
+
+    def written(self, path, language):
+        """
+        Record that a subtitle was written
+
+        @param path: Path of the movie file
+        @param language: Language of the subtitle
+        """
+        self.__append([WRITTEN, _absolute(path), language])
+
+    def present(self, path, language):
+        """
+        Record that a file already has a subtitle, next to it or as a track
+
+        @param path: Path of the movie file
+        @param language: Language of the subtitle
+        """
+        self.__append([PRESENT, _absolute(path), language])
+
+    def get_hash(self, path):
+        """
+        Hash of a file, if it was hashed and hasn't changed since
+
+        @param path: Path of the movie file
+        @return: Hash, None if unknown
+        """
+        path = _absolute(path)
+        try:
+            moviehash, size, mtime = self.hashes[path]
+            stat = os.stat(path)
+        except (KeyError, OSError):
+            return None
+        if (size, mtime) != (stat.st_size, stat.st_mtime):
+            return None
+        return moviehash
+
+    def get_movie(self, path):
+        """
+        @param path: Path of the movie file
+        @return: Tuple (name, kind, imdbid, season, episode) of the movie
+        the file was identified as, None if not identified
+        """
+        return self.movies.get(_absolute(path))
+
+    def is_done(self, path, languages):
+        """
+        Tell if nothing is left to do on a file
+
+        @param path: Path of the movie file
+        @param languages: Languages we want subtitles in
+        @return: True if the file hasn't changed, and the subtitle of every
+        language was either written or already there
+        """
+        path = _absolute(path)
+        try:
+            size, mtime, settled = self.settled[path]
+            stat = os.stat(path)
+        except (KeyError, OSError):
+            return False
+        if (size, mtime) != (stat.st_size, stat.st_mtime):
+            return False
+        return all(language in settled for language in languages)
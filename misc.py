@@ -3,11 +3,22 @@
 """
 Some utility functions that can be used in this project.
 
-Currently, we only provide one function:
-  - L{dice_coefficient}
+Currently, we provide those functions:
+  - L{dice_coefficient}, and L{BigramProfile} to compute it against many
+    strings
+  - L{strings_contained}
+  - L{atomic_write}
+  - L{cache_path} and L{is_url}
+  - L{get_xattr} and L{set_xattr}
 """
 
+import ctypes
+import ctypes.util
+import errno
+import os
 import re
+import sys
+import tempfile
 
 
 def dice_coefficient(a, b, ignore_case=True):
@@ -18,36 +29,85 @@ def dice_coefficient(a, b, ignore_case=True):
     U{http://en.wikibooks.org/wiki/Algorithm_Implementation/Strings/Dice's_coefficient#Python}.
     And then extended to add ignore_case parameter.
 
+    Bigrams of both strings are taken from L{bigram_profile}, so comparing
+    the same query against many candidates only computes its bigrams once.
+
     @param a: First string
     @param b: Second string
     @param ignore_case: Ignore case in calculation
     @return: Coefficient (0 < coef < 1). The higher the closer.
     """
-    if not len(a) or not len(b):
-        return 0.0
+    return bigram_profile(a, ignore_case).dice(bigram_profile(b, ignore_case))
+
+
+class BigramProfile(object):
+    """
+    Set of bigrams of a string, ready to be compared with L{dice}.
+
+    Bigrams are kept in a frozenset, and their hashes are computed once,
+    so comparing a profile against many others is only a set
+    intersection.
+    """
+    __slots__ = ('bigrams',)
+
+    def __init__(self, text, ignore_case=True):
+        """
+        Compute bigrams of text
+
+        @param text: String to profile
+        @param ignore_case: Ignore case in calculation
+        """
+        if ignore_case:
+            text = text.lower()
+        if len(text) == 1:
+            text = text + u'.'
+
+        self.bigrams = frozenset(text[i:i + 2]
+                                 for i in xrange(len(text) - 1))
+
+    def __len__(self):
+        return len(self.bigrams)
+
+    def dice(self, other):
+        """
+        Calculate dice coefficient against another profile
+
+        @param other: L{BigramProfile} to compare with
+        @return: Coefficient (0 < coef < 1). The higher the closer.
+        """
+        if not self.bigrams or not other.bigrams:
+            return 0.0
+
+        overlap = len(self.bigrams & other.bigrams)
+        return overlap * 2.0 / (len(self.bigrams) + len(other.bigrams))
+
 
-    if ignore_case:
-        a = a.lower()
-        b = b.lower()
+_profiles = {}
+PROFILE_CACHE_SIZE = 4096
+"Maximum number of profiles kept by L{bigram_profile}"
 
-    if len(a) == 1:
-        a = a + u'.'
-    if len(b) == 1:
-        b = b + u'.'
 
-    a_bigram_list = []
-    for i in range(len(a) - 1):
-        a_bigram_list.append(a[i:i + 2])
-    b_bigram_list = []
-    for i in range(len(b) - 1):
-        b_bigram_list.append(b[i:i + 2])
+def bigram_profile(text, ignore_case=True):
+    """
+    Get the L{BigramProfile} of text, from the cache if possible
+
+    @param text: String to profile
+    @param ignore_case: Ignore case in calculation
+    @return: L{BigramProfile}
+    """
+    key = (text, ignore_case)
+    try:
+        return _profiles[key]
+    except KeyError:
+        pass
 
-    a_bigrams = set(a_bigram_list)
-    b_bigrams = set(b_bigram_list)
-    overlap = len(a_bigrams & b_bigrams)
-    dice_coeff = overlap * 2.0 / (len(a_bigrams) + len(b_bigrams))
+    if len(_profiles) >= PROFILE_CACHE_SIZE:
+        _profiles.clear()
+    profile = _profiles[key] = BigramProfile(text, ignore_case)
+    return profile
 
-    return dice_coeff
+
+_NON_WORD = re.compile('\W+')
 
 
 def strings_contained(complete_name, reduced_name):
@@ -65,7 +125,120 @@ def strings_contained(complete_name, reduced_name):
     @return: Percentage of word found
     @rtype: float
     """
-    substrings = re.split('\W+', reduced_name)
+    substrings = _NON_WORD.split(reduced_name)
 
     return (len([1 for string in substrings if string in complete_name]) /
             len(substrings))
+
+
+def atomic_write(path, content):
+    """
+    Write content to path atomically, creating directories if needed
+
+    Content is written to a temporary file in the same directory, and then
+    renamed, so readers never see a partially written file.
+
+    @param path: Path of the file to write
+    @param content: Bytes to write
+    """
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+    fd, tmppath = tempfile.mkstemp(dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+    os.rename(tmppath, path)
+
+
+def cache_path(name, runtime=False):
+    """
+    Default location of a file or directory of ours
+
+    @param name: Its name
+    @param runtime: It only lives while we run (e.g. a socket), and goes
+    to C{$XDG_RUNTIME_DIR} if set
+    @return: Path in the subgetter directory of C{$XDG_CACHE_HOME}
+    (C{~/.cache} if not set)
+    """
+    if runtime and os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], name)
+    return os.path.join(
+        os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+        'subgetter', name)
+
+
+_URL = re.compile(r'^[a-z][a-z0-9+.-]*://', re.IGNORECASE)
+
+
+def is_url(location):
+    """
+    @param location: Path of a file, or URL
+    @return: True if location is a URL
+    """
+    return bool(_URL.match(location))
+
+
+XATTR_MAX_SIZE = 256
+"Largest extended attribute value we read"
+
+_libc = None
+
+
+def _xattr_libc():
+    """
+    @return: C library with Linux getxattr/setxattr, None if not available
+    """
+    global _libc
+    if _libc is None:
+        _libc = False
+        if sys.platform.startswith('linux'):
+            try:
+                _libc = ctypes.CDLL(ctypes.util.find_library('c'),
+                                    use_errno=True)
+                _libc.getxattr.restype = ctypes.c_ssize_t
+            except (OSError, AttributeError):
+                _libc = False
+    return _libc or None
+
+
+def get_xattr(path, name):
+    """
+    Read an extended attribute of a file
+
+    @param path: Path of the file
+    @param name: Name of the attribute, in the user namespace
+    @return: Value, None if not set, or not supported by the platform or
+    the filesystem
+    """
+    libc = _xattr_libc()
+    if not libc:
+        return None
+
+    buf = ctypes.create_string_buffer(XATTR_MAX_SIZE)
+    size = libc.getxattr(path, name, buf, XATTR_MAX_SIZE)
+    if size < 0:
+        return None
+    return buf.raw[:size]
+
+
+def set_xattr(path, name, value):
+    """
+    Write an extended attribute of a file
+
+    The modification time of the file is left alone.
+
+    @param path: Path of the file
+    @param name: Name of the attribute, in the user namespace
+    @param value: Value, at most L{XATTR_MAX_SIZE} bytes
+    @return: True if written, False if not supported by the platform or the
+    filesystem, or if the file can't be written
+    """
+    libc = _xattr_libc()
+    if not libc:
+        return False
+
+    return libc.setxattr(path, name, value, len(value), 0) == 0
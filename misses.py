@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""
+Remember the files no provider has subtitles for.
+
+When no subtitle is found for a file in a language, we don't search again
+before a delay that grows with each miss: 1 hour, 6 hours, 1 day, 1 week,
+and then twice the previous delay, up to L{MAX_DELAY}. Finding a subtitle
+forgets the misses.
+
+Each (hash, language) is a small file holding the number of misses and the
+time of the last one, so lookups don't load anything else::
+
+    <2 first hex digits of the hash>/<hash>.<language>
+"""
+
+import errno
+import os
+import time
+
+import misc
+
+DEFAULT_PATH = misc.cache_path('misses')
+"Default location of the cache"
+SCHEDULE = (3600, 6 * 3600, 24 * 3600, 7 * 24 * 3600)
+"Delays before searching again, in seconds, after each miss"
+MAX_DELAY = 8 * 7 * 24 * 3600
+"Longest delay before searching again"
+
+
+class MissCache(object):
+    """
+    Negative cache of subtitle searches, per movie hash and language.
+    """
+    def __init__(self, path=DEFAULT_PATH, retry=False, clock=time.time):
+        """
+        Create (or open) cache
+
+        @param path: Directory where the cache lives
+        @param retry: Search again anyway: misses are still recorded, but
+        nothing is skipped
+        @param clock: Function returning the current time, in seconds since
+        the epoch
+        """
+        self.path = path
+        self.retry = retry
+        self.clock = clock
+
+    def __entry_path(self, moviehash, language):
+        return os.path.join(self.path, moviehash[:2],
+                            '%s.%s' % (moviehash, language))
+
+    def __read(self, moviehash, language):
+        """
+        @return: Tuple (number of misses, time of the last one), (0, 0) if
+        none
+        """
+        try:
+            with open(self.__entry_path(moviehash, language)) as f:
+                count, last = f.read().split()
+            return int(count), float(last)
+        except (IOError, ValueError):
+            return 0, 0
+
+    @staticmethod
+    def delay(count):
+        """
+        @param count: Number of misses
+        @return: Seconds to wait before searching again
+        """
+        if count <= 0:
+            return 0
+        if count <= len(SCHEDULE):
+            return SCHEDULE[count - 1]
+        return min(MAX_DELAY,
+                   SCHEDULE[-1] * 2 ** (count - len(SCHEDULE)))
+
+    def retry_time(self, moviehash, language):
+        """
+        @param moviehash: Hash of the movie file
+        @param language: Language of the subtitle
+        @return: Time after which we should search again, 0 if now
+        """
+        count, last = self.__read(moviehash, language)
+        if not count:
+            return 0
+        return last + self.delay(count)
+
+    def should_skip(self, moviehash, language):
+        """
+        Tell if searching now would most likely be a waste
+
+        @param moviehash: Hash of the movie file
+        @param language: Language of the subtitle
+        @return: True if the last search missed, and its delay isn't over
+        """
+        if self.retry:
+            return False
+        return self.clock() < self.retry_time(moviehash, language)
+
+    def missed(self, moviehash, language):
+        """
+        Record that no subtitle was found
+
+        @param moviehash: Hash of the movie file
+        @param language: Language of the subtitle
+        """
+        count, _ = self.__read(moviehash, language)
+        misc.atomic_write(self.__entry_path(moviehash, language),
+                          '%d %f' % (count + 1, self.clock()))
+
+    def found(self, moviehash, language):
+        """
+        Record that a subtitle was found, forgetting previous misses
+
+        @param moviehash: Hash of the movie file
+        @param language: Language of the subtitle
+        """
+        try:
+            os.remove(self.__entry_path(moviehash, language))
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+
+"""
+Network helpers shared by the providers.
+
+  - L{build_opener} and L{TimeoutTransport} apply separate connect and read
+    timeouts to C{urllib2} and C{xmlrpclib} connections, so a stuck socket
+    cannot hang a whole batch.
+  - L{TimeoutTransport} also gzips large XML-RPC requests, and asks for
+    gzipped answers.
+  - L{Hedger} sends a duplicate of a slow idempotent request, and keeps
+    whichever answer comes first.
+"""
+
+import collections
+import httplib
+import logging
+import Queue
+import threading
+import time
+import urllib2
+import xmlrpclib
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+"Default number of seconds to wait for a connection"
+DEFAULT_READ_TIMEOUT = 30.0
+"Default number of seconds to wait for data on a connected socket"
+DEFAULT_ENCODE_THRESHOLD = 1024
+"Default size in bytes above which XML-RPC requests are gzipped"
+REFUSED_ENCODING = (400, 411, 415, 501)
+"HTTP statuses of servers refusing a gzipped request"
+PARSE_ERROR = -32700
+"Fault code of XML-RPC servers unable to parse a request"
+
+
+class TimeoutHTTPConnection(httplib.HTTPConnection):
+    """
+    HTTP connection with distinct connect and read timeouts
+    """
+    def __init__(self, host, port=None, connect_timeout=None,
+                 read_timeout=None, **kw):
+        httplib.HTTPConnection.__init__(self, host, port,
+                                        timeout=connect_timeout, **kw)
+        self.read_timeout = read_timeout
+
+    def connect(self):
+        httplib.HTTPConnection.connect(self)
+        self.sock.settimeout(self.read_timeout)
+
+
+class TimeoutHTTPHandler(urllib2.HTTPHandler):
+    """
+    C{urllib2} handler opening L{TimeoutHTTPConnection}s
+    """
+    def __init__(self, connect_timeout, read_timeout):
+        urllib2.HTTPHandler.__init__(self)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+    def http_open(self, req):
+        def connection(host, **kw):
+            kw.pop('timeout', None)
+            return TimeoutHTTPConnection(host,
+                                         connect_timeout=self.connect_timeout,
+                                         read_timeout=self.read_timeout,
+                                         **kw)
+        return self.do_open(connection, req)
+
+
+def build_opener(connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT):
+    """
+    Build a C{urllib2} opener applying timeouts to every connection
+
+    @param connect_timeout: Seconds to wait for a connection, None for ever
+    @param read_timeout: Seconds to wait for data, None for ever
+    @return: C{urllib2.OpenerDirector}
+    """
+    return urllib2.build_opener(
+        TimeoutHTTPHandler(connect_timeout, read_timeout))
+
+
+class TimeoutTransport(xmlrpclib.Transport):
+    """
+    C{xmlrpclib} transport applying connect and read timeouts.
+
+    Requests larger than a threshold are sent with a gzip
+    C{Content-Encoding}. If the server refuses one, it is sent again
+    uncompressed, and so are the following ones. Answers are gzipped if
+    the server wants to, as C{Accept-Encoding} tells it can.
+    """
+    decoder = None
+    "Optional function returning the (parser, unmarshaller) of the answers"
+
+    def __init__(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT,
+                 encode_threshold=DEFAULT_ENCODE_THRESHOLD,
+                 accept_gzip=True):
+        """
+        @param connect_timeout: Seconds to wait for a connection, None for
+        ever
+        @param read_timeout: Seconds to wait for data, None for ever
+        @param encode_threshold: Size in bytes above which requests are
+        gzipped, None to never gzip them
+        @param accept_gzip: Tell the server it can gzip its answers
+        """
+        xmlrpclib.Transport.__init__(self)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.encode_threshold = encode_threshold
+        self.accept_gzip_encoding = accept_gzip
+        # The request being sent is gzipped
+        self.gzipped = False
+
+    def make_connection(self, host):
+        if self._connection and host == self._connection[0]:
+            return self._connection[1]
+
+        chost, self._extra_headers, x509 = self.get_host_info(host)
+        self._connection = host, TimeoutHTTPConnection(
+            chost, connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout)
+        return self._connection[1]
+
+    def request(self, host, handler, request_body, verbose=0):
+        try:
+            return xmlrpclib.Transport.request(self, host, handler,
+                                               request_body, verbose)
+        except (xmlrpclib.ProtocolError, xmlrpclib.Fault) as e:
+            if not self.gzipped or not _refused_encoding(e):
+                raise
+
+        logging.getLogger(__name__).info(
+            '%s refused a gzipped request, not compressing anymore', host)
+        self.encode_threshold = None
+        return xmlrpclib.Transport.request(self, host, handler, request_body,
+                                           verbose)
+
+    def send_content(self, connection, request_body):
+        self.gzipped = bool(self.encode_threshold is not None and
+                            len(request_body) > self.encode_threshold)
+        xmlrpclib.Transport.send_content(self, connection, request_body)
+
+    def getparser(self):
+        if self.decoder:
+            return self.decoder()
+        return xmlrpclib.Transport.getparser(self)
+
+
+def _refused_encoding(error):
+    """
+    @param error: C{xmlrpclib.ProtocolError} or C{xmlrpclib.Fault} raised
+    by a gzipped request
+    @return: True if the server most likely didn't understand the gzip
+    encoding
+    """
+    if isinstance(error, xmlrpclib.ProtocolError):
+        return error.errcode in REFUSED_ENCODING
+    # Servers ignoring the encoding try to parse gzipped data as XML
+    return (error.faultCode == PARSE_ERROR or
+            'not well-formed' in str(error.faultString))
+
+
+class Hedger(object):
+    """
+    Hedge idempotent requests to cut tail latency.
+
+    Latencies are recorded per kind of request. When a request takes
+    longer than the given percentile of its recent latencies, a duplicate
+    is sent, and the first answer to arrive is used.
+    """
+    def __init__(self, percentile=0.95, history=100, min_samples=10,
+                 clock=time.time):
+        """
+        Create hedger
+
+        @param percentile: Latency percentile after which we hedge
+        @param history: Number of latencies kept per kind of request
+        @param min_samples: Latencies needed before hedging a kind of
+        request
+        @param clock: Function returning the current time, in seconds, to
+        measure latencies
+        """
+        self.percentile = percentile
+        self.history = history
+        self.min_samples = min_samples
+        self.clock = clock
+        self.latencies = collections.defaultdict(
+            lambda: collections.deque(maxlen=self.history))
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def delay(self, key):
+        """
+        Time to wait before hedging a request
+
+        @param key: Kind of request
+        @return: Seconds, None if we don't know enough to hedge yet
+        """
+        with self.lock:
+            latencies = sorted(self.latencies[key])
+        if len(latencies) < self.min_samples:
+            return None
+
+        index = min(len(latencies) - 1,
+                    int(len(latencies) * self.percentile))
+        return latencies[index]
+
+    def record(self, key, seconds):
+        """
+        Record latency of a request
+
+        @param key: Kind of request
+        @param seconds: Time it took
+        """
+        with self.lock:
+            self.latencies[key].append(seconds)
+
+    def call(self, key, func, duplicate=None, abandoned=None):
+        """
+        Call func, hedged with a duplicate if it is slow
+
+        Every attempt records its latency when it ends, failed ones too, so
+        requests timing out raise the time we wait before hedging.
+
+        @param key: Kind of request, latencies are tracked per key
+        @param func: Function without arguments sending the request
+        @param duplicate: Function sending the duplicate request, func is
+        used if not set (it must then be safe to call from two threads)
+        @param abandoned: Optional function called, in the calling thread,
+        when the answer of the duplicate is used while func is still
+        running, e.g. to stop reusing the connection func is busy with
+        @return: Result of the first successful call
+        @raise: Exception of the first call if both failed
+        """
+        results = Queue.Queue()
+
+        def attempt(function, primary):
+            begin = self.clock()
+            try:
+                result = (True, function(), primary)
+            except Exception as e:
+                result = (False, e, primary)
+            self.record(key, self.clock() - begin)
+            results.put(result)
+
+        def start(function, primary=False):
+            thread = threading.Thread(target=attempt,
+                                      args=(function, primary))
+            thread.daemon = True
+            thread.start()
+
+        start(func, True)
+        pending = 1
+
+        try:
+            success, result, primary = results.get(timeout=self.delay(key))
+        except Queue.Empty:
+            self.logger.debug('Hedging request: %s', key)
+            start(duplicate or func)
+            pending += 1
+            success, result, primary = results.get()
+        pending -= 1
+        running = not primary
+
+        error = None
+        while not success and pending:
+            error = error or result
+            success, result, primary = results.get()
+            pending -= 1
+            running = running and not primary
+
+        if running and abandoned:
+            abandoned()
+
+        if not success:
+            raise error or result
+
+        return result
@@ -2,44 +2,148 @@ import base64
 import datetime
 import decimal
 import logging
+import multiprocessing.pool
+import threading
 import xmlrpclib
 import zlib
 
+import network
+import quota
+import xmlrpcstream
+
+
+class DownloadLimitReached(Exception):
+    """
+    Raised when the server refuses to download more subtitles today
+    """
+
 
 class OpenSubtitles(object):
-    def __init__(self):
-        self.conn = xmlrpclib.ServerProxy(
-            'http://api.opensubtitles.org/xml-rpc')
+    PROVIDER = 'opensubtitles'
+    URL = 'http://api.opensubtitles.org/xml-rpc'
+    # Not DownloadSubtitles: a duplicate would count twice against the
+    # download quota
+    IDEMPOTENT = ('CheckMovieHash2', 'SearchMoviesOnIMDB', 'SearchSubtitles',
+                  'DetectLanguage')
+    "Requests that can safely be sent twice when hedging"
+    ANONYMOUS = ('LogIn', 'ServerInfo')
+    "Requests sent without the session token"
+    SEARCH_CACHE_SIZE = 4096
+    "Number of name searches remembered, see L{search_on_imdb}"
+    SEARCH_FIELDS = ('MovieHash', 'SubLanguageID', 'IDSubtitleFile',
+                     'IDMovieImdb')
+    "Fields of the SearchSubtitles results we decode, the others are dropped"
+
+    def __init__(self, store=None, transport_factory=None,
+                 connect_timeout=network.DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=network.DEFAULT_READ_TIMEOUT,
+                 hedger=None,
+                 encode_threshold=network.DEFAULT_ENCODE_THRESHOLD):
+        """
+        Create a session on OpenSubtitles
+
+        @param store: Optional L{store.SubtitleStore} checked before
+        downloading subtitles
+        @param transport_factory: Optional function returning a new
+        C{xmlrpclib} transport, e.g. L{cassette.Cassette.transport}
+        @param connect_timeout: Seconds to wait for a connection
+        @param read_timeout: Seconds to wait for data
+        @param hedger: Optional L{network.Hedger} used for idempotent
+        requests
+        @param encode_threshold: Size in bytes above which requests are
+        gzipped, None to never gzip them
+        """
+        if not transport_factory:
+            transport_factory = lambda: network.TimeoutTransport(
+                connect_timeout, read_timeout, encode_threshold)
+        self.transport_factory = transport_factory
+        self.hedger = hedger
+        # Transports are not thread-safe: each thread gets its own proxy
+        self.local = threading.local()
+        self.lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.INFO)
         self.token = None
+        self.store = store
+        self.searches = {}
         self.osdb_time = decimal.Decimal()
         self.transfer_time = datetime.timedelta()
+        self.quota = quota.Quota()
         self.__login()
+        self.update_quota()
 
-    def __request(self, name, *args, **kw):
-        func = getattr(self.conn, name)
+    def __proxy(self):
+        return xmlrpclib.ServerProxy(self.URL,
+                                     transport=self.transport_factory())
 
+    @property
+    def conn(self):
+        """
+        XML-RPC proxy of the current thread
+        """
+        if not hasattr(self.local, 'conn'):
+            self.local.conn = self.__proxy()
+        return self.local.conn
+
+    def __request(self, name, *args, **kw):
+        # Only retry once after logging in again
+        retry = kw.pop('_retry', True)
+        # Function returning the (parser, unmarshaller) of the answer
+        decoder = kw.pop('_decoder', None)
         self.logger.debug('Request: %s %s %s %s', name, self.token, args, kw)
 
+        request_args = args
+        if name not in self.ANONYMOUS:
+            args = (self.token,) + args
+
+        def call(conn):
+            transport = conn('transport')
+            if not (decoder and
+                    isinstance(transport, network.TimeoutTransport)):
+                return getattr(conn, name)(*args, **kw)
+            transport.decoder = decoder
+            try:
+                return getattr(conn, name)(*args, **kw)
+            finally:
+                transport.decoder = None
+
         btime = datetime.datetime.now()
-        if name != 'LogIn':
-            answer = func(self.token, *args, **kw)
+        if self.hedger and name in self.IDEMPOTENT:
+            conn = self.conn
+
+            def abandoned():
+                # The slow request still uses our proxy, leave it alone
+                if getattr(self.local, 'conn', None) is conn:
+                    del self.local.conn
+
+            # The duplicate gets its own proxy
+            answer = self.hedger.call(name, lambda: call(conn),
+                                      lambda: call(self.__proxy()),
+                                      abandoned)
         else:
-            answer = func(*args, **kw)
-        self.transfer_time += (datetime.datetime.now() - btime)
+            answer = call(self.conn)
+        with self.lock:
+            self.transfer_time += (datetime.datetime.now() - btime)
 
         self.logger.debug('Answer: %s', answer)
 
         if not answer:
             raise Exception('Empty answer from OpenSubtitles')
 
-        if answer['status'] == '401 Unauthorized' and name != 'LogIn':
+        # ServerInfo answers have no status
+        status = answer.get('status', '200 OK')
+        if status == '401 Unauthorized' and name != 'LogIn' and retry:
+            # Our session expired (e.g. in a long running server)
             self.__login()
-        elif not answer['status'].startswith('2'):
-            raise Exception('Request failed: %s' % answer['status'])
+            return self.__request(name, _retry=False, _decoder=decoder,
+                                  *request_args, **kw)
+        elif status.startswith('407'):
+            raise DownloadLimitReached(status)
+        elif not status.startswith('2'):
+            raise Exception('Request failed: %s' % status)
 
-        self.osdb_time += decimal.Decimal(answer['seconds'])
+        with self.lock:
+            self.osdb_time += decimal.Decimal(answer.get('seconds', 0))
 
         return answer
 
@@ -52,6 +156,35 @@ class OpenSubtitles(object):
         self.logger.info('Logging out.')
         self.__request('LogOut')
 
+    def keep_alive(self):
+        """
+        Keep the session from expiring, logging in again if it did, and
+        see if the download quota came back
+        """
+        self.__request('NoOperation')
+        self.update_quota()
+
+    def update_quota(self):
+        """
+        Get the downloads left today from the server, see L{quota.Quota}.
+        The quota stays unknown if the server doesn't tell.
+        """
+        try:
+            answer = self.__request('ServerInfo')
+            limits = answer.get('download_limits') or {}
+            remaining = limits.get('client_download_quota')
+            if remaining is None and 'client_24h_download_limit' in limits:
+                remaining = (int(limits['client_24h_download_limit']) -
+                             int(limits.get('client_24h_download_count', 0)))
+            remaining = None if remaining is None else max(0, int(remaining))
+        except Exception as e:
+            self.logger.debug('Unable to get the download quota: %s', e)
+            return
+
+        self.logger.info('Download quota left: %s',
+                         'unknown' if remaining is None else remaining)
+        self.quota.update(remaining)
+
     def check_hashes(self, hashes):
         answer = self.__request('CheckMovieHash2', hashes)
 
@@ -61,9 +194,54 @@ class OpenSubtitles(object):
         return answer['data']
 
     def search_on_imdb(self, name):
+        """
+        Search movies by name
+
+        Answers are remembered for the session, so a name is only searched
+        once.
+
+        @param name: Movie name
+        @return: List of dicts with id (IMDb id) and title
+        """
+        with self.lock:
+            if name in self.searches:
+                return self.searches[name]
+
         answer = self.__request('SearchMoviesOnIMDB', name)
+        results = [data for data in answer['data'] or [] if data.get('id')]
 
-        return answer['data']
+        with self.lock:
+            if len(self.searches) >= self.SEARCH_CACHE_SIZE:
+                self.searches.clear()
+            self.searches[name] = results
+        return results
+
+    def search_on_imdb_names(self, names, workers=4):
+        """
+        Search many names concurrently, see L{search_on_imdb}
+
+        @param names: Movie names
+        @param workers: Number of searches sent at the same time
+        @return: Dict {name: results}, results are empty if the search
+        failed
+        """
+        def search(name):
+            try:
+                return self.search_on_imdb(name)
+            except Exception:
+                self.logger.exception('Search failed for %s', name)
+                return []
+
+        names = list(set(names))
+        if len(names) <= 1:
+            return {name: search(name) for name in names}
+
+        pool = multiprocessing.pool.ThreadPool(min(workers, len(names)))
+        try:
+            return dict(zip(names, pool.map(search, names)))
+        finally:
+            pool.close()
+            pool.join()
 
     def download_subtitles(self, movies, language='eng'):
         """
@@ -71,37 +249,177 @@ class OpenSubtitles(object):
         - hash
         - filesize
         - filename
+        and may contain imdbid, to search by IMDb id when nothing is found
+        by hash
+
+        Movies come in priority order: when the download quota is short,
+        the first ones get it.
+
+        @return: Dict {moviehash: subtitle}, subtitle is L{quota.DEFERRED}
+        if downloading it was left for the next quota window
+        """
+        subs = self.download_subtitles_languages(movies, [language])
+
+        return {moviehash: sub for (moviehash, _), sub in subs.items()}
+
+    def download_subtitles_languages(self, movies, languages):
+        """
+        Download subtitles in several languages at once
+
+        All languages are searched with a single SearchSubtitles call, and
+        every chosen subtitle is downloaded with a single DownloadSubtitles
+        call. Movies with an IMDb id, and languages the hash search found
+        nothing for, are searched again by IMDb id, with a single
+        SearchSubtitles call too. Subtitles that don't fit in the download
+        quota are not asked for, see L{quota}.
+
+        @param movies: List of dicts, in priority order, see
+        L{download_subtitles}
+        @param languages: List of three letters language codes
+        @return: Dict {(moviehash, language): subtitle}, subtitle is
+        L{quota.DEFERRED} if downloading it was left for the next quota
+        window
         """
         array = [{'moviehash': movie['hash'],
                   'moviebytesize': movie['size'],
                   'tag': movie['name'],
-                  'sublanguageid': language}
+                  'sublanguageid': ','.join(languages)}
                  for movie in movies]
 
-        answer = self.__request('SearchSubtitles', array)
-
-        if answer['data'] == False:
-            return {}
+        wanted = set((movie['hash'], language) for movie in movies
+                     for language in languages)
+        results = self.__search_subtitles(
+            array, wanted,
+            lambda data: (data.get('MovieHash'), data.get('SubLanguageID')))
 
         # XXX: Yet, we take the first subtitle, no other criteria
         moviesubs = {}
-        for data in answer['data']:
+        for data in results:
+            key = (data['MovieHash'], data['SubLanguageID'])
             # We already have one, we're good
-            if data['MovieHash'] in moviesubs.keys():
+            if key in moviesubs:
                 continue
 
-            moviesubs[data['MovieHash']] = data['IDSubtitleFile']
+            moviesubs[key] = data['IDSubtitleFile']
+
+        # Subtitles made for another release of the same movie may not be
+        # in sync, but that's better than nothing
+        missing = {}
+        for movie in movies:
+            if not movie.get('imdbid'):
+                continue
+            for language in languages:
+                if (movie['hash'], language) not in moviesubs:
+                    missing.setdefault(int(movie['imdbid']), {}).setdefault(
+                        language, []).append(movie['hash'])
+        if missing:
+            moviesubs.update(self.__search_imdb_subtitles(missing))
 
+        result = {}
         subs = {}
-        # Invert the list
-        for moviehash, subtitleid in moviesubs.items():
-            subs[subtitleid] = moviehash
+        # Subtitles to download, in the priority order of their movies
+        ids = []
+        # Invert the list, skipping the ones we already have
+        for movie in movies:
+            for language in languages:
+                key = (movie['hash'], language)
+                if key not in moviesubs:
+                    continue
+                subtitleid = moviesubs.pop(key)
+                sub = None
+                if self.store:
+                    sub = self.store.get(self.PROVIDER, subtitleid)
+                if sub is not None:
+                    result[key] = sub
+                    continue
+                if subtitleid not in subs:
+                    ids.append(subtitleid)
+                subs.setdefault(subtitleid, []).append(key)
+
+        if not subs:
+            return result
+
+        granted = self.quota.take(len(ids))
+        ids, deferred = ids[:granted], ids[granted:]
+        for subtitleid in deferred:
+            for key in subs[subtitleid]:
+                result[key] = quota.DEFERRED
+        if not ids:
+            return result
+
+        try:
+            answer = self.__request('DownloadSubtitles', ids)
+        except DownloadLimitReached:
+            self.quota.exhausted()
+            for subtitleid in ids:
+                for key in subs[subtitleid]:
+                    result[key] = quota.DEFERRED
+            return result
 
-        answer = self.__request('DownloadSubtitles', subs.keys())
+        # The server may not have served them all
+        self.quota.give_back(len(ids) - len(answer['data'] or []))
+        for data in answer['data'] or []:
+            sub = self.__convert_subtitle(data['data'])
+            if self.store:
+                self.store.put(self.PROVIDER, data['idsubtitlefile'], sub)
+            for key in subs[data['idsubtitlefile']]:
+                result[key] = sub
+
+        return result
+
+    def __search_subtitles(self, array, wanted, key):
+        """
+        SearchSubtitles, only decoding what we use of the results
+
+        Only L{SEARCH_FIELDS} are kept, and the results that follow the
+        first one for each wanted key are not decoded at all.
+
+        @param array: List of search criteria
+        @param wanted: Set of the keys we want a subtitle for
+        @param key: Function giving the key of a result
+        @return: List of results
+        """
+        def decoder():
+            # One per answer: a hedged request decodes two of them
+            remaining = set(wanted)
+
+            def enough(data):
+                remaining.discard(key(data))
+                return not remaining
+
+            return xmlrpcstream.getparser(self.SEARCH_FIELDS, enough)
+
+        answer = self.__request('SearchSubtitles', array, _decoder=decoder)
+        return answer['data'] or []
+
+    def __search_imdb_subtitles(self, missing):
+        """
+        Search subtitles by IMDb id, all movies at once
+
+        @param missing: Dict {imdbid: {language: [moviehash, ...]}}
+        @return: Dict {(moviehash, language): subtitle file id}
+        """
+        array = [{'imdbid': str(imdbid),
+                  'sublanguageid': ','.join(languages)}
+                 for imdbid, languages in missing.items()]
+
+        wanted = set((imdbid, language) for imdbid, languages
+                     in missing.items() for language in languages)
+        results = self.__search_subtitles(
+            array, wanted,
+            lambda data: (int(data.get('IDMovieImdb') or 0),
+                          data.get('SubLanguageID')))
+
+        moviesubs = {}
+        for data in results:
+            hashes = missing.get(int(data['IDMovieImdb']), {}).get(
+                data['SubLanguageID'], [])
+            for moviehash in hashes:
+                key = (moviehash, data['SubLanguageID'])
+                if key not in moviesubs:
+                    moviesubs[key] = data['IDSubtitleFile']
 
-        return {
-            subs[data['idsubtitlefile']]: self.__convert_subtitle(data['data'])
-            for data in answer['data']}
+        return moviesubs
 
     def subtitle_language(self, subs):
         """
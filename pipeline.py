@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+
+"""
+Staged pipeline connected by bounded queues.
+
+Each L{Stage} has its own worker threads, taking items from its input
+queue and putting results in the input queue of the next stage. Queues are
+bounded, so a fast stage waits for a slow one instead of piling up items
+(backpressure), and all stages work at the same time: while file N is
+being downloaded, file N+1 can be identified and file N+2 hashed.
+
+Workers take a batch of items, so stages that talk to a provider can send
+one request for many items. Once an item is there, a worker lingers a
+little for more, so that a fast stage before it doesn't make it send
+batches of one.
+
+Only the main thread gets C{KeyboardInterrupt}, so it never blocks for
+long: it feeds items and waits for the stages in short steps, and runs
+what stages hand it with L{Pipeline.call}, such as questions to the user.
+Once a run is cancelled, by an interruption, a failing output or the
+caller, the items left are dropped and the workers stop.
+"""
+
+import logging
+import Queue
+import threading
+import time
+
+_DONE = object()
+
+DEFAULT_LINGER = 0.05
+"Seconds a batching worker waits for more items after the first one"
+POLL = 0.1
+"Seconds the main thread blocks at most, see L{Pipeline.call}"
+
+
+class Cancelled(Exception):
+    """
+    Raised by L{Pipeline.call} when the run is cancelled meanwhile
+    """
+
+
+class Stage(object):
+    """
+    One step of a L{Pipeline}.
+    """
+    def __init__(self, name, func, workers=1, batch_size=1, queue_size=16,
+                 linger=DEFAULT_LINGER):
+        """
+        Create stage
+
+        @param name: Name of the stage, used in metrics
+        @param func: Function taking a list of items, and returning the list
+        of items for the next stage
+        @param workers: Number of threads running func
+        @param batch_size: Maximum number of items given to func at once
+        @param queue_size: Maximum number of items waiting for this stage
+        @param linger: Seconds to wait for a batch to fill, after its first
+        item, before processing it anyway
+        """
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.batch_size = batch_size
+        self.linger = linger
+        self.queue = Queue.Queue(queue_size)
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.busy = 0.0
+        self.max_depth = 0
+        self.logger = logging.getLogger(__name__)
+
+    def put(self, item, timeout=None):
+        """
+        Queue item for this stage, waiting while the queue is full
+
+        @param item: Item to process
+        @param timeout: Seconds to wait at most, None for ever
+        @return: True if queued, False if the queue is still full
+        """
+        try:
+            self.queue.put(item, timeout=timeout)
+        except Queue.Full:
+            return False
+        depth = self.queue.qsize()
+        with self.lock:
+            self.max_depth = max(self.max_depth, depth)
+        return True
+
+    def __take(self):
+        """
+        Wait for an item, and for the ones coming behind it until the batch
+        is full or we lingered long enough
+
+        @return: (batch, done): done is set once the end marker is reached
+        """
+        item = self.queue.get()
+        if item is _DONE:
+            return [], True
+
+        batch = [item]
+        deadline = time.time() + self.linger
+        while len(batch) < self.batch_size:
+            try:
+                item = self.queue.get(timeout=max(0, deadline - time.time()))
+            except Queue.Empty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def work(self, output, cancelled):
+        """
+        Worker loop: process batches until the end marker
+
+        Once cancelled, batches are still taken, so that nothing waits on a
+        full queue, but dropped.
+
+        @param output: Function called with each resulting item
+        @param cancelled: C{threading.Event} set when the run is
+        cancelled, set here if output fails
+        """
+        done = False
+        while not done:
+            batch, done = self.__take()
+            if done:
+                # Let the other workers of this stage see the end too
+                self.queue.put(_DONE)
+            if not batch or cancelled.is_set():
+                continue
+
+            begin = time.time()
+            try:
+                results = self.func(batch)
+            except Cancelled:
+                results = []
+            except Exception:
+                self.logger.exception('Stage %s failed on %d item(s)',
+                                      self.name, len(batch))
+                results = []
+            with self.lock:
+                self.busy += time.time() - begin
+                self.processed += len(batch)
+                self.batches += 1
+                self.max_batch = max(self.max_batch, len(batch))
+
+            try:
+                for result in results:
+                    output(result)
+            except Exception:
+                # Results would be lost from now on
+                self.logger.exception('Stage %s failed to output its '
+                                      'results, cancelling the run',
+                                      self.name)
+                cancelled.set()
+
+    def metrics(self, elapsed):
+        """
+        @param elapsed: Seconds the pipeline has been running
+        @return: Dict of metrics for this stage
+        """
+        with self.lock:
+            return {
+                'workers': self.workers,
+                'processed': self.processed,
+                'batches': self.batches,
+                'mean_batch': (float(self.processed) / self.batches
+                               if self.batches else 0.0),
+                'max_batch': self.max_batch,
+                'busy': self.busy,
+                'throughput': self.processed / elapsed if elapsed else 0.0,
+                'utilization': (self.busy / (elapsed * self.workers)
+                                if elapsed else 0.0),
+                'depth': self.queue.qsize(),
+                'max_depth': self.max_depth,
+            }
+
+
+class Pipeline(object):
+    """
+    Run items through stages, all stages working concurrently.
+    """
+    def __init__(self, stages):
+        """
+        @param stages: List of L{Stage}, in order
+        """
+        self.stages = stages
+        self.begin = None
+        self.end = None
+        self.groups = []
+        self.closing = 0
+        self.cancelled = threading.Event()
+        self.thread = None
+        self.calls = Queue.Queue()
+        self.logger = logging.getLogger(__name__)
+
+    def call(self, func, *args):
+        """
+        Run a function in the thread running the pipeline, and wait for it
+
+        Stages use it for what the user must be able to interrupt, such as
+        prompts. Outside of a run, or from that thread, func is just called.
+
+        @param func: Function to call with args
+        @return: What func returns
+        @raise Cancelled: The run was cancelled before func was done
+        """
+        if (self.thread is None or
+                self.thread is threading.current_thread()):
+            return func(*args)
+
+        reply = Queue.Queue(1)
+        self.calls.put((func, args, reply))
+        while True:
+            try:
+                failed, value = reply.get(timeout=POLL)
+            except Queue.Empty:
+                if self.cancelled.is_set():
+                    raise Cancelled()
+                continue
+            if failed:
+                raise value
+            return value
+
+    def __run_calls(self):
+        """
+        Run the calls waiting from the stages, see L{call}
+        """
+        while True:
+            try:
+                func, args, reply = self.calls.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                reply.put((False, func(*args)))
+            except Exception as e:
+                reply.put((True, e))
+
+    def __wait(self, threads):
+        """
+        Wait for threads to end, running calls meanwhile
+        """
+        for thread in threads:
+            while thread.is_alive():
+                self.__run_calls()
+                thread.join(POLL)
+
+    def cancel(self):
+        """
+        Stop the run: items not processed yet are dropped
+        """
+        self.cancelled.set()
+
+    def run(self, items, output=None, cancelled=None):
+        """
+        Feed items to the first stage, and wait until all are processed
+
+        On C{KeyboardInterrupt}, the run is cancelled and the batches being
+        processed are waited for, unless interrupted again, before raising
+        it.
+
+        @param items: Iterable of items for the first stage
+        @param output: Function called with each item output by the last
+        stage, as soon as it is; items are collected if not set
+        @param cancelled: C{threading.Event} cancelling the run once set,
+        see L{cancel}
+        @return: List of items output by the last stage, empty if output is
+        set. L{cancelled} tells whether all items were processed
+        """
+        results = []
+        results_lock = threading.Lock()
+
+        def collect(item):
+            with results_lock:
+                if output:
+                    output(item)
+                else:
+                    results.append(item)
+
+        self.cancelled = cancelled or threading.Event()
+        self.thread = threading.current_thread()
+        self.begin = time.time()
+        self.end = None
+        # Index of the next stage to get the end marker
+        self.closing = 0
+        interrupted = False
+        try:
+            self.__start(collect)
+            try:
+                self.__feed(items)
+            except KeyboardInterrupt:
+                interrupted = True
+                self.__interrupt()
+            try:
+                self.__close()
+            except KeyboardInterrupt:
+                if interrupted:
+                    raise
+                interrupted = True
+                self.__interrupt()
+                self.__close()
+        finally:
+            self.thread = None
+            self.end = time.time()
+
+        if interrupted:
+            raise KeyboardInterrupt()
+        return results
+
+    def __interrupt(self):
+        self.cancel()
+        self.logger.warning('Interrupted, waiting for the batches being '
+                            'processed (interrupt again to quit now)')
+
+    def __start(self, collect):
+        """
+        Start the workers of all stages
+        """
+        self.groups = []
+        for index, stage in enumerate(self.stages):
+            if index + 1 < len(self.stages):
+                forward = self.stages[index + 1].put
+            else:
+                forward = collect
+            threads = [threading.Thread(target=stage.work,
+                                        args=(forward, self.cancelled))
+                       for _ in range(stage.workers)]
+            for thread in threads:
+                thread.daemon = True
+                thread.start()
+            self.groups.append(threads)
+
+    def __feed(self, items):
+        """
+        Put items in the first stage, until they are all there or the run
+        is cancelled
+        """
+        first = self.stages[0]
+        for item in items:
+            if self.cancelled.is_set():
+                return
+            while not first.put(item, POLL):
+                self.__run_calls()
+
+    def __close(self):
+        """
+        Give the end marker to each stage once the previous one is done,
+        and wait for the last one: once all workers of a stage are done,
+        nothing more will reach the next stage. It goes on from where it
+        was interrupted.
+        """
+        while self.closing < len(self.stages):
+            if self.closing:
+                self.__wait(self.groups[self.closing - 1])
+            # Workers take items even when cancelled, so the queue empties
+            while not self.stages[self.closing].put(_DONE, POLL):
+                self.__run_calls()
+            self.closing += 1
+        self.__wait(self.groups[-1])
+
+    def metrics(self):
+        """
+        @return: List of (stage name, metrics dict), see L{Stage.metrics}
+        """
+        if self.begin is None:
+            return []
+        elapsed = (self.end or time.time()) - self.begin
+        return [(stage.name, stage.metrics(elapsed)) for stage in self.stages]
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+"""
+Spend the daily download quota of OpenSubtitles on the files that matter.
+
+OpenSubtitles only serves so many subtitle downloads a day, and answers
+"407 Download limit reached" beyond. L{Quota} tracks what is left, as
+reported by the server and counted down as we download, so that we stop
+asking before the server refuses.
+
+When the quota is short, files get it in the order of a L{priority} key:
+files matching a watchlist first, then the newest ones if asked. Files
+enter the pipeline in that order and each batch is downloaded in that
+order, so the order holds across batches as far as concurrent workers
+keep it. The subtitles that don't fit are L{DEFERRED} to the next window:
+they are not reported as missing, so the next run (or the server, see
+L{subgetter.serve}) gets them once the quota is back.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+
+WINDOW = 24 * 3600
+"Seconds after which a spent quota is assumed to be back"
+POLICIES = ('order', 'newest')
+"Orders in which files get the quota, after the watchlist"
+
+
+class Deferred(object):
+    """
+    Placeholder of a subtitle that wasn't downloaded for lack of quota
+    """
+    def __repr__(self):
+        return 'DEFERRED'
+
+    def __nonzero__(self):
+        # Not a subtitle we can write
+        return False
+
+
+DEFERRED = Deferred()
+"Placeholder of the subtitles deferred to the next window"
+
+
+class Quota(object):
+    """
+    Downloads left in the current window.
+
+    Nothing is known until the server tells, and then we count down. Once
+    the quota is spent, or the server refuses a download, nothing more is
+    granted until the window is over.
+    """
+    def __init__(self, window=WINDOW, clock=time.time):
+        """
+        @param window: Seconds after which a spent quota is assumed to be
+        back, if the server doesn't tell
+        @param clock: Function returning the current time, in seconds since
+        the epoch
+        """
+        self.window = window
+        self.clock = clock
+        self.remaining = None
+        self.reset_time = 0
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def update(self, remaining):
+        """
+        Set the quota as reported by the server
+
+        @param remaining: Downloads left, None if unknown
+        """
+        with self.lock:
+            self.remaining = remaining
+            if remaining is None or remaining > 0:
+                self.reset_time = 0
+            elif not self.reset_time:
+                self.reset_time = self.clock() + self.window
+
+    def __expire(self):
+        if self.reset_time and self.clock() >= self.reset_time:
+            self.logger.info('Download quota window is over')
+            self.remaining = None
+            self.reset_time = 0
+
+    def take(self, count):
+        """
+        Get downloads out of the quota
+
+        @param count: Downloads wanted
+        @return: Downloads granted, at most count
+        """
+        with self.lock:
+            self.__expire()
+            if self.remaining is None:
+                return count
+            granted = min(count, self.remaining)
+            self.remaining -= granted
+            if not self.remaining and not self.reset_time:
+                self.reset_time = self.clock() + self.window
+            return granted
+
+    def give_back(self, count):
+        """
+        Return downloads granted but not done
+
+        @param count: Downloads not done
+        """
+        with self.lock:
+            if self.remaining is not None and count > 0:
+                self.remaining += count
+                self.reset_time = 0
+
+    def exhausted(self):
+        """
+        Record that the server refused a download for lack of quota
+        """
+        with self.lock:
+            self.remaining = 0
+            if not self.reset_time:
+                self.reset_time = self.clock() + self.window
+        self.logger.warning('Download quota reached, deferring downloads '
+                            'until %s', format_time(self.reset_time))
+
+    def next_window(self):
+        """
+        @return: Time at which downloads are granted again, 0 if now
+        """
+        with self.lock:
+            self.__expire()
+            return self.reset_time
+
+
+def format_time(when):
+    """
+    @param when: Seconds since the epoch
+    @return: Local time, to the minute
+    """
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(when))
+
+
+def _words(text):
+    return ' %s ' % ' '.join(re.findall(r'[a-z0-9]+', text.lower()))
+
+
+def load_watchlist(path):
+    """
+    Read a watchlist file: one title per line, blank lines and lines
+    starting with # are ignored
+
+    @param path: Path of the file
+    @return: List of titles
+    """
+    with open(path) as f:
+        return [line.strip() for line in f
+                if line.strip() and not line.startswith('#')]
+
+
+def priority(policy='order', watchlist=()):
+    """
+    Build the key ordering files for the quota
+
+    @param policy: One of L{POLICIES}: keep the order files come in, or
+    newest (last modified) files first
+    @param watchlist: Titles whose files come first, matched as whole
+    words in the file names and in the identified names
+    @return: Function of (path, name) returning a sort key, lower first
+    """
+    if policy not in POLICIES:
+        raise ValueError('Invalid priority policy: %s' % policy)
+    titles = [_words(title) for title in watchlist if _words(title).strip()]
+
+    def key(path, name=''):
+        text = _words('%s %s' % (os.path.basename(path), name or ''))
+        watched = any(title in text for title in titles)
+        age = 0
+        if policy == 'newest':
+            try:
+                age = -os.path.getmtime(path)
+            except OSError:
+                pass
+        return (not watched, age)
+
+    return key
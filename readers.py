@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+
+"""
+Random access readers for media, wherever it is stored.
+
+Hashing a movie only needs its size and 64 KiB at both ends, so a L{Reader}
+provides just that: C{size}, and C{read(offset, length)}. This lets us hash
+media without copying it:
+
+  - L{LocalReader}: local file, memory mapped when possible
+  - L{HTTPReader}: file on a web server (or WebDAV share) supporting
+    C{Range} requests
+  - L{BytesReader}: bytes already in memory
+  - L{SegmentsReader}: member of an archive, stored without compression,
+    possibly split over several volumes. L{zip_member} and L{rar_member}
+    find the segments, in an archive that is itself read through a Reader.
+
+L{open_reader} picks the right one from a location: a path, a URL, or
+either of these followed by the path of a member, as if the archive was a
+directory (C{/media/Show.S01E01.rar/Show.S01E01.mkv}).
+"""
+
+import mmap
+import os
+import re
+import struct
+import urllib2
+import zipfile
+
+import misc
+import network
+
+_MEMBER = re.compile(r'^(.*?\.(?:zip|rar))/(.+)$', re.IGNORECASE)
+_CONTENT_RANGE = re.compile(r'^bytes\s+\d+-\d+/(\d+)$')
+_RAR_PART = re.compile(r'\.part(\d+)\.rar$', re.IGNORECASE)
+
+RAR_SIGNATURE = 'Rar!\x1a\x07\x00'
+RAR5_SIGNATURE = 'Rar!\x1a\x07\x01\x00'
+RAR_FILE = 0x74
+RAR_END = 0x7b
+RAR_SPLIT_BEFORE = 0x01
+RAR_SPLIT_AFTER = 0x02
+RAR_ENCRYPTED = 0x04
+RAR_DIRECTORY = 0xe0
+RAR_LARGE = 0x100
+RAR_UNICODE = 0x200
+RAR_LONG_BLOCK = 0x8000
+RAR_STORED = 0x30
+
+
+class Reader(object):
+    """
+    Random access to the bytes of a file.
+
+    Subclasses set C{size} and implement L{read}.
+    """
+    size = 0
+
+    def read(self, offset, length):
+        """
+        Read a range of bytes
+
+        @param offset: Position of the first byte
+        @param length: Number of bytes to read
+        @return: Bytes read, shorter than length at the end of the file
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """
+        Release resources held by the reader
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LocalReader(Reader):
+    """
+    Local file, memory mapped unless it can't be (empty file, or larger
+    than the address space)
+    """
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.size = os.fstat(self.file.fileno()).st_size
+        self.map = None
+        if self.size:
+            try:
+                self.map = mmap.mmap(self.file.fileno(), 0,
+                                     access=mmap.ACCESS_READ)
+            except (mmap.error, OverflowError, ValueError):
+                pass
+
+    def read(self, offset, length):
+        if self.map is not None:
+            return self.map[offset:offset + length]
+        self.file.seek(offset)
+        return self.file.read(length)
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+
+class HTTPReader(Reader):
+    """
+    File on a web server, read with one C{Range} request per read
+    """
+    def __init__(self, url, opener=None):
+        """
+        @param url: URL of the file
+        @param opener: C{urllib2} opener, with timeouts by default
+        @raise: Exception if the server doesn't honor ranges
+        """
+        self.url = url
+        self.opener = opener or network.build_opener()
+        response = self.__get(0, 0)
+        try:
+            match = _CONTENT_RANGE.match(
+                response.info().get('Content-Range', ''))
+        finally:
+            response.close()
+        if not match:
+            raise Exception('%s: unable to get size' % url)
+        self.size = int(match.group(1))
+
+    def __get(self, first, last):
+        request = urllib2.Request(self.url)
+        request.add_header('Range', 'bytes=%d-%d' % (first, last))
+        response = self.opener.open(request)
+        if response.getcode() != 206:
+            response.close()
+            raise Exception('%s: server does not support ranges' % self.url)
+        return response
+
+    def read(self, offset, length):
+        last = min(offset + length, self.size) - 1
+        chunks = []
+        # Servers may answer with less than the range asked for
+        while offset <= last:
+            response = self.__get(offset, last)
+            try:
+                chunk = response.read()
+            finally:
+                response.close()
+            if not chunk:
+                raise Exception('%s: no data at offset %d' % (self.url,
+                                                              offset))
+            chunks.append(chunk)
+            offset += len(chunk)
+        return ''.join(chunks)
+
+
+class BytesReader(Reader):
+    """
+    Bytes already in memory, such as a header read at once
+    """
+    def __init__(self, data):
+        self.data = data
+        self.size = len(data)
+
+    def read(self, offset, length):
+        return self.data[offset:offset + length]
+
+
+class SegmentsReader(Reader):
+    """
+    Concatenation of byte ranges of other readers, such as an archive
+    member split over several volumes
+    """
+    def __init__(self, segments):
+        """
+        @param segments: List of tuples (reader, offset, length). The
+        readers are closed with this one.
+        """
+        self.segments = segments
+        self.size = sum(length for _, _, length in segments)
+
+    def read(self, offset, length):
+        chunks = []
+        for reader, start, size in self.segments:
+            if length <= 0:
+                break
+            if offset >= size:
+                offset -= size
+                continue
+            chunk = reader.read(start + offset, min(length, size - offset))
+            chunks.append(chunk)
+            length -= len(chunk)
+            offset = 0
+        return ''.join(chunks)
+
+    def close(self):
+        closed = set()
+        for reader, _, _ in self.segments:
+            if id(reader) not in closed:
+                closed.add(id(reader))
+                reader.close()
+
+
+class ReaderFile(object):
+    """
+    Read-only file object over a L{Reader}, for modules that want one
+    """
+    def __init__(self, reader):
+        self.reader = reader
+        self.position = 0
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.reader.size
+        self.position = max(0, offset)
+
+    def tell(self):
+        return self.position
+
+    def read(self, length=-1):
+        if length < 0:
+            length = self.reader.size - self.position
+        data = self.reader.read(self.position, length)
+        self.position += len(data)
+        return data
+
+
+def _open_file(location):
+    if misc.is_url(location):
+        return HTTPReader(location)
+    return LocalReader(location)
+
+
+def zip_members(reader):
+    """
+    @param reader: Reader of a zip archive
+    @return: Names of the members that are stored without compression
+    """
+    archive = zipfile.ZipFile(ReaderFile(reader))
+    return [info.filename for info in archive.infolist()
+            if info.compress_type == zipfile.ZIP_STORED and
+            not info.flag_bits & 0x1 and not info.filename.endswith('/')]
+
+
+def zip_member(reader, member):
+    """
+    Find the bytes of a zip archive member
+
+    @param reader: Reader of the archive
+    @param member: Name of the member
+    @return: List of segments, see L{SegmentsReader}
+    @raise: Exception if the member is compressed or encrypted
+    """
+    info = zipfile.ZipFile(ReaderFile(reader)).getinfo(member)
+    if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+        raise Exception('%s is compressed or encrypted' % member)
+
+    # Data follows the local header, whose extra field may differ from the
+    # one in the central directory
+    header = reader.read(info.header_offset, 30)
+    if header[:4] != 'PK\x03\x04':
+        raise Exception('%s: bad local header' % member)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    offset = info.header_offset + 30 + name_length + extra_length
+    return [(reader, offset, info.file_size)]
+
+
+def _rar_entries(reader):
+    """
+    Walk the file headers of a RAR (1.5 to 4.x) volume
+
+    @param reader: Reader of the volume
+    @return: Iterator of tuples (name, flags, method, data offset, packed
+    size)
+    """
+    signature = reader.read(0, len(RAR5_SIGNATURE))
+    if signature == RAR5_SIGNATURE:
+        raise Exception('RAR 5 archives are not supported')
+    if not signature.startswith(RAR_SIGNATURE):
+        raise Exception('Not a RAR archive')
+
+    offset = len(RAR_SIGNATURE)
+    while offset + 7 <= reader.size:
+        _, kind, flags, head_size = struct.unpack(
+            '<HBHH', reader.read(offset, 7))
+        if head_size < 7:
+            raise Exception('Corrupt RAR archive')
+        if kind == RAR_END:
+            break
+
+        data_size = 0
+        if kind == RAR_FILE:
+            # One read for the whole header, it's a request over HTTP
+            header = reader.read(offset + 7, head_size - 7)
+            (data_size, _, _, _, _, _, method, name_size,
+             _) = struct.unpack('<IIBIIBBHI', header[:25])
+            position = 25
+            if flags & RAR_LARGE:
+                high_size, _ = struct.unpack('<II', header[25:33])
+                data_size += high_size << 32
+                position += 8
+            name = header[position:position + name_size]
+            if flags & RAR_UNICODE:
+                name = name.split('\0')[0]
+            yield (name.replace('\\', '/'), flags, method, offset + head_size,
+                   data_size)
+        elif flags & RAR_LONG_BLOCK:
+            (data_size,) = struct.unpack('<I', reader.read(offset + 7, 4))
+
+        offset += head_size + data_size
+
+
+def rar_volume(location, index):
+    """
+    Location of a volume of a RAR set
+
+    Both naming schemes are supported: name.part1.rar, name.part2.rar, ...
+    and name.rar, name.r00, ...
+
+    @param location: Location of the first volume
+    @param index: Index of the volume, 0 for the first one
+    @return: Location of the volume
+    """
+    match = _RAR_PART.search(location)
+    if match:
+        number = str(int(match.group(1)) + index).zfill(len(match.group(1)))
+        return '%s.part%s.rar' % (location[:match.start()], number)
+    if index == 0:
+        return location
+    return '%s.r%02d' % (location[:-4], index - 1)
+
+
+def rar_members(reader):
+    """
+    @param reader: Reader of the first volume of a RAR archive
+    @return: Names of the members that are stored without compression
+    """
+    return [name for name, flags, method, _, _ in _rar_entries(reader)
+            if method == RAR_STORED and
+            not flags & (RAR_SPLIT_BEFORE | RAR_ENCRYPTED) and
+            flags & RAR_DIRECTORY != RAR_DIRECTORY]
+
+
+def rar_member(reader, member, location=None):
+    """
+    Find the bytes of a RAR archive member, following it over volumes
+
+    @param reader: Reader of the first volume
+    @param member: Name of the member
+    @param location: Location of the first volume, to find the next ones
+    @return: List of segments, see L{SegmentsReader}
+    @raise: Exception if the member is compressed, encrypted or missing
+    """
+    segments = []
+    opened = []
+    volume = reader
+    index = 0
+    try:
+        while True:
+            for name, flags, method, offset, size in _rar_entries(volume):
+                if name == member:
+                    break
+            else:
+                raise Exception('%s not found in volume %d' % (member,
+                                                               index + 1))
+
+            if method != RAR_STORED or flags & RAR_ENCRYPTED:
+                raise Exception('%s is compressed or encrypted' % member)
+            segments.append((volume, offset, size))
+
+            if not flags & RAR_SPLIT_AFTER:
+                return segments
+            if not location:
+                raise Exception('%s continues in another volume' % member)
+            index += 1
+            volume = _open_file(rar_volume(location, index))
+            opened.append(volume)
+    except Exception:
+        # The caller only knows about the first volume
+        for volume in opened:
+            volume.close()
+        raise
+
+
+def open_reader(location):
+    """
+    Open a reader on a location
+
+    @param location: Path or URL of a file, or of an archive followed by
+    the path of a member
+    @return: L{Reader}
+    """
+    match = _MEMBER.match(location)
+    if not match or not (misc.is_url(location) or
+                         os.path.isfile(match.group(1))):
+        return _open_file(location)
+
+    archive, member = match.groups()
+    reader = _open_file(archive)
+    try:
+        if archive.lower().endswith('.zip'):
+            return SegmentsReader(zip_member(reader, member))
+        return SegmentsReader(rar_member(reader, member, archive))
+    except Exception:
+        reader.close()
+        raise
+
+
+def archive_members(location):
+    """
+    List the members of an archive that can be read
+
+    @param location: Path or URL of a zip archive, or of the first volume of
+    a RAR set
+    @return: List of locations of the members, see L{open_reader}
+    """
+    with _open_file(location) as reader:
+        if location.lower().endswith('.zip'):
+            names = zip_members(reader)
+        else:
+            names = rar_members(reader)
+    return ['%s/%s' % (location, name) for name in names]
+
+
+def local_path(location):
+    """
+    Local path standing for a location, next to which files about it can be
+    written
+
+    @param location: See L{open_reader}
+    @return: Path next to the archive for archive members, in the current
+    directory for URLs, the location itself for local files
+    """
+    match = _MEMBER.match(location)
+    if match and (misc.is_url(location) or os.path.isfile(match.group(1))):
+        archive, member = match.groups()
+        location = os.path.join(os.path.dirname(archive),
+                                os.path.basename(member))
+    if misc.is_url(location):
+        location = urllib2.unquote(
+            os.path.basename(location.split('?')[0].rstrip('/')))
+    return location
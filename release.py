@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+"""
+Parse release file names.
+
+Release names look like C{Show.Name.S01E02E03.720p.HDTV.x264-GROUP.mkv} or
+C{Movie Name (2010) 1080p BluRay.avi}. L{parse} extracts the title, year,
+season and episodes, resolution and release group, with a single scan of
+one compiled regex, and remembers the result for each name.
+
+The year is the last year-like token before the other release markers,
+earlier ones are part of the title: C{Blade.Runner.2049.2017.1080p.mkv}
+is Blade Runner 2049, from 2017.
+"""
+
+import collections
+import os
+import re
+
+ReleaseInfo = collections.namedtuple(
+    'ReleaseInfo',
+    ['title', 'year', 'season', 'episodes', 'resolution', 'group'])
+"""
+Information parsed from a release name. Fields not found are None, and
+episodes is a (possibly empty) tuple.
+"""
+
+CACHE_SIZE = 4096
+"Maximum number of parsed names kept by L{parse}"
+
+_PATTERN = re.compile(r"""
+    ^\[(?P<leading_group>[^\]]+)\]
+  | \bs(?P<season>\d{1,2})(?P<episodes>(?:[ -]?e\d{1,3})+)\b
+  | \b(?P<x_season>\d{1,2})x(?P<x_episodes>\d{2,3}(?:[-x]\d{2,3})*)\b
+  | \b(?P<year>(?:19|20)\d{2})\b
+  | \b(?P<resolution>\d{3,4}[pi]|4k)\b
+  | \b(?P<tag>bluray|bdrip|brrip|web-?dl|web-?rip|hdtv|pdtv|dvdrip|
+      dvdscr|hdrip|xvid|divx|[xh]26[45]|hevc|aac|ac3|dts|proper|
+      repack|internal|limited|extended|unrated|multi|subbed)\b
+  | -(?P<group>[^\s\-\[\]()]+)$
+""", re.VERBOSE | re.IGNORECASE)
+
+_SEPARATORS = re.compile(r'[._\s]+')
+_EPISODE = re.compile(r'\d+')
+_TRAILING = re.compile(r'[\s\-\[(]+$')
+
+_KINDS = {'episodes': 'season', 'x_episodes': 'x_season'}
+
+_cache = {}
+
+
+def parse(name):
+    """
+    Parse a release name
+
+    @param name: File name (directories are ignored), with or without
+    extension
+    @return: L{ReleaseInfo}
+    """
+    name = os.path.basename(name)
+    try:
+        return _cache[name]
+    except KeyError:
+        pass
+
+    info = _parse(name)
+
+    if len(_cache) >= CACHE_SIZE:
+        _cache.clear()
+    _cache[name] = info
+    return info
+
+
+def _parse(name):
+    stem, extension = os.path.splitext(name)
+    if not 1 < len(extension) <= 5 or not extension[1:].isalnum():
+        stem = name
+
+    text = _SEPARATORS.sub(' ', stem).strip()
+
+    title_end = None
+    title_start = 0
+    year = season = resolution = group = None
+    episodes = ()
+    # Years seen before any other marker, only the last one is the year
+    years = []
+
+    for match in _PATTERN.finditer(text):
+        # lastgroup is the last group closed in the matching alternative
+        kind = _KINDS.get(match.lastgroup, match.lastgroup)
+        value = match.group(kind)
+
+        if kind == 'leading_group':
+            group = value.strip()
+            title_start = match.end()
+            continue
+        if kind == 'group':
+            # A trailing dash is only a group after some release marker,
+            # otherwise it's part of the title (Spider-Man)
+            if title_end is not None or years:
+                group = value
+            continue
+        if kind == 'year' and match.start() <= title_start:
+            # The title itself is a year (2012)
+            continue
+        if kind == 'year' and title_end is None:
+            years.append(match)
+            continue
+
+        if title_end is None:
+            title_end = match.start()
+            if years:
+                title_end = years[-1].start()
+                year = int(years[-1].group('year'))
+
+        if kind in ('season', 'x_season') and season is None:
+            season = int(value)
+            episodes = tuple(int(episode) for episode in _EPISODE.findall(
+                match.group('episodes' if kind == 'season' else
+                            'x_episodes')))
+        elif kind == 'year' and year is None:
+            year = int(value)
+        elif kind == 'resolution' and resolution is None:
+            resolution = value.lower()
+
+    if title_end is None and years:
+        title_end = years[-1].start()
+        year = int(years[-1].group('year'))
+
+    title = text[title_start:title_end]
+    title = _TRAILING.sub('', title).strip(' -') or None
+
+    return ReleaseInfo(title=title, year=year, season=season,
+                       episodes=episodes, resolution=resolution, group=group)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+"""
+Local content-addressed store for subtitles.
+
+Subtitles are stored once, under the SHA-1 of their content, and each
+provider subtitle id points to the content it resolved to. This lets us
+share the same file between runs (and between providers), and avoid
+downloading again something we already have.
+
+The store is bounded in size: when it grows beyond C{max_size}, the least
+recently used contents are evicted.
+
+Layout of the store directory::
+
+    objects/<2 first hex digits>/<remaining hex digits>
+    keys/<provider>/<subtitle id>   (contains the hex digest)
+"""
+
+import collections
+import hashlib
+import logging
+import os
+import threading
+
+import misc
+
+DEFAULT_PATH = misc.cache_path('subtitles')
+"Default location of the store"
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+"Default maximum size of the store, in bytes"
+
+
+class SubtitleStore(object):
+    """
+    Content-addressed subtitle store with LRU eviction by total size.
+
+    Access time is tracked through the modification time of the object
+    files. The store is walked once when opened, to index the size and
+    access time of its contents; puts and evictions then keep the index
+    and the total size up to date, so that adding content doesn't walk the
+    store again.
+    """
+    def __init__(self, path=DEFAULT_PATH, max_size=DEFAULT_MAX_SIZE):
+        """
+        Create (or open) store
+
+        @param path: Directory where the store lives
+        @param max_size: Maximum total size of the contents, in bytes
+        """
+        self.path = path
+        self.max_size = max_size
+        self.logger = logging.getLogger(__name__)
+        self.lock = threading.Lock()
+        # {digest: size}, least recently used first
+        self.index = collections.OrderedDict()
+        self.total = 0
+        for digest, size, _ in sorted(self.__objects(),
+                                      key=lambda obj: obj[2]):
+            self.index[digest] = size
+            self.total += size
+
+    @staticmethod
+    def digest(content):
+        """
+        Compute the key used to store content
+
+        @param content: Subtitle content
+        @return: Hex SHA-1 of content
+        """
+        return hashlib.sha1(content).hexdigest()
+
+    def __object_path(self, digest):
+        return os.path.join(self.path, 'objects', digest[:2], digest[2:])
+
+    def __key_path(self, provider, subid):
+        return os.path.join(self.path, 'keys', str(provider), str(subid))
+
+    def get_content(self, digest):
+        """
+        Get content by digest, and mark it as recently used
+
+        @param digest: Hex SHA-1 of the content
+        @return: Content, None if not in the store
+        """
+        path = self.__object_path(digest)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            os.utime(path, None)
+        except (IOError, OSError):
+            return None
+
+        with self.lock:
+            self.__used(digest, len(content))
+        return content
+
+    def get(self, provider, subid):
+        """
+        Get subtitle downloaded from provider
+
+        @param provider: Name of the provider (opensubtitles, tvsubtitles)
+        @param subid: Subtitle id for that provider
+        @return: Subtitle content, None if not in the store
+        """
+        try:
+            with open(self.__key_path(provider, subid)) as f:
+                digest = f.read().strip()
+        except IOError:
+            return None
+
+        content = self.get_content(digest)
+        if content is not None:
+            self.logger.debug('Store hit: %s %s', provider, subid)
+        return content
+
+    def put(self, provider, subid, content):
+        """
+        Add subtitle to the store
+
+        @param provider: Name of the provider (opensubtitles, tvsubtitles)
+        @param subid: Subtitle id for that provider
+        @param content: Subtitle content
+        @return: Digest of the content
+        """
+        digest = self.digest(content)
+        path = self.__object_path(digest)
+        if os.path.exists(path):
+            os.utime(path, None)
+        else:
+            misc.atomic_write(path, content)
+        misc.atomic_write(self.__key_path(provider, subid), digest)
+
+        with self.lock:
+            self.__used(digest, len(content))
+            if self.total > self.max_size:
+                self.__evict()
+
+        return digest
+
+    def size(self):
+        """
+        @return: Total size of the contents in the store, in bytes
+        """
+        with self.lock:
+            return self.total
+
+    def __used(self, digest, size):
+        """
+        Move content to the most recently used end of the index
+        """
+        self.total -= self.index.pop(digest, 0)
+        self.index[digest] = size
+        self.total += size
+
+    def __objects(self):
+        """
+        List objects of the store
+
+        @return: List of tuples: (digest, size, last access)
+        """
+        objects = []
+        for root, _, files in os.walk(os.path.join(self.path, 'objects')):
+            for name in files:
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                digest = os.path.basename(root) + name
+                objects.append((digest, stat.st_size, stat.st_mtime))
+        return objects
+
+    def evict(self):
+        """
+        Remove least recently used contents until the store fits in
+        C{max_size}.
+
+        Keys pointing to evicted contents are left dangling, and are
+        simply treated as misses.
+        """
+        with self.lock:
+            self.__evict()
+
+    def __evict(self):
+        while self.total > self.max_size and self.index:
+            digest, size = self.index.popitem(last=False)
+            self.total -= size
+            path = self.__object_path(digest)
+            try:
+                os.remove(path)
+            except OSError:
+                # Already gone, e.g. evicted by another process
+                continue
+            self.logger.debug('Store evicted: %s', path)
@@ -2,23 +2,60 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import functools
+import heapq
+import json
 import logging
 import operator
 import os
 import re
 import struct
 import sys
+import threading
+import time
 
+import cassette
+import containers
+import httpcache
 import iso639
+import journal
 import misc
+import misses
+import network
 import opensubtitles
+import pipeline
+import quota
+import readers
+import release
+import store
+import subgetterd
 import tvsubtitles
 
+MAX_CHOICES = 10
+"Maximum number of candidates given to the asker"
+VIDEO_EXTENSIONS = ('avi', 'divx', 'm4v', 'mkv', 'mov', 'mp4', 'mpeg', 'mpg',
+                    'ogm', 'ts', 'wmv')
+"Extensions of the files we look for in directories"
+ARCHIVE_EXTENSIONS = ('rar', 'zip')
+"Extensions of the archives whose members we look into, see L{readers}"
+CONTAINER_EXTENSIONS = ('m4v', 'mkv', 'mov', 'mp4', 'webm')
+"Extensions of the files that may carry subtitle tracks, see L{containers}"
+KEEP_ALIVE = 10 * 60
+"Seconds between two keep alive requests of the server"
+IMDB_TITLE = re.compile(r'^(.*?)(?:\s+\(\d{4}[^)]*\))?$')
+"Title of a movie found by name, and its year, see L{imdb_movies}"
+HASH_XATTR = 'user.subgetter.hash'
+"Extended attribute where a file's hash is remembered, see L{MovieFile}"
+
+
 class Movie(object):
     MOVIE = "movie"
     EPISODE = "episode"
     TVSHOW = "tv series"
 
+    # Large libraries hold many of these at once: no per instance dict
+    __slots__ = ('name', 'imdbid', 'kind', 'season', 'episode')
+
     def __init__(self, name, kind=MOVIE, imdbid=0, season=0, episode=0):
         self.name = str(name)
         try:
@@ -44,6 +81,13 @@ class Movie(object):
         return "Name: {0.name}\nKind: {0.kind}\nIMDb Id: {0.imdbid}{1}".format(
             self, tvshow)
 
+    def copy(self):
+        """
+        @return: New Movie with the same info
+        """
+        return Movie(self.name, kind=self.kind, imdbid=self.imdbid,
+                     season=self.season, episode=self.episode)
+
     def update_info(self, movie):
         self.name = movie.name
         self.imdbid = movie.imdbid
@@ -52,104 +96,153 @@ class Movie(object):
         self.episode = movie.episode
 
 class MovieFile(Movie):
-    def __init__(self, path):
+    __slots__ = ('path', 'hash', 'size', 'extension', 'missing')
+
+    def __init__(self, path, moviehash=None, xattr=False):
+        """
+        @param path: Location of the movie file: local path, URL, or member
+        of an archive, see L{readers.open_reader}
+        @param moviehash: Hash of the file if already known, computed
+        otherwise
+        @param xattr: Remember the hash in an extended attribute of the
+        file (L{HASH_XATTR}), with the size and modification time it was
+        computed at. It follows the file when it is renamed or moved within
+        the filesystem, so the file doesn't have to be read again. Only
+        local files have extended attributes.
+        """
         super(MovieFile, self).__init__("", "")
 
         # File info
         self.path = str(path)
-        self.hash = self.__hash(path)
-        self.size = os.path.getsize(path)
+        # Three letters codes of the languages the file has no subtitle in,
+        # None if not checked (then all are wanted)
+        self.missing = None
         self.extension = path.split('.')[-1]
+        xattr = xattr and os.path.isfile(self.path)
+        if not moviehash and xattr:
+            moviehash = self.__stored_hash()
+
+        with readers.open_reader(self.path) as reader:
+            self.size = reader.size
+            if not moviehash:
+                moviehash = self.__hash(reader)
+                if xattr:
+                    self.__store_hash(moviehash)
+        self.hash = moviehash
 
     def __str__(self):
         return "Movie {0.path} ({0.hash} size {0.size}):\n{1}".format(
             self, super(MovieFile, self).__str__())
 
+    def __stamp(self):
+        stat = os.stat(self.path)
+        return '%d %r' % (stat.st_size, stat.st_mtime)
+
+    def __stored_hash(self):
+        value = misc.get_xattr(self.path, HASH_XATTR)
+        if not value:
+            return None
+        moviehash, _, stamp = value.partition(' ')
+        if stamp != self.__stamp():
+            # The file changed since
+            return None
+        return moviehash
+
+    def __store_hash(self, moviehash):
+        if not misc.set_xattr(self.path, HASH_XATTR,
+                              '%s %s' % (moviehash, self.__stamp())):
+            logging.getLogger(__name__).debug(
+                'Unable to remember hash of %s', self.path)
+
     @staticmethod
-    def __hash(path):
+    def __hash(reader):
         """
         Calculates the hash value of a movie.
         Source:
 http://trac.opensubtitles.org/projects/opensubtitles/wiki/HashSourceCodes
-        """
-        longlongformat = 'q'  # long long
-        bytesize = struct.calcsize(longlongformat)
 
-        f = open(path, "rb")
+        The size, and the first and last 64 KiB are all we need, so this
+        only does two reads.
 
-        filesize = os.path.getsize(path)
-        hash = filesize
+        @param reader: L{readers.Reader} of the movie file
+        """
+        longlongformat = '%dq' % (65536 // struct.calcsize('q'))
 
+        filesize = reader.size
         if filesize < 65536 * 2:
             return "SizeError"
 
-        for x in range(65536 // bytesize):
-            buffer = f.read(bytesize)
-            (l_value,) = struct.unpack(longlongformat, buffer)
-            hash += l_value
-            hash = hash & 0xFFFFFFFFFFFFFFFF  # to remain as 64bit number
-
-        f.seek(max(0, filesize - 65536), 0)
-        for x in range(65536 // bytesize):
-            buffer = f.read(bytesize)
-            (l_value,) = struct.unpack(longlongformat, buffer)
-            hash += l_value
-            hash = hash & 0xFFFFFFFFFFFFFFFF
+        # Summing everything, and then keeping 64 bits, is the same as
+        # keeping 64 bits at each step
+        hash = filesize
+        hash += sum(struct.unpack(longlongformat, reader.read(0, 65536)))
+        hash += sum(struct.unpack(longlongformat,
+                                  reader.read(filesize - 65536, 65536)))
+        hash = hash & 0xFFFFFFFFFFFFFFFF  # to remain as 64bit number
 
-        f.close()
         returnedhash = "%016x" % hash
         return returnedhash
 
     def filename(self):
         return os.path.basename(self.path)
 
-    def subname(self):
-        return '.'.join(self.path.split('.')[:-1]) + '.srt'
+    def subname(self, language=None):
+        """
+        @param language: Language code to put in the name, if any
+        @return: Path of the subtitle: name.srt or name.<language>.srt, see
+        L{readers.local_path} for movies that aren't local files
+        """
+        base = '.'.join(readers.local_path(self.path).split('.')[:-1])
+        if language:
+            base += '.' + language
+        return base + '.srt'
 
-    def has_subtitle(self):
+    def has_subtitle(self, language=None):
         try:
-            os.stat(self.subname())
+            os.stat(self.subname(language))
         except OSError:
             return False
         else:
             return True
 
+    def embedded_languages(self):
+        """
+        @return: Set of three letters codes of the languages of the subtitle
+        tracks the file carries, see L{containers}
+        """
+        if self.extension.lower() not in CONTAINER_EXTENSIONS:
+            return set()
+        return containers.probe(self.path)
+
     def osdb_criteria(self):
-        return {
+        criteria = {
             'hash': self.hash,
             'size': self.size,
             'name': self.filename(),
             }
+        if self.imdbid:
+            criteria['imdbid'] = self.imdbid
+        return criteria
 
     def guess(self):
         """
         Let's try to guess what movie it can be.
 
+        The title is parsed out of the release name by L{release.parse},
+        without extension, resolution or release group.
+
         @return: Movie with the info we guessed
         """
-        # XXX: Potentially, we could remove some garbage here
-        name = self.filename()
+        info = release.parse(self.filename())
+        name = info.title or self.filename()
 
-        epsea = self.__guess_episode_season()
-        if not epsea:
+        if info.season is None or not info.episodes:
             return Movie(name=name)
         else:
             return Movie(name=name,
                          kind="episode",
-                         season=epsea[0],
-                         episode=epsea[1])
-
-    def __guess_episode_season(self):
-        base = os.path.basename(self.path)
-
-        match = re.search(
-            "[sS]?(?P<season>\d{1,2})[-xXeE](?P<episode>\d{1,2})",
-            base)
-        if match:
-            return (int(match.groupdict()['season']),
-                    int(match.groupdict()['episode']))
-        else:
-            return None
+                         season=info.season,
+                         episode=info.episodes[0])
 
 class Asker(object):
     """
@@ -162,6 +255,13 @@ class Asker(object):
 
     Function to be implemented: select
     """
+    pending = ()
+    "Files whose selection was deferred, see L{TextAsker}"
+    runner = None
+    """Function (func, *args) running the questions to the user, e.g.
+    L{pipeline.Pipeline.call}; they are asked in the calling thread if not
+    set"""
+
     def __init__(self, ask_threshold):
         """
         Create asker
@@ -211,10 +311,100 @@ class TextAsker(Asker):
     This gives the user the opportunity to fill in the movie name and other
     information manually from a terminal.
     Either select from a list of movies or type in the information.
+
+    When deferring, questions are not asked while identifying: they are
+    kept in L{pending}, so that confident files don't wait for the user.
+    They can then be asked with L{ask_pending}, or saved to a file with
+    L{save_pending} and loaded later with L{load_pending}.
     """
+    def __init__(self, ask_threshold, defer=False):
+        """
+        Create asker
+
+        @param ask_threshold: Below this score, we ask for suggestions
+        @param defer: Keep questions for later instead of asking them
+        """
+        super(TextAsker, self).__init__(ask_threshold)
+        self.defer = defer
+        self.pending = []
+
     def select(self, moviefile, choices):
         """
         Output choices, and read the input
+
+        If deferring, only remember the question.
+        """
+        if self.defer:
+            self.pending.append((moviefile, choices))
+            return None
+
+        if self.runner:
+            return self.runner(self.ask, moviefile, choices)
+        return self.ask(moviefile, choices)
+
+    def ask_pending(self):
+        """
+        Ask all deferred questions
+
+        @return: List of MovieFiles identified by the user
+        """
+        identified = []
+        while self.pending:
+            moviefile, choices = self.pending.pop(0)
+            movie = self.ask(moviefile, choices)
+            if movie:
+                moviefile.update_info(movie)
+                identified.append(moviefile)
+
+        return identified
+
+    def save_pending(self, path):
+        """
+        Write deferred questions to a file, to be resolved later
+
+        @param path: Path of the questions file
+        """
+        questions = [
+            {'path': moviefile.path,
+             'missing': (None if moviefile.missing is None
+                         else sorted(moviefile.missing)),
+             'choices': [{'name': movie.name,
+                          'kind': movie.kind,
+                          'imdbid': movie.imdbid,
+                          'season': movie.season,
+                          'episode': movie.episode,
+                          'score': score}
+                         for movie, score in choices]}
+            for moviefile, choices in self.pending]
+
+        with open(path, 'w') as f:
+            json.dump(questions, f, indent=2)
+
+    def load_pending(self, path):
+        """
+        Read questions written by L{save_pending}
+
+        @param path: Path of the questions file
+        """
+        with open(path) as f:
+            questions = json.load(f)
+
+        for question in questions:
+            choices = [(Movie(choice['name'],
+                              kind=choice['kind'],
+                              imdbid=choice['imdbid'],
+                              season=choice['season'],
+                              episode=choice['episode']),
+                        choice['score'])
+                       for choice in question['choices']]
+            moviefile = MovieFile(question['path'])
+            if question.get('missing') is not None:
+                moviefile.missing = set(question['missing'])
+            self.pending.append((moviefile, choices))
+
+    def ask(self, moviefile, choices):
+        """
+        Output choices, and read the input
         """
         print 'Identifying movie:', moviefile.path
         print self.__show_choices(choices)
@@ -283,7 +473,7 @@ class AutomaticAsker(Asker):
     def __init__(self, minimum=0):
         super(AutomaticAsker, self).__init__(minimum)
 
-    def select(self, choices):
+    def select(self, moviefile, choices):
         """
         Choose no choice if we have to select
 
@@ -292,18 +482,39 @@ class AutomaticAsker(Asker):
         """
         return None
 
-class MovieScore(object):
-    def __score_kind(self, given, guessed):
+class BatchScorer(object):
+    """
+    Score many candidate movies against what we guessed from a file.
+
+    Everything that only depends on the guess is computed once, and
+    candidates are never modified: the adjusted copies are returned
+    instead, so a scorer can be shared between threads.
+
+    Kind score is 40%
+    Name score is 60%
+    """
+    SHOW_NAME = re.compile("\"(.*)\"")
+    "Show name in an episode name, like: \"Show\" Episode title"
+
+    def __init__(self, movie_guessed):
         """
-        Calculate score based on movie kind, season and episode
+        Prepare scoring against a guess
+
+        @param movie_guessed: This is what we guessed from the filename
+        """
+        self.guessed = movie_guessed
+        self.guessed_profile = misc.bigram_profile(movie_guessed.name)
 
-        This modify the movie given if we fill we can do better
+    def __score_kind(self, given):
+        """
+        Calculate score based on movie kind, season and episode
 
-        @param given: Movie info given
-        @param guessed: Movie info we tried to guess
+        @param given: Copy of the movie info given, adjusted in place if we
+        feel we can do better
         @return: score calculated. Range is 0 to 1
         @rtype: float
         """
+        guessed = self.guessed
         score = 0
 
         # Handle score for kind, season and episode
@@ -311,6 +522,8 @@ class MovieScore(object):
             given.kind = Movie.EPISODE
             given.season = guessed.season
             given.episode = guessed.episode
+            # The IMDb id is the show's, not the episode's
+            given.imdbid = 0
             score = 0.75
         elif (given.kind == Movie.EPISODE and
               guessed.kind == Movie.EPISODE):
@@ -320,7 +533,7 @@ class MovieScore(object):
             if given.episode == guessed.episode:
                 score += 0.25
             # We need to get show name from episode name, if possible
-            m = re.search("\"(.*)\"", given.name)
+            m = self.SHOW_NAME.search(given.name)
             if m:
                 given.name = m.group(1)
         elif given.kind == Movie.MOVIE and guessed.kind == Movie.MOVIE:
@@ -330,43 +543,50 @@ class MovieScore(object):
 
         return score
 
-    def __score_name(self, given, guessed):
+    def __score_name(self, given):
         """
         Calculate score based on name
 
         @param given: Given movie name
-        @param guessed: Guessed movie name
         @return: score calculated. Range from 0 to 1.
         @rtype: float
         """
-        score = misc.strings_contained(guessed, given)
-        score += misc.dice_coefficient(guessed, given)
+        score = misc.strings_contained(self.guessed.name, given)
+        score += misc.bigram_profile(given).dice(self.guessed_profile)
 
         assert 0 <= score <= 2
 
         return score / 2
 
-    def score(self, movie_given, movie_guessed):
+    def score(self, movie_given):
         """
-        Give a score for matching two movies
-
-        Kind score is 40%
-        Name score is 60%
+        Give a score for matching a movie against the guess
 
-        @warning: This method can modify the movie_given
-
-        @param movie_guessed: This is what we guessed from the filename
         @param movie_given: This is the movie given by osdb
-        @return: (movie_given, score), score is what we calculated
+        @return: (movie, score): movie is an adjusted copy of movie_given,
         score range is from 0 to 1
-        @rtype: float
         """
-        kind_score = self.__score_kind(movie_given, movie_guessed)
-        name_score = self.__score_name(movie_given.name, movie_guessed.name)
+        movie = movie_given.copy()
+        kind_score = self.__score_kind(movie)
+        name_score = self.__score_name(movie.name)
+
+        return (movie, kind_score * 0.4 + name_score * 0.6)
 
-        score = kind_score * 0.4 + name_score * 0.6
+    def top(self, movies, count=None):
+        """
+        Score all movies, and keep the best ones
+
+        @param movies: Candidate movies
+        @param count: Number of candidates to keep, all if None
+        @return: List of (movie, score), sorted by increasing score
+        """
+        scores = [self.score(movie) for movie in movies]
+        if count is not None:
+            scores = heapq.nlargest(count, scores, key=operator.itemgetter(1))
+        scores.sort(key=operator.itemgetter(1))
+
+        return scores
 
-        return (movie_given, score)
 
 def identify_one_movie(moviefile, movies, asker):
     """
@@ -376,13 +596,8 @@ def identify_one_movie(moviefile, movies, asker):
     @param movies: Movies we found from osdb
     @param asker: Asker instance to get opinion from user
     """
-    movie_guess = moviefile.guess()
-
     # Give a note to each movies, against what we have
-    scores = [MovieScore().score(movie, movie_guess) for movie in movies]
-
-    # sort scores
-    scores.sort(key=operator.itemgetter(1))
+    scores = BatchScorer(moviefile.guess()).top(movies, MAX_CHOICES)
 
     # Finally, let's decide amongst all movies
     movie = asker.pick(moviefile, scores)
@@ -391,13 +606,189 @@ def identify_one_movie(moviefile, movies, asker):
         moviefile.update_info(movie)
 
 
+def osdb_movies(infos):
+    """
+    Convert movies information from osdb
+
+    @param infos: List of dicts, as returned by check_hashes
+    @return: List of Movies
+    """
+    return [Movie(info['MovieName'],
+                  kind=info['MovieKind'],
+                  imdbid=info['MovieImdbID'],
+                  season=info['SeriesSeason'],
+                  episode=info['SeriesEpisode'])
+            for info in infos]
+
+
+def imdb_movies(results):
+    """
+    Convert movies found by name on osdb
+
+    Titles look like C{Movie (1999)}, or C{"Show" (2004)} for TV series.
+
+    @param results: List of dicts, as returned by search_on_imdb
+    @return: List of Movies
+    """
+    movies = []
+    for result in results:
+        title = result['title']
+        if isinstance(title, unicode):
+            title = title.encode('utf-8')
+        name = IMDB_TITLE.match(title).group(1)
+        kind = Movie.TVSHOW if title.startswith('"') else Movie.MOVIE
+        movies.append(Movie(name.strip('"'), kind=kind, imdbid=result['id']))
+    return movies
+
+
+def name_query(moviefile):
+    """
+    Query to search a movie file by name
+
+    @param moviefile: MovieFile
+    @return: Title parsed from the file name, with the year if any
+    """
+    info = release.parse(moviefile.filename())
+    query = info.title or moviefile.filename()
+    if info.year:
+        query += ' %d' % info.year
+    return query
+
+
+def identify_by_name(moviefiles, osdb, asker):
+    """
+    Identify movies osdb doesn't know the hash of, by their name
+
+    Queries are cleaned from the file names, and each distinct one is
+    searched once, all of them concurrently. Results are scored against the
+    file names like hash matches are.
+
+    @param moviefiles: MovieFiles to identify
+    @param osdb: OSDb Handler
+    @param asker: Asker instance to get input from user
+    """
+    queries = {}
+    for moviefile in moviefiles:
+        queries.setdefault(show_key(name_query(moviefile)), []).append(
+            moviefile)
+
+    results = osdb.search_on_imdb_names(queries.keys())
+
+    for query, group in queries.items():
+        movies = imdb_movies(results.get(query) or [])
+        if not movies:
+            continue
+        for moviefile in group:
+            identify_one_movie(moviefile, movies, asker)
+
+
+def show_key(name):
+    """
+    Normalize a show name, so that siblings with slightly different names
+    (case, punctuation) end up together
+
+    @param name: Show name, as guessed from a file name
+    @return: Normalized name
+    """
+    return ' '.join(re.split(r'\W+', name.lower())).strip()
+
+
+def group_episodes(moviefiles):
+    """
+    Cluster episodes of the same show
+
+    Episodes are grouped by directory and by the show name parsed from
+    their file names. Files that don't look like episodes are left out.
+
+    @param moviefiles: MovieFiles to group
+    @return: List of lists of MovieFiles
+    """
+    groups = {}
+    for moviefile in sorted(moviefiles, key=operator.attrgetter('path')):
+        guess = moviefile.guess()
+        if guess.kind != Movie.EPISODE:
+            continue
+        key = (os.path.dirname(os.path.abspath(moviefile.path)),
+               show_key(guess.name))
+        groups.setdefault(key, []).append(moviefile)
+
+    return groups.values()
+
+
+def show_name(name):
+    """
+    @param name: Show name, or episode name from osdb, see
+    L{BatchScorer.SHOW_NAME}
+    @return: Show name
+    """
+    match = BatchScorer.SHOW_NAME.search(name)
+    return match.group(1) if match else name
+
+
+def identify_episodes(moviefiles, movies_info, asker):
+    """
+    Identify episodes of a single show
+
+    The show is identified once, from the first episode that osdb knows
+    and that identifies as an episode (others may be deferred, ambiguous or
+    not episodes), and then propagated to all of them: only season and
+    episode numbers are taken from each file. If osdb knows none of them,
+    the show name guessed from the file names is used, so that tvsubtitles
+    can still find them. Files osdb matched to an episode of another show
+    keep that match.
+
+    @param moviefiles: MovieFiles of the same show, see L{group_episodes}
+    @param movies_info: Dict {hash: osdb infos}, as from check_hashes
+    @param asker: Asker instance to get input from user
+    """
+    show = None
+    identified = None
+    for moviefile in moviefiles:
+        if movies_info.get(moviefile.hash):
+            identify_one_movie(moviefile,
+                               osdb_movies(movies_info[moviefile.hash]),
+                               asker)
+            if moviefile.kind == Movie.EPISODE:
+                show = moviefile.name
+                identified = moviefile
+                break
+
+    if not show:
+        show = moviefiles[0].guess().name
+
+    for moviefile in moviefiles:
+        if moviefile is identified:
+            continue
+
+        guess = moviefile.guess()
+        episode = Movie(show, kind=Movie.EPISODE,
+                        season=guess.season, episode=guess.episode)
+        # osdb may know this very episode, then keep its IMDb id, or the
+        # whole match if it is of another show
+        for movie in osdb_movies(movies_info.get(moviefile.hash) or []):
+            if (movie.kind == Movie.EPISODE and
+                    (movie.season, movie.episode) == (guess.season,
+                                                      guess.episode)):
+                if show_key(show_name(movie.name)) == show_key(show):
+                    episode.imdbid = movie.imdbid
+                else:
+                    episode = movie
+                    episode.name = show_name(movie.name)
+                break
+        moviefile.update_info(episode)
+
+
 def identify_movies(moviefiles, osdb, asker = None):
     """
     Identify movie information from moviesfiles
 
     Most of the logic to identify movies is obviously here.
-    It would be here to add an exhaustive description of how we
-    try to identify the movie
+    All hashes are checked on osdb at once. Episodes are then grouped per
+    directory and show, and each show is identified only once (see
+    L{identify_episodes}); other files are identified one by one, by
+    scoring what osdb knows about their hash against their file name.
+    Files osdb doesn't know the hash of are searched by name, see
+    L{identify_by_name}.
 
     @param moviefiles: Movies we want to identify
     @param osdb: OSDb Handler
@@ -408,19 +799,24 @@ def identify_movies(moviefiles, osdb, asker = None):
 
     movies_info = osdb.check_hashes(moviefiles.keys())
 
+    episodes = set()
+    for group in group_episodes(moviefiles.values()):
+        identify_episodes(group, movies_info, asker)
+        episodes.update(moviefile.hash for moviefile in group)
+
+    unknown = []
     for moviehash, moviefile in moviefiles.items():
-        try:
-            identify_one_movie(
-                moviefile,
-                [Movie(info['MovieName'],
-                       kind=info['MovieKind'],
-                       imdbid=info['MovieImdbID'],
-                       season=info['SeriesSeason'],
-                       episode=info['SeriesEpisode'])
-                 for info in movies_info[moviehash]],
-                asker)
-        except KeyError:
-            pass
+        if moviehash in episodes:
+            continue
+        if not movies_info.get(moviehash):
+            unknown.append(moviefile)
+            continue
+        identify_one_movie(moviefile,
+                           osdb_movies(movies_info[moviehash]),
+                           asker)
+
+    if unknown:
+        identify_by_name(unknown, osdb, asker)
 
 
 def select_language(code):
@@ -443,30 +839,81 @@ def select_language(code):
             language['3L'] = language['2L']
         return (language['2L'], language['3L'])
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Get information about a movie")
+def find_movies(paths):
+    """
+    Expand directories and archives into the movie files they contain
 
-    parser.add_argument('movie', help='Movie to investigate', nargs='+')
-    parser.add_argument('-l', '--language', default='eng')
-    parser.add_argument('-f', '--force', action='store_true')
-    args = parser.parse_args()
+    @param paths: Paths of movie files, directories or archives
+    @return: Iterator of locations of movie files
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                files.sort()
+                for name in files:
+                    extension = name.split('.')[-1].lower()
+                    if extension in VIDEO_EXTENSIONS:
+                        yield os.path.join(root, name)
+                    elif extension in ARCHIVE_EXTENSIONS:
+                        for member in find_members(os.path.join(root, name)):
+                            yield member
+        elif path.split('.')[-1].lower() in ARCHIVE_EXTENSIONS:
+            for member in find_members(path):
+                yield member
+        else:
+            yield path
+
+
+def find_members(path):
+    """
+    List the movies stored in an archive
+
+    @param path: Path or URL of the archive
+    @return: Locations of the movies, see L{readers.open_reader}
+    """
+    try:
+        members = readers.archive_members(path)
+    except Exception as e:
+        logging.getLogger(__name__).warning('Unable to read %s: %s', path, e)
+        return []
+    return [member for member in members
+            if member.split('.')[-1].lower() in VIDEO_EXTENSIONS]
 
-    osdb = opensubtitles.OpenSubtitles()
-    asker = TextAsker(0.7)
 
-    moviefiles = [MovieFile(movie) for movie in args.movie]
+def select_languages(codes):
+    """
+    Get language codes for a comma separated list of languages
 
-    if not args.force:
-        for moviefile in list(moviefiles):
-            if moviefile.has_subtitle():
-                print moviefile.path, \
-                    'already has a subtitle (use -f to force)'
-                moviefiles.remove(moviefile)
+    @param codes: Comma separated language codes or names
+    @return: List of tuples (two_letters_code, three_letters_code), see
+    L{select_language}
+    """
+    languages = []
+    for code in codes.split(','):
+        language = select_language(code.strip())
+        if language not in languages:
+            languages.append(language)
 
-    identify_movies({mfile.hash: mfile for mfile in moviefiles},
-                   osdb, asker)
+    return languages
 
+
+def print_notice(path, message):
+    """
+    Show a message about a file
+
+    @param path: Path of the file
+    @param message: What happened to it
+    """
+    print path, message
+
+
+def print_summary(moviefiles):
+    """
+    Show what we know about moviefiles
+
+    @param moviefiles: Identified MovieFiles
+    """
     print
     print 'Identification summary'
     print
@@ -475,30 +922,637 @@ def main():
             print 'Unable to identify:'
         print moviefile
 
-    lang_2l, lang_3l = select_language(args.language)
 
-    subs = osdb.download_subtitles(
+def download_subtitles(moviefiles, osdb, languages, misses=None,
+                       priority=None):
+    """
+    Download subtitles of movie files
+
+    Subtitles are searched on osdb by hash first, for all languages at
+    once, and on tvsubtitles for the episodes osdb has no subtitle for.
+    With a single language, subtitles are named name.srt, otherwise
+    name.<language>.srt. Only the languages a file is missing (see
+    L{MovieFile.missing}) are searched, so existing subtitles, in files or
+    in tracks of the movie, are neither searched again nor overwritten.
+
+    @param moviefiles: Identified MovieFiles
+    @param osdb: OSDb Handler
+    @param languages: List of (two_letters_code, three_letters_code), as
+    returned by L{select_language}
+    @param misses: L{misses.MissCache}: languages recently missed for a
+    file are not searched again, and searches update it
+    @param priority: Key of (path, name) giving the order in which files
+    get the osdb download quota, see L{quota.priority}, None to keep the
+    order of moviefiles
+    @return: List of tuples (moviefile, language, subtitle path, subtitle),
+    subtitle is None if not found, L{quota.DEFERRED} if left for the next
+    quota window, L{tvsubtitles.FAILED} if its search failed
+    """
+    tagged = len(languages) > 1
+    if priority:
+        moviefiles = sorted(moviefiles, key=lambda moviefile: priority(
+            moviefile.path, moviefile.name))
+
+    # Files that want the same languages are searched together, groups
+    # with the first files first
+    groups = {}
+    order = []
+    for moviefile in moviefiles:
+        wanted = tuple(
+            (lang_2l, lang_3l) for lang_2l, lang_3l in languages
+            if (moviefile.missing is None or lang_3l in moviefile.missing) and
+            (not misses or not misses.should_skip(moviefile.hash, lang_3l)))
+        if wanted:
+            if wanted not in groups:
+                order.append(wanted)
+            groups.setdefault(wanted, []).append(moviefile)
+
+    downloads = []
+    for wanted in order:
+        downloads.extend(_download_subtitles(groups[wanted], osdb, wanted,
+                                             tagged))
+
+    if misses:
+        for moviefile, language, _, sub in downloads:
+            # Only a search that got an answer tells there is nothing
+            if sub is quota.DEFERRED or sub is tvsubtitles.FAILED:
+                continue
+            if sub:
+                misses.found(moviefile.hash, language)
+            else:
+                misses.missed(moviefile.hash, language)
+
+    return downloads
+
+
+def _download_subtitles(moviefiles, osdb, languages, tagged):
+    """
+    Download subtitles of movie files in the same languages
+
+    @param tagged: Put the language in the subtitle names
+    @return: See L{download_subtitles}
+    """
+    if not moviefiles:
+        return []
+
+    subs = osdb.download_subtitles_languages(
         [moviefile.osdb_criteria() for moviefile in moviefiles],
-        language=lang_3l)
+        [lang_3l for _, lang_3l in languages])
 
+    episodes = {}
+    for moviefile in moviefiles:
+        if moviefile.kind != Movie.EPISODE:
+            continue
+        for lang_2l, lang_3l in languages:
+            # Deferred ones too: tvsubtitles has no quota
+            if not subs.get((moviefile.hash, lang_3l)):
+                episodes[(moviefile.hash, lang_3l)] = (moviefile.name,
+                                                       moviefile.season,
+                                                       moviefile.episode,
+                                                       lang_2l)
+    tvsubs = {}
+    if episodes:
+        tvsubs = tvsubtitles.download_subtitles(episodes.values())
+
+    downloads = []
     for moviefile in moviefiles:
-        sub = None
-        if moviefile.hash in subs:
-            sub = subs[moviefile.hash]
-        elif moviefile.kind == Movie.EPISODE:
-            sub = tvsubtitles.download_subtitle(moviefile.name,
-                                                moviefile.season,
-                                                moviefile.episode,
-                                                lang_2l)
+        for lang_2l, lang_3l in languages:
+            key = (moviefile.hash, lang_3l)
+            sub = subs.get(key)
+            if not sub and key in episodes:
+                tvsub = tvsubs[episodes[key]]
+                # Deferred by osdb stays deferred, unless tvsubtitles has it
+                if tvsub or sub is None:
+                    sub = tvsub
+
+            subname = moviefile.subname(lang_2l if tagged else None)
+            downloads.append((moviefile, lang_3l, subname, sub))
+
+    return downloads
+
 
+def write_subtitles(downloads, checkpoints=None, notify=print_notice):
+    """
+    Write subtitles next to the movie files
+
+    @param downloads: List of tuples, see L{download_subtitles}
+    @param checkpoints: L{journal.Journal} to record written subtitles in
+    @param notify: Function (path, message) told about the subtitles not
+    written, None if the caller reports them
+    @return: downloads
+    """
+    for moviefile, language, subname, sub in downloads:
+        if sub is quota.DEFERRED:
+            if notify:
+                notify(moviefile.path, 'deferred in %s, download quota '
+                       'reached' % language)
+            continue
         if not sub:
-            print "No subtitle found for this movie"
+            if notify:
+                notify(moviefile.path, 'has no subtitle in %s' % language)
             continue
 
-        with open(moviefile.subname(), 'w') as f:
+        with open(subname, 'w') as f:
             f.write(sub)
+        if checkpoints:
+            checkpoints.written(moviefile.path, language)
+
+    return downloads
+
+
+def fetch_subtitles(moviefiles, osdb, languages, misses=None, priority=None):
+    """
+    Download subtitles and write them next to the movie files
+
+    @param moviefiles: Identified MovieFiles
+    @param osdb: OSDb Handler
+    @param languages: List of (two_letters_code, three_letters_code)
+    @param misses: L{misses.MissCache}, see L{download_subtitles}
+    @param priority: Order of the files, see L{download_subtitles}
+    """
+    write_subtitles(download_subtitles(moviefiles, osdb, languages, misses,
+                                       priority))
+
+
+def build_pipeline(osdb, asker, languages, force=False, hash_workers=2,
+                   download_workers=2, batch_size=50, queue_size=64,
+                   checkpoints=None, xattr=False, misses=None,
+                   priority=None, notify=None):
+    """
+    Build the pipeline going from paths to written subtitles
+
+    Stages are: hash, identify, download and write. Files are hashed in
+    parallel, identified and downloaded in batches of what is waiting, so
+    that each batch only costs a few provider requests.
+    Files that already have subtitles, next to them or as tracks in the
+    file, in all languages are left out before any provider request, and
+    so are files for which the missing languages were recently not found.
+    Files the asker defers are left out of the download, see
+    L{TextAsker.pending}.
+    With checkpoints, each stage records what it did, and work recorded by
+    a previous run is skipped: hashes and identifications are reused, and
+    files with all their subtitles written or already there are left
+    alone. Subtitles not found are searched again as misses allows.
+
+    Paths are taken from the input as the first stage has room for them,
+    so memory doesn't depend on the number of files: at most queue_size
+    files wait before each stage, plus a batch per worker being processed.
+
+    @param osdb: OSDb Handler
+    @param asker: Asker instance to get input from user
+    @param languages: List of (two_letters_code, three_letters_code)
+    @param force: Download subtitles even for files that have some
+    @param hash_workers: Number of threads hashing files
+    @param download_workers: Number of threads downloading subtitles
+    @param batch_size: Maximum number of files identified or downloaded at
+    once
+    @param queue_size: Maximum number of files waiting between two stages
+    @param checkpoints: L{journal.Journal} to record progress in
+    @param xattr: Remember hashes in the files, see L{MovieFile}
+    @param misses: L{misses.MissCache}, see L{download_subtitles}
+    @param priority: Order in which the files of a batch get the download
+    quota, see L{download_subtitles}
+    @param notify: Function (path, message) told about the files left out
+    and the identified ones, instead of printing them; subtitles not
+    found or deferred are then only reported in the output
+    @return: L{pipeline.Pipeline}, to be run with paths, and outputting
+    tuples (path, language, subtitle path), the subtitle path is None if
+    not found, L{quota.DEFERRED} if left for the next quota window
+    """
+    tagged = len(languages) > 1
+    languages_3l = [lang_3l for _, lang_3l in languages]
+    notice = notify or print_notice
+
+    def missing_languages(moviefile):
+        if force:
+            return set(languages_3l)
+        missing = set(lang_3l for lang_2l, lang_3l in languages
+                      if not moviefile.has_subtitle(lang_2l if tagged
+                                                    else None))
+        # Only look into the file if subtitle files are missing
+        if missing:
+            missing -= moviefile.embedded_languages()
+        return missing
+
+    def hash_files(paths):
+        moviefiles = []
+        for path in paths:
+            moviehash = None
+            if checkpoints:
+                if checkpoints.is_done(path, languages_3l):
+                    notice(path, 'was done by a previous run')
+                    continue
+                moviehash = checkpoints.get_hash(path)
+            moviefile = MovieFile(path, moviehash, xattr=xattr)
+            if checkpoints and not moviehash:
+                checkpoints.hashed(moviefile.path, moviefile.hash)
+            missing = missing_languages(moviefile)
+            moviefile.missing = missing
+            if checkpoints:
+                for language in set(languages_3l) - missing:
+                    checkpoints.present(moviefile.path, language)
+            if not missing:
+                notice(moviefile.path,
+                       'already has a subtitle (use -f to force)')
+                continue
+            if misses and all(misses.should_skip(moviefile.hash, language)
+                              for language in missing):
+                notice(moviefile.path, 'had no subtitle recently '
+                       '(use --retry-missing to search anyway)')
+                continue
+            moviefiles.append(moviefile)
+        return moviefiles
+
+    def identify(moviefiles):
+        unknown = {}
+        for moviefile in moviefiles:
+            movie = checkpoints and checkpoints.get_movie(moviefile.path)
+            if movie:
+                moviefile.update_info(Movie(*movie))
+            else:
+                unknown[moviefile.hash] = moviefile
+        if unknown:
+            identify_movies(unknown, osdb, asker)
+        # Files waiting for the user don't hold the others back
+        pending = set(moviefile.path for moviefile, _ in asker.pending)
+        ready = [moviefile for moviefile in moviefiles
+                 if moviefile.path not in pending]
+        if checkpoints:
+            for moviefile in ready:
+                if moviefile.hash in unknown and moviefile.name:
+                    checkpoints.identified(moviefile.path, moviefile)
+        if not notify:
+            print_summary(ready)
+            return ready
+        for moviefile in ready:
+            if moviefile.name:
+                notify(moviefile.path, 'identified as %s (%s)' % (
+                    moviefile.name, moviefile.kind))
+            else:
+                notify(moviefile.path, 'was not identified')
+        return ready
+
+    def download(moviefiles):
+        downloads = download_subtitles(moviefiles, osdb, languages, misses,
+                                       priority)
+        if checkpoints:
+            for moviefile, language, _, sub in downloads:
+                # Deferred and failed ones are still to do
+                if sub is not quota.DEFERRED and sub is not tvsubtitles.FAILED:
+                    checkpoints.found(moviefile.path, language, bool(sub))
+        return downloads
+
+    def write(downloads):
+        write_subtitles(downloads, checkpoints,
+                        None if notify else print_notice)
+        # Don't hold on to the files and subtitles once written
+        written = []
+        for moviefile, language, subname, sub in downloads:
+            if sub is quota.DEFERRED:
+                subname = sub
+            elif not sub:
+                subname = None
+            written.append((moviefile.path, language, subname))
+        return written
+
+    files = pipeline.Pipeline([
+        pipeline.Stage('hash', hash_files, workers=hash_workers,
+                       queue_size=queue_size),
+        pipeline.Stage('identify', identify, batch_size=batch_size,
+                       queue_size=queue_size),
+        pipeline.Stage('download', download, workers=download_workers,
+                       batch_size=batch_size, queue_size=queue_size),
+        pipeline.Stage('write', write, queue_size=queue_size),
+    ])
+    # Questions are asked from the main thread, which gets Ctrl-C
+    asker.runner = files.call
+    return files
+
+
+def print_metrics(stages_metrics):
+    """
+    Show per-stage metrics of a pipeline run
+
+    @param stages_metrics: As returned by L{pipeline.Pipeline.metrics}
+    """
+    print
+    print 'Pipeline metrics'
+    print
+    for name, metrics in stages_metrics:
+        print ('{0:<9} workers {1[workers]:>2}  processed {1[processed]:>6}  '
+               '{1[throughput]:>7.1f}/s  busy {1[utilization]:>4.0%}  '
+               'max queue {1[max_depth]:>4}  batch avg {1[mean_batch]:>5.1f} '
+               'max {1[max_batch]:>4}').format(name, metrics)
+
+
+def serve(path, osdb, misses, args, priority=None):
+    """
+    Serve jobs from L{subgetterd} clients, keeping everything warm
+
+    The osdb session, the caches and the language tables are shared by all
+    jobs, and the session is kept alive between them. Jobs can't ask the
+    user anything, so ambiguous files are left unidentified. What happens
+    to each file is sent to the client, nothing is printed.
+    Files deferred for lack of download quota are run again once the
+    server gives quota back.
+
+    @param path: Path of the socket
+    @param osdb: OSDb Handler
+    @param misses: L{misses.MissCache}, None to search everything
+    @param args: Parsed command line, for the pipeline settings
+    @param priority: Order of the files, see L{download_subtitles}
+    """
+    logger = logging.getLogger(__name__)
+    # {(language, force): set of paths} deferred to the next quota window
+    deferred = {}
+    lock = threading.Lock()
+
+    def keep_alive():
+        while True:
+            time.sleep(KEEP_ALIVE)
+            try:
+                osdb.keep_alive()
+            except Exception:
+                logger.exception('Keep alive failed')
+                continue
+            if osdb.quota.next_window():
+                continue
+            with lock:
+                jobs = deferred.items()
+                deferred.clear()
+            if jobs:
+                # Retrying can take long, the session must be kept alive
+                # meanwhile
+                retry = threading.Thread(target=retry_deferred, args=(jobs,))
+                retry.daemon = True
+                retry.start()
+
+    def retry_deferred(jobs):
+        for (language, force), paths in jobs:
+            logger.info('Download quota is back, retrying %d file(s)',
+                        len(paths))
+            try:
+                run_job({'paths': sorted(paths), 'language': language,
+                         'force': force},
+                        lambda event: logger.info('Deferred job: %s', event))
+            except Exception:
+                logger.exception('Deferred job failed')
+
+    thread = threading.Thread(target=keep_alive)
+    thread.daemon = True
+    thread.start()
+
+    def run_job(job, emit, cancelled=None):
+        language = job.get('language', 'eng')
+        force = job.get('force', False)
+
+        def notify(path, message):
+            emit({'event': 'notice', 'path': path, 'message': message})
+
+        files = build_pipeline(osdb, AutomaticAsker(0.7),
+                               select_languages(language),
+                               force=force,
+                               hash_workers=args.hash_workers,
+                               download_workers=args.download_workers,
+                               batch_size=args.batch_size,
+                               queue_size=args.queue_size,
+                               xattr=args.xattr,
+                               misses=misses,
+                               priority=priority,
+                               notify=notify)
+
+        def report(written):
+            path, subtitle_language, subname = written
+            if subname is quota.DEFERRED:
+                with lock:
+                    deferred.setdefault((language, force), set()).add(path)
+                emit({'event': 'deferred',
+                      'path': path,
+                      'language': subtitle_language,
+                      'until': osdb.quota.next_window()})
+                return
+            emit({'event': 'subtitle',
+                  'path': path,
+                  'language': subtitle_language,
+                  'subtitle': subname})
+
+        paths = find_movies(job['paths'])
+        if priority:
+            paths = sorted(paths, key=priority)
+        files.run(paths, output=report, cancelled=cancelled)
+
+    subgetterd.serve(path, run_job)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Get information about a movie")
+
+    parser.add_argument('movie', help='Movie or directory to investigate',
+                        nargs='*')
+    parser.add_argument('-l', '--language', default='eng',
+                        help='Languages of the subtitles, comma separated '
+                        '(e.g. eng,fre)')
+    parser.add_argument('-f', '--force', action='store_true')
+    parser.add_argument('--store', default=store.DEFAULT_PATH,
+                        help='Directory of the local subtitle store')
+    parser.add_argument('--store-size', type=int,
+                        default=store.DEFAULT_MAX_SIZE,
+                        help='Maximum size of the subtitle store, in bytes')
+    parser.add_argument('--http-cache', default=httpcache.DEFAULT_PATH,
+                        help='Directory of the tvsubtitles page cache')
+    parser.add_argument('--http-freshness', type=int,
+                        default=httpcache.DEFAULT_FRESHNESS,
+                        help='Seconds before cached pages are revalidated')
+    parser.add_argument('--record', metavar='CASSETTE',
+                        help='Record every provider exchange to CASSETTE')
+    parser.add_argument('--replay', metavar='CASSETTE',
+                        help='Replay provider exchanges from CASSETTE, '
+                        'without network access')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds of latency injected in each replayed '
+                        'exchange')
+    parser.add_argument('--connect-timeout', type=float,
+                        default=network.DEFAULT_CONNECT_TIMEOUT,
+                        help='Seconds to wait for a connection to providers')
+    parser.add_argument('--read-timeout', type=float,
+                        default=network.DEFAULT_READ_TIMEOUT,
+                        help='Seconds to wait for data from providers')
+    parser.add_argument('--gzip-threshold', type=int,
+                        default=network.DEFAULT_ENCODE_THRESHOLD,
+                        help='Size in bytes above which requests to '
+                        'OpenSubtitles are gzipped, negative to never '
+                        'gzip them')
+    parser.add_argument('--priority', choices=quota.POLICIES,
+                        default='order',
+                        help='Which files get the OpenSubtitles download '
+                        'quota first when it runs short, after the '
+                        'watchlist: in the order given, or newest first')
+    parser.add_argument('--watchlist', metavar='FILE',
+                        help='File of titles, one per line, whose files get '
+                        'the download quota first')
+    parser.add_argument('--hedge', action='store_true',
+                        help='Send a duplicate of slow idempotent requests')
+    parser.add_argument('--defer', action='store_true',
+                        help='Ask questions only once subtitles of '
+                        'confident files are downloaded')
+    parser.add_argument('--questions', metavar='FILE',
+                        help='Write questions to FILE instead of asking them')
+    parser.add_argument('--resolve', metavar='FILE',
+                        help='Answer questions written with --questions')
+    parser.add_argument('--hash-workers', type=int, default=2,
+                        help='Number of threads hashing files')
+    parser.add_argument('--download-workers', type=int, default=2,
+                        help='Number of threads downloading subtitles')
+    parser.add_argument('--batch-size', type=int, default=50,
+                        help='Maximum number of files identified or '
+                        'downloaded at once')
+    parser.add_argument('--queue-size', type=int, default=64,
+                        help='Maximum number of files waiting between two '
+                        'stages')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Show per-stage metrics at the end')
+    parser.add_argument('--misses', default=misses.DEFAULT_PATH,
+                        help='Where to remember files without subtitles')
+    parser.add_argument('--retry-missing', action='store_true',
+                        help='Search again for files that recently had no '
+                        'subtitle')
+    parser.add_argument('--xattr', action='store_true',
+                        help='Remember hashes in extended attributes of the '
+                        'movie files, so they survive renames')
+    parser.add_argument('--journal', default=journal.DEFAULT_PATH,
+                        help='Where to record progress, for --resume')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip the work recorded by the previous '
+                        'runs, finished or interrupted')
+    parser.add_argument('--serve', action='store_true',
+                        help='Run as a server, taking jobs from '
+                        'subgetterd.py')
+    parser.add_argument('--socket', default=subgetterd.DEFAULT_SOCKET,
+                        help='Socket of the server')
+    args = parser.parse_args()
+
+    if not args.movie and not args.resolve and not args.serve:
+        parser.error('no movie given')
+
+    tape = None
+    if args.record:
+        tape = cassette.Cassette(args.record, cassette.RECORD)
+    elif args.replay:
+        tape = cassette.Cassette(args.replay, cassette.REPLAY, args.latency)
+
+    tvsubtitles.CONNECT_TIMEOUT = args.connect_timeout
+    tvsubtitles.READ_TIMEOUT = args.read_timeout
+    hedger = None
+    if args.hedge:
+        hedger = network.Hedger()
+        tvsubtitles.HEDGER = hedger
+
+    encode_threshold = args.gzip_threshold
+    if encode_threshold < 0:
+        encode_threshold = None
+
+    substore = None
+    missed = None
+    transport_factory = None
+    if tape:
+        # Every exchange has to go through the cassette: no local caches
+        tvsubtitles.CASSETTE = tape
+        transport_factory = functools.partial(
+            tape.transport, args.connect_timeout, args.read_timeout,
+            encode_threshold)
+    else:
+        substore = store.SubtitleStore(args.store, args.store_size)
+        tvsubtitles.STORE = substore
+        tvsubtitles.CACHE = httpcache.HTTPCache(args.http_cache,
+                                                args.http_freshness)
+        missed = misses.MissCache(args.misses, retry=args.retry_missing)
+    osdb = opensubtitles.OpenSubtitles(store=substore,
+                                       transport_factory=transport_factory,
+                                       connect_timeout=args.connect_timeout,
+                                       read_timeout=args.read_timeout,
+                                       hedger=hedger,
+                                       encode_threshold=encode_threshold)
+
+    # Files are only reordered when asked to, so that they can be streamed
+    priority = None
+    if args.priority != 'order' or args.watchlist:
+        watchlist = []
+        if args.watchlist:
+            watchlist = quota.load_watchlist(args.watchlist)
+        priority = quota.priority(args.priority, watchlist)
+
+    if args.serve:
+        serve(args.socket, osdb, missed, args, priority)
+        return
+
+    asker = TextAsker(0.7, defer=args.defer or bool(args.questions))
+    languages = select_languages(args.language)
+
+    if args.resolve:
+        asker.load_pending(args.resolve)
+        resolved = asker.ask_pending()
+        print_summary(resolved)
+        fetch_subtitles(resolved, osdb, languages, missed, priority)
+        return
+
+    checkpoints = journal.Journal(args.journal, resume=args.resume,
+                                  languages=[lang_3l for _, lang_3l
+                                             in languages])
+    files = build_pipeline(osdb, asker, languages,
+                           force=args.force,
+                           hash_workers=args.hash_workers,
+                           download_workers=args.download_workers,
+                           batch_size=args.batch_size,
+                           queue_size=args.queue_size,
+                           checkpoints=checkpoints,
+                           xattr=args.xattr,
+                           misses=missed,
+                           priority=priority)
+    paths = find_movies(args.movie)
+    if priority:
+        # The whole list is needed to give the quota to the first files
+        paths = sorted(paths, key=priority)
+    deferred = []
+
+    def output(written):
+        # Results were reported as they were written, only keep the
+        # deferred ones
+        path, _, subname = written
+        if subname is quota.DEFERRED:
+            deferred.append(path)
+
+    finished = False
+    try:
+        files.run(paths, output=output)
+        finished = not files.cancelled.is_set()
+    except KeyboardInterrupt:
+        print 'Interrupted, use --resume to go on from there'
+        return 130
+    finally:
+        checkpoints.close(finished)
+
+    if deferred:
+        print len(deferred), 'subtitle(s) deferred for lack of download ' \
+            'quota, run again after', \
+            quota.format_time(osdb.quota.next_window() or time.time())
+
+    if args.metrics:
+        print_metrics(files.metrics())
+
+    if not asker.pending:
+        return
+
+    if args.questions:
+        asker.save_pending(args.questions)
+        print len(asker.pending), 'question(s) saved to', args.questions, \
+            '(use --resolve to answer them)'
+    else:
+        resolved = asker.ask_pending()
+        print_summary(resolved)
+        fetch_subtitles(resolved, osdb, languages, missed, priority)
 
 
 if __name__ == '__main__':
     logging.basicConfig(level=logging.DEBUG)
-    main()
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Local job server, and its thin client.
+
+C{subgetter.py --serve} keeps an OpenSubtitles session, the caches and the
+language tables warm, and accepts jobs on a Unix socket. This module holds
+the server loop and the client; it only depends on the standard library
+and L{misc}, so submitting a job doesn't pay for importing the providers.
+
+The protocol is JSON, one object per line. The client sends one job::
+
+    {"paths": [...], "language": "eng,fre", "force": false}
+
+and the server streams events back, ending with C{{"event": "done"}}::
+
+    {"event": "subtitle", "path": ..., "language": ..., "subtitle": ...}
+    {"event": "deferred", "path": ..., "language": ..., "until": ...}
+    {"event": "notice", "path": ..., "message": ...}
+    {"event": "error", "message": ...}
+
+Deferred subtitles didn't fit in the download quota, the server gets them
+once the quota is back (C{until} is a time in seconds since the epoch, 0
+if unknown). Notices tell what happened to a file on the way, e.g. that
+it was left out because it already has subtitles.
+"""
+
+import argparse
+import errno
+import json
+import logging
+import os
+import socket
+import SocketServer
+import sys
+import threading
+import time
+
+import misc
+
+DEFAULT_SOCKET = misc.cache_path('subgetter.sock', runtime=True)
+"Default path of the server socket"
+
+
+class JobHandler(SocketServer.StreamRequestHandler):
+    """
+    Read one job, run it, and stream its events back
+    """
+    def handle(self):
+        logger = logging.getLogger(__name__)
+        # Events come from the threads of the job's pipeline
+        lock = threading.Lock()
+        cancelled = threading.Event()
+
+        def emit(event):
+            with lock:
+                if cancelled.is_set():
+                    return
+                try:
+                    self.wfile.write(json.dumps(event) + '\n')
+                    self.wfile.flush()
+                except (socket.error, IOError):
+                    logger.info('Client went away, cancelling its job')
+                    cancelled.set()
+
+        try:
+            job = json.loads(self.rfile.readline())
+            self.server.run_job(job, emit, cancelled)
+        except socket.error:
+            logger.info('Client went away')
+            return
+        except Exception as e:
+            logger.exception('Job failed')
+            emit({'event': 'error', 'message': str(e)})
+
+        emit({'event': 'done'})
+
+
+class JobServer(SocketServer.ThreadingMixIn,
+                SocketServer.UnixStreamServer):
+    """
+    Unix socket server running each job in its own thread
+    """
+    daemon_threads = True
+
+    def __init__(self, path, run_job):
+        """
+        @param path: Path of the socket
+        @param run_job: Function (job, emit, cancelled) running a job, and
+        calling emit with each event dict. cancelled is a
+        C{threading.Event} set once the client is gone: the job should
+        stop, its events are dropped
+        """
+        self.run_job = run_job
+        SocketServer.UnixStreamServer.__init__(self, path, JobHandler)
+
+
+def serve(path, run_job):
+    """
+    Serve jobs until interrupted
+
+    A socket left behind by a dead server is removed, but we refuse to
+    start if a server is still answering on it.
+
+    @param path: Path of the socket
+    @param run_job: See L{JobServer}
+    """
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except socket.error:
+            os.remove(path)
+        else:
+            raise Exception('A server is already running on %s' % path)
+        finally:
+            probe.close()
+
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+    server = JobServer(path, run_job)
+    os.chmod(path, 0600)
+    logging.getLogger(__name__).info('Serving on %s', path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(path)
+
+
+def submit(path, job):
+    """
+    Submit a job to the server, and yield its events as they come
+
+    @param path: Path of the server socket
+    @param job: Job dict, see the module documentation
+    @return: Iterator of event dicts, the final 'done' excluded
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    try:
+        sock.sendall(json.dumps(job) + '\n')
+        for line in sock.makefile():
+            event = json.loads(line)
+            if event['event'] == 'done':
+                return
+            yield event
+    finally:
+        sock.close()
+
+
+def main():
+    """
+    Thin client: submit paths to a running C{subgetter.py --serve}
+    """
+    parser = argparse.ArgumentParser(
+        description="Submit movies to the subgetter server")
+    parser.add_argument('movie', help='Movie or directory', nargs='+')
+    parser.add_argument('-l', '--language', default='eng')
+    parser.add_argument('-f', '--force', action='store_true')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET)
+    args = parser.parse_args()
+
+    job = {
+        'paths': [os.path.abspath(path) for path in args.movie],
+        'language': args.language,
+        'force': args.force,
+    }
+
+    status = 0
+    for event in submit(args.socket, job):
+        if event['event'] == 'subtitle':
+            print '%s [%s]: %s' % (event['path'], event['language'],
+                                   event['subtitle'] or 'not found')
+        elif event['event'] == 'deferred':
+            until = 'later'
+            if event['until']:
+                until = time.strftime('%Y-%m-%d %H:%M',
+                                      time.localtime(event['until']))
+            print '%s [%s]: deferred until %s' % (
+                event['path'], event['language'], until)
+        elif event['event'] == 'notice':
+            print event['path'], event['message']
+        elif event['event'] == 'error':
+            print >> sys.stderr, 'Error:', event['message']
+            status = 1
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+import glob
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import journal
+import subgetter
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'journal')
+        self.movie = self.touch('Movie.2010.avi', 'movie')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def touch(self, name, data):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def journal(self, resume=True, languages=('eng', 'fre')):
+        return journal.Journal(self.path, resume=resume, languages=languages)
+
+    def runs(self):
+        return glob.glob(self.path + '.*' + journal.RUN_SUFFIX)
+
+    def test_resume_finished_run(self):
+        checkpoints = self.journal(resume=False)
+        checkpoints.hashed(self.movie, 'abc')
+        checkpoints.identified(self.movie, subgetter.Movie('Movie', imdbid=1))
+        checkpoints.close(finished=True)
+        self.assertEqual(self.runs(), [])
+
+        checkpoints = self.journal()
+        self.assertEqual(checkpoints.get_hash(self.movie), 'abc')
+        self.assertEqual(checkpoints.get_movie(self.movie),
+                         ('Movie', 'movie', 1, 0, 0))
+        checkpoints.close()
+
+    def test_resume_interrupted_run(self):
+        checkpoints = self.journal(resume=False)
+        checkpoints.hashed(self.movie, 'abc')
+        checkpoints.written(self.movie, 'eng')
+        # Interrupted: the run file is left for the next resume
+        checkpoints.close()
+        self.assertEqual(len(self.runs()), 1)
+        self.assertFalse(os.path.exists(self.path))
+
+        checkpoints = self.journal()
+        self.assertEqual(checkpoints.get_hash(self.movie), 'abc')
+        self.assertTrue(checkpoints.is_done(self.movie, ['eng']))
+        checkpoints.written(self.movie, 'fre')
+        checkpoints.close(finished=True)
+        # Compacted in the journal, the run files are gone
+        self.assertEqual(self.runs(), [])
+        with open(self.path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record[:2] for record in records],
+                         [[journal.SETTLED, self.movie]])
+
+        checkpoints = self.journal()
+        self.assertTrue(checkpoints.is_done(self.movie, ['eng', 'fre']))
+        checkpoints.close()
+
+    def test_torn_last_line(self):
+        checkpoints = self.journal(resume=False)
+        checkpoints.hashed(self.movie, 'abc')
+        checkpoints.written(self.movie, 'eng')
+        checkpoints.close()
+        (run,) = self.runs()
+        with open(run, 'rb+') as f:
+            f.seek(-5, os.SEEK_END)
+            f.truncate()
+
+        checkpoints = self.journal()
+        self.assertEqual(checkpoints.get_hash(self.movie), 'abc')
+        self.assertFalse(checkpoints.is_done(self.movie, ['eng']))
+        checkpoints.close()
+
+    def test_changed_file(self):
+        other = self.touch('Other.avi', 'other')
+        checkpoints = self.journal(resume=False)
+        for path in (self.movie, other):
+            checkpoints.hashed(path, 'abc')
+            checkpoints.written(path, 'eng')
+        checkpoints.hashed(self.touch('Third.avi', 'third'), 'def')
+        checkpoints.close(finished=True)
+
+        self.touch('Movie.2010.avi', 'longer movie')
+        os.utime(other, (0, 0))
+        checkpoints = self.journal()
+        self.assertFalse(checkpoints.is_done(self.movie, ['eng']))
+        self.assertIsNone(checkpoints.get_hash(self.movie))
+        self.assertFalse(checkpoints.is_done(other, ['eng']))
+        self.assertEqual(
+            checkpoints.get_hash(os.path.join(self.directory, 'Third.avi')),
+            'def')
+        checkpoints.close()
+
+    def test_hashed_again_after_change(self):
+        checkpoints = self.journal(resume=False, languages=['eng'])
+        checkpoints.hashed(self.movie, 'abc')
+        checkpoints.written(self.movie, 'eng')
+        self.touch('Movie.2010.avi', 'new movie')
+        checkpoints.hashed(self.movie, 'def')
+        checkpoints.close(finished=True)
+
+        checkpoints = self.journal(languages=['eng'])
+        self.assertEqual(checkpoints.get_hash(self.movie), 'def')
+        self.assertFalse(checkpoints.is_done(self.movie, ['eng']))
+        checkpoints.close()
+
+    def test_languages_settled_one_by_one(self):
+        checkpoints = self.journal(resume=False)
+        checkpoints.hashed(self.movie, 'abc')
+        checkpoints.identified(self.movie, subgetter.Movie('Movie'))
+        checkpoints.written(self.movie, 'eng')
+        checkpoints.close(finished=True)
+
+        # fre is left: what was done on the file is still reused
+        checkpoints = self.journal()
+        self.assertFalse(checkpoints.is_done(self.movie, ['eng', 'fre']))
+        self.assertTrue(checkpoints.is_done(self.movie, ['eng']))
+        self.assertEqual(checkpoints.get_hash(self.movie), 'abc')
+        self.assertEqual(checkpoints.get_movie(self.movie)[0], 'Movie')
+        checkpoints.present(self.movie, 'fre')
+        checkpoints.close(finished=True)
+
+        checkpoints = self.journal()
+        self.assertTrue(checkpoints.is_done(self.movie, ['eng', 'fre']))
+        # Settled: nothing else is kept
+        self.assertIsNone(checkpoints.get_hash(self.movie))
+        self.assertIsNone(checkpoints.get_movie(self.movie))
+        checkpoints.close()
+
+    def test_not_found_not_settled(self):
+        checkpoints = self.journal(resume=False)
+        checkpoints.hashed(self.movie, 'abc')
+        checkpoints.found(self.movie, 'eng', False)
+        checkpoints.found(self.movie, 'fre', True)
+        checkpoints.close(finished=True)
+
+        checkpoints = self.journal()
+        self.assertFalse(checkpoints.is_done(self.movie, ['eng']))
+        self.assertFalse(checkpoints.is_done(self.movie, ['fre']))
+        self.assertEqual(checkpoints.get_hash(self.movie), 'abc')
+        checkpoints.close()
+
+    def test_relative_paths(self):
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            checkpoints = self.journal(resume=False)
+            checkpoints.hashed('Movie.2010.avi', 'abc')
+            checkpoints.close(finished=True)
+        finally:
+            os.chdir(cwd)
+
+        checkpoints = self.journal()
+        self.assertEqual(checkpoints.get_hash(self.movie), 'abc')
+        checkpoints.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
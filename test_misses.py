@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import misses
+
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+
+class Clock(object):
+    """
+    Clock moved by hand
+    """
+    def __init__(self, now=1000000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class MissCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.clock = Clock()
+        self.cache = misses.MissCache(self.directory, clock=self.clock)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_delays(self):
+        self.assertEqual([misses.MissCache.delay(count)
+                          for count in range(7)],
+                         [0, HOUR, 6 * HOUR, DAY, WEEK, 2 * WEEK, 4 * WEEK])
+        self.assertEqual(misses.MissCache.delay(7), misses.MAX_DELAY)
+        self.assertEqual(misses.MissCache.delay(100), misses.MAX_DELAY)
+
+    def test_back_off(self):
+        self.assertFalse(self.cache.should_skip('abcdef', 'eng'))
+        for delay in misses.SCHEDULE + (2 * WEEK,):
+            self.cache.missed('abcdef', 'eng')
+            self.assertEqual(self.cache.retry_time('abcdef', 'eng'),
+                             self.clock.now + delay)
+            self.clock.now += delay - 1
+            self.assertTrue(self.cache.should_skip('abcdef', 'eng'))
+            self.clock.now += 1
+            self.assertFalse(self.cache.should_skip('abcdef', 'eng'))
+        # Per language
+        self.assertEqual(self.cache.retry_time('abcdef', 'fre'), 0)
+
+    def test_found_forgets(self):
+        self.cache.missed('abcdef', 'eng')
+        self.cache.missed('abcdef', 'eng')
+        self.cache.found('abcdef', 'eng')
+        self.assertFalse(self.cache.should_skip('abcdef', 'eng'))
+        self.cache.missed('abcdef', 'eng')
+        self.assertEqual(self.cache.retry_time('abcdef', 'eng'),
+                         self.clock.now + HOUR)
+        # Nothing to forget
+        self.cache.found('123456', 'eng')
+
+    def test_retry(self):
+        self.cache.missed('abcdef', 'eng')
+        cache = misses.MissCache(self.directory, retry=True,
+                                 clock=self.clock)
+        self.assertFalse(cache.should_skip('abcdef', 'eng'))
+        # Misses still counted
+        cache.missed('abcdef', 'eng')
+        self.assertEqual(self.cache.retry_time('abcdef', 'eng'),
+                         self.clock.now + 6 * HOUR)
+
+    def test_corrupt_entry(self):
+        self.cache.missed('abcdef', 'eng')
+        with open(os.path.join(self.directory, 'ab', 'abcdef.eng'),
+                  'w') as f:
+            f.write('garbage')
+        self.assertFalse(self.cache.should_skip('abcdef', 'eng'))
+        self.cache.missed('abcdef', 'eng')
+        self.assertEqual(self.cache.retry_time('abcdef', 'eng'),
+                         self.clock.now + HOUR)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import StringIO
+import threading
+import unittest
+import xmlrpclib
+
+import network
+
+
+class HedgerTest(unittest.TestCase):
+    def setUp(self):
+        # Every attempt takes a second
+        self.hedger = network.Hedger(min_samples=10,
+                                     clock=itertools.count().next)
+        self.calls = []
+        self.abandoned = []
+
+    def hedge_at_once(self):
+        """
+        Teach the hedger that requests are instant, so the next one is
+        hedged unless its answer is already there
+        """
+        for _ in range(10):
+            self.hedger.record('search', 0)
+
+    def call(self, func, duplicate):
+        return self.hedger.call('search', func, duplicate,
+                                lambda: self.abandoned.append(True))
+
+    def test_delay(self):
+        self.assertIsNone(self.hedger.delay('search'))
+        for seconds in range(1, 101):
+            self.hedger.record('search', seconds)
+        self.assertEqual(self.hedger.delay('search'), 96)
+        # Only the last ones are kept
+        for _ in range(100):
+            self.hedger.record('search', 1)
+        self.assertEqual(self.hedger.delay('search'), 1)
+        self.assertIsNone(self.hedger.delay('download'))
+
+    def test_not_hedged_without_samples(self):
+        def duplicate():
+            self.fail('Hedged without samples')
+
+        self.assertEqual(self.call(lambda: 'primary', duplicate), 'primary')
+        self.assertEqual(list(self.hedger.latencies['search']), [1])
+        self.assertEqual(self.abandoned, [])
+
+    def test_failures_recorded(self):
+        def fail():
+            raise IOError('timed out')
+
+        for _ in range(10):
+            self.assertRaises(IOError, self.call, fail, fail)
+        # Failed attempts count: the hedger now knows requests are slow
+        self.assertEqual(self.hedger.delay('search'), 1)
+
+    def test_duplicate_wins(self):
+        release = threading.Event()
+        done = threading.Event()
+
+        def primary():
+            release.wait(10)
+            done.set()
+            return 'primary'
+
+        self.hedge_at_once()
+        try:
+            self.assertEqual(self.call(primary, lambda: 'duplicate'),
+                             'duplicate')
+            # The primary request still holds its connection
+            self.assertEqual(self.abandoned, [True])
+        finally:
+            release.set()
+        self.assertTrue(done.wait(10))
+
+    def test_primary_fails_after_hedge(self):
+        hedged = threading.Event()
+        threads = []
+
+        def primary():
+            threads.append(threading.current_thread())
+            hedged.wait(10)
+            raise IOError('reset')
+
+        def duplicate():
+            hedged.set()
+            # Once its thread is over, the failure of primary is known
+            threads[0].join(10)
+            return 'duplicate'
+
+        self.hedge_at_once()
+        self.assertEqual(self.call(primary, duplicate), 'duplicate')
+        self.assertEqual(self.abandoned, [])
+
+    def test_both_fail(self):
+        hedged = threading.Event()
+        threads = []
+
+        def primary():
+            threads.append(threading.current_thread())
+            hedged.wait(10)
+            raise IOError('primary')
+
+        def duplicate():
+            hedged.set()
+            threads[0].join(10)
+            raise IOError('duplicate')
+
+        self.hedge_at_once()
+        try:
+            self.call(primary, duplicate)
+        except IOError as e:
+            self.assertEqual(str(e), 'primary')
+        else:
+            self.fail('No error raised')
+
+
+class FakeResponse(StringIO.StringIO):
+    """
+    HTTP answer of L{FakeServer}
+    """
+    def __init__(self, status, body='', headers=None):
+        StringIO.StringIO.__init__(self, body)
+        self.status = status
+        self.reason = 'Reason'
+        self.msg = headers or {}
+
+    def getheader(self, name, default=None):
+        return self.msg.get(name, default)
+
+
+class FakeServer(object):
+    """
+    XML-RPC server answering the params it gets, seen by the transport as
+    its connection
+
+    @ivar refuse: What the server answers to gzipped requests, if it
+    doesn't understand them: an HTTP status or a fault code
+    @ivar requests: Tuples (headers, body) of the requests received
+    """
+    def __init__(self, refuse=None):
+        self.refuse = refuse
+        self.requests = []
+
+    def putrequest(self, method, handler, **kw):
+        self.headers = {}
+
+    def putheader(self, name, value):
+        self.headers[name] = value
+
+    def endheaders(self, body):
+        self.requests.append((self.headers, body))
+
+    def getresponse(self, buffering=False):
+        headers, body = self.requests[-1]
+        if headers.get('Content-Encoding') != 'gzip':
+            answer = xmlrpclib.loads(body)[0]
+        elif self.refuse is None:
+            answer = xmlrpclib.loads(xmlrpclib.gzip_decode(body))[0]
+        elif self.refuse > 0:
+            return FakeResponse(self.refuse)
+        else:
+            answer = xmlrpclib.Fault(self.refuse, 'parse error')
+        answer = xmlrpclib.dumps(answer, methodresponse=True)
+        if headers.get('Accept-Encoding') == 'gzip':
+            return FakeResponse(200, xmlrpclib.gzip_encode(answer),
+                                {'Content-Encoding': 'gzip'})
+        return FakeResponse(200, answer)
+
+    def close(self):
+        pass
+
+
+class FakeTransport(network.TimeoutTransport):
+    """
+    Transport sending its requests to a L{FakeServer}
+    """
+    def __init__(self, server, **kw):
+        network.TimeoutTransport.__init__(self, **kw)
+        self.server = server
+
+    def make_connection(self, host):
+        return self.server
+
+
+class TimeoutTransportTest(unittest.TestCase):
+    SMALL = 'small'
+    LARGE = 'large' * 1000
+
+    def call(self, server, *params, **kw):
+        """
+        Call echo on server through a new transport
+
+        @return: The transport, its answers to each params
+        """
+        transport = FakeTransport(server, encode_threshold=1000, **kw)
+        proxy = xmlrpclib.ServerProxy('http://localhost/',
+                                      transport=transport)
+        return transport, [proxy.echo(param) for param in params]
+
+    def encodings(self, server):
+        return [headers.get('Content-Encoding')
+                for headers, _ in server.requests]
+
+    def test_large_requests_gzipped(self):
+        server = FakeServer()
+        _, answers = self.call(server, self.SMALL, self.LARGE)
+        self.assertEqual(answers, [self.SMALL, self.LARGE])
+        self.assertEqual(self.encodings(server), [None, 'gzip'])
+        self.assertTrue(len(server.requests[1][1]) < len(self.LARGE))
+        # And gzipped answers are asked for
+        self.assertEqual([headers['Accept-Encoding']
+                          for headers, _ in server.requests],
+                         ['gzip', 'gzip'])
+
+    def test_never_gzipped(self):
+        server = FakeServer()
+        transport = FakeTransport(server, encode_threshold=None,
+                                  accept_gzip=False)
+        proxy = xmlrpclib.ServerProxy('http://localhost/',
+                                      transport=transport)
+        self.assertEqual(proxy.echo(self.LARGE), self.LARGE)
+        self.assertEqual(self.encodings(server), [None])
+        self.assertNotIn('Accept-Encoding', server.requests[0][0])
+
+    def test_refused_status(self):
+        for status in network.REFUSED_ENCODING:
+            server = FakeServer(refuse=status)
+            transport, answers = self.call(server, self.LARGE, self.LARGE)
+            self.assertEqual(answers, [self.LARGE, self.LARGE])
+            # Sent again uncompressed, and not compressed anymore
+            self.assertEqual(self.encodings(server), ['gzip', None, None])
+            self.assertIsNone(transport.encode_threshold)
+
+    def test_parse_error(self):
+        server = FakeServer(refuse=network.PARSE_ERROR)
+        _, answers = self.call(server, self.LARGE, self.LARGE)
+        self.assertEqual(answers, [self.LARGE, self.LARGE])
+        self.assertEqual(self.encodings(server), ['gzip', None, None])
+
+    def test_other_errors_raised(self):
+        server = FakeServer(refuse=500)
+        self.assertRaises(xmlrpclib.ProtocolError, self.call, server,
+                          self.LARGE)
+        server = FakeServer(refuse=-1)
+        self.assertRaises(xmlrpclib.Fault, self.call, server, self.LARGE)
+        # Neither was sent again
+        self.assertEqual(self.encodings(server), ['gzip'])
+
+    def test_refused_encoding(self):
+        def protocol_error(status):
+            return xmlrpclib.ProtocolError('localhost/', status, '', {})
+
+        self.assertTrue(network._refused_encoding(protocol_error(415)))
+        self.assertFalse(network._refused_encoding(protocol_error(500)))
+        self.assertTrue(network._refused_encoding(
+            xmlrpclib.Fault(1, 'XML not well-formed (invalid token)')))
+        self.assertFalse(network._refused_encoding(
+            xmlrpclib.Fault(1, 'Unknown method')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+import os
+import signal
+import threading
+import time
+import unittest
+
+import pipeline
+
+
+def double(batch):
+    return [item * 2 for item in batch]
+
+
+class PipelineTest(unittest.TestCase):
+    def build(self, *funcs):
+        return pipeline.Pipeline([
+            pipeline.Stage('stage%d' % index, func, batch_size=4,
+                           queue_size=2, linger=0)
+            for index, func in enumerate(funcs)])
+
+    def run_in_thread(self, files, *args, **kw):
+        """
+        Run files, failing if it doesn't return in time
+
+        @return: What run returned
+        """
+        returned = []
+        thread = threading.Thread(
+            target=lambda: returned.append(files.run(*args, **kw)))
+        thread.daemon = True
+        thread.start()
+        thread.join(10)
+        self.assertFalse(thread.is_alive(), 'The run never returned')
+        return returned[0]
+
+    def test_results(self):
+        files = self.build(double, double)
+        self.assertEqual(sorted(self.run_in_thread(files, range(100))),
+                         [item * 4 for item in range(100)])
+        self.assertFalse(files.cancelled.is_set())
+        self.assertEqual([metrics['processed']
+                          for _, metrics in files.metrics()], [100, 100])
+
+    def test_failing_stage(self):
+        def fail_on_odd(batch):
+            if batch[0] % 2:
+                raise ValueError('odd')
+            return batch
+
+        files = pipeline.Pipeline([
+            pipeline.Stage('fail', fail_on_odd, linger=0)])
+        self.assertEqual(sorted(self.run_in_thread(files, range(10))),
+                         [0, 2, 4, 6, 8])
+        self.assertFalse(files.cancelled.is_set())
+
+    def test_failing_output_cancels(self):
+        def output(item):
+            raise IOError('Client went away')
+
+        # Far more items than the queues hold: upstream stages would block
+        # if nothing took them anymore
+        files = self.build(double, double)
+        self.run_in_thread(files, range(1000), output=output)
+        self.assertTrue(files.cancelled.is_set())
+        self.assertTrue(files.metrics()[0][1]['processed'] < 1000)
+
+    def test_cancelled_by_caller(self):
+        cancelled = threading.Event()
+        written = []
+
+        def output(item):
+            written.append(item)
+            cancelled.set()
+
+        files = self.build(double)
+        self.run_in_thread(files, range(1000), output=output,
+                           cancelled=cancelled)
+        self.assertTrue(files.cancelled.is_set())
+        self.assertTrue(len(written) < 1000)
+
+    def test_call_in_main_thread(self):
+        def where(item):
+            return item, threading.current_thread()
+
+        def ask(batch):
+            return [files.call(where, item) for item in batch]
+
+        files = self.build(ask)
+        results = files.run(range(5))
+        self.assertEqual(sorted(item for item, _ in results), range(5))
+        threads = set(thread for _, thread in results)
+        self.assertEqual(threads, set([threading.current_thread()]))
+        # Outside of a run, just a call
+        self.assertEqual(files.call(abs, -1), 1)
+
+
+class InterruptTest(unittest.TestCase):
+    def setUp(self):
+        self.handler = signal.signal(signal.SIGINT,
+                                     signal.default_int_handler)
+
+    def tearDown(self):
+        signal.signal(signal.SIGINT, self.handler)
+
+    def test_sigint(self):
+        def interrupt(batch):
+            if batch[0] == 3:
+                # Like Ctrl-C: the main thread gets it
+                os.kill(os.getpid(), signal.SIGINT)
+            time.sleep(0.01)
+            return batch
+
+        files = pipeline.Pipeline([
+            pipeline.Stage('slow', interrupt, queue_size=2, linger=0),
+            pipeline.Stage('next', lambda batch: batch, linger=0)])
+        begin = time.time()
+        self.assertRaises(KeyboardInterrupt, files.run, range(100000))
+        self.assertTrue(time.time() - begin < 5)
+        self.assertTrue(files.cancelled.is_set())
+        # The batches being processed were waited for
+        for threads in files.groups:
+            for thread in threads:
+                self.assertFalse(thread.is_alive())
+
+    def test_interrupted_call(self):
+        def interrupted():
+            raise KeyboardInterrupt()
+
+        cancelled = []
+
+        def ask(batch):
+            try:
+                files.call(interrupted)
+            except pipeline.Cancelled:
+                cancelled.append(batch)
+                raise
+            return batch
+
+        files = pipeline.Pipeline([pipeline.Stage('ask', ask, linger=0)])
+        self.assertRaises(KeyboardInterrupt, files.run, range(10))
+        self.assertEqual(cancelled, [[0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import quota
+
+
+class Clock(object):
+    """
+    Clock moved by hand
+    """
+    def __init__(self, now=1000000000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class QuotaTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.quota = quota.Quota(window=100, clock=self.clock)
+
+    def test_unknown(self):
+        self.assertEqual(self.quota.take(50), 50)
+        self.assertEqual(self.quota.next_window(), 0)
+
+    def test_count_down(self):
+        self.quota.update(5)
+        self.assertEqual(self.quota.take(3), 3)
+        self.assertEqual(self.quota.next_window(), 0)
+        self.assertEqual(self.quota.take(3), 2)
+        self.assertEqual(self.quota.next_window(), self.clock.now + 100)
+        self.assertEqual(self.quota.take(1), 0)
+
+    def test_give_back(self):
+        self.quota.update(2)
+        self.assertEqual(self.quota.take(2), 2)
+        self.quota.give_back(1)
+        self.assertEqual(self.quota.next_window(), 0)
+        self.assertEqual(self.quota.take(2), 1)
+
+    def test_window_over(self):
+        self.quota.update(0)
+        self.assertEqual(self.quota.next_window(), self.clock.now + 100)
+        self.clock.now += 99
+        self.assertEqual(self.quota.take(1), 0)
+        # Telling again that nothing is left doesn't push the window back
+        self.quota.update(0)
+        self.clock.now += 1
+        self.assertEqual(self.quota.next_window(), 0)
+        self.assertEqual(self.quota.take(10), 10)
+
+    def test_exhausted(self):
+        self.quota.update(10)
+        self.quota.exhausted()
+        self.assertEqual(self.quota.take(1), 0)
+        self.clock.now += 100
+        self.assertEqual(self.quota.take(1), 1)
+
+    def test_server_tells_it_is_back(self):
+        self.quota.exhausted()
+        self.quota.update(3)
+        self.assertEqual(self.quota.next_window(), 0)
+        self.assertEqual(self.quota.take(5), 3)
+
+
+class PriorityTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def touch(self, name, mtime):
+        path = os.path.join(self.directory, name)
+        open(path, 'wb').close()
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_watchlist_first(self):
+        key = quota.priority(watchlist=['The Wire', '', 'Up'])
+        paths = ['Other.avi', 'the.wire.s01e01.avi', 'Upside.avi', 'Up.avi']
+        self.assertEqual(sorted(paths, key=key),
+                         ['the.wire.s01e01.avi', 'Up.avi', 'Other.avi',
+                          'Upside.avi'])
+        # Identified names count too
+        self.assertTrue(key('a.avi', 'The Wire') < key('b.avi'))
+
+    def test_newest(self):
+        old = self.touch('old.avi', 1000)
+        new = self.touch('new.avi', 2000)
+        watched = self.touch('Up.avi', 0)
+        key = quota.priority('newest', ['Up'])
+        self.assertEqual(sorted([old, new, watched], key=key),
+                         [watched, new, old])
+        self.assertEqual(key(os.path.join(self.directory, 'gone.avi')),
+                         (True, 0))
+
+    def test_invalid_policy(self):
+        self.assertRaises(ValueError, quota.priority, 'biggest')
+
+    def test_load_watchlist(self):
+        path = os.path.join(self.directory, 'watchlist')
+        with open(path, 'w') as f:
+            f.write('# Shows\nThe Wire\n\n  Up  \n')
+        self.assertEqual(quota.load_watchlist(path), ['The Wire', 'Up'])
+
+
+if __name__ == '__main__':
+    unittest.main()
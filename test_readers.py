@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+import BaseHTTPServer
+import os
+import re
+import shutil
+import StringIO
+import struct
+import tempfile
+import threading
+import unittest
+import zipfile
+
+import readers
+
+
+def rar_block(kind, flags, body=''):
+    """
+    @return: RAR 4 block, its CRC left out
+    """
+    return struct.pack('<HBHH', 0, kind, flags, 7 + len(body)) + body
+
+
+def rar_file(name, data, flags=0, method=readers.RAR_STORED, size=None):
+    """
+    @param size: Size of the member, if not all of it is in data (split
+    over volumes)
+    @return: RAR 4 file header followed by data
+    """
+    body = struct.pack('<IIBIIBBHI', len(data), size or len(data), 0, 0, 0,
+                       20, method, len(name), 0)
+    if flags & readers.RAR_LARGE:
+        body += struct.pack('<II', 0, 0)
+    return rar_block(readers.RAR_FILE, flags | readers.RAR_LONG_BLOCK,
+                     body + name) + data
+
+
+def rar(*entries):
+    """
+    @return: RAR 4 volume holding entries, see L{rar_file}
+    """
+    return (readers.RAR_SIGNATURE + rar_block(0x73, 0, '\0' * 6) +
+            ''.join(entries) + rar_block(readers.RAR_END, 0))
+
+
+class RarTest(unittest.TestCase):
+    def test_members(self):
+        reader = readers.BytesReader(rar(
+            rar_file('movie.mkv', 'movie'),
+            rar_file('packed.mkv', 'packed', method=0x33),
+            rar_file('secret.mkv', 'secret', flags=readers.RAR_ENCRYPTED),
+            rar_file('dir', '', flags=readers.RAR_DIRECTORY),
+            rar_file('Sub\\episode.avi', 'episode'),
+        ))
+        self.assertEqual(readers.rar_members(reader),
+                         ['movie.mkv', 'Sub/episode.avi'])
+
+    def test_header_variants(self):
+        reader = readers.BytesReader(rar(
+            rar_file('large.mkv', 'large', flags=readers.RAR_LARGE),
+            rar_file('unicode.mkv\0\x01\x02', 'unicode',
+                     flags=readers.RAR_UNICODE),
+        ))
+        self.assertEqual(readers.rar_members(reader),
+                         ['large.mkv', 'unicode.mkv'])
+
+    def test_member_data(self):
+        reader = readers.BytesReader(rar(
+            rar_file('first.mkv', 'first data'),
+            rar_file('second.mkv', 'second data'),
+        ))
+        member = readers.SegmentsReader(
+            readers.rar_member(reader, 'second.mkv'))
+        self.assertEqual(member.size, 11)
+        self.assertEqual(member.read(0, member.size), 'second data')
+        self.assertEqual(member.read(7, 100), 'data')
+
+    def test_missing_member(self):
+        reader = readers.BytesReader(rar(rar_file('movie.mkv', 'movie')))
+        self.assertRaises(Exception, readers.rar_member, reader, 'other.mkv')
+
+    def test_compressed_member(self):
+        reader = readers.BytesReader(rar(
+            rar_file('movie.mkv', 'movie', method=0x33)))
+        self.assertRaises(Exception, readers.rar_member, reader, 'movie.mkv')
+
+    def test_not_rar(self):
+        for data in ('PK\x03\x04' + '\0' * 20,
+                     readers.RAR5_SIGNATURE + '\0' * 20):
+            self.assertRaises(Exception, list,
+                              readers._rar_entries(readers.BytesReader(data)))
+
+    def test_corrupt_header(self):
+        data = readers.RAR_SIGNATURE + struct.pack('<HBHH', 0, 0x73, 0, 3)
+        self.assertRaises(Exception, list,
+                          readers._rar_entries(readers.BytesReader(data)))
+
+    def test_volume_names(self):
+        self.assertEqual(readers.rar_volume('a/Movie.part1.rar', 1),
+                         'a/Movie.part2.rar')
+        self.assertEqual(readers.rar_volume('Movie.part09.rar', 1),
+                         'Movie.part10.rar')
+        self.assertEqual(readers.rar_volume('Movie.rar', 0), 'Movie.rar')
+        self.assertEqual(readers.rar_volume('Movie.rar', 2), 'Movie.r01')
+
+
+class RarVolumesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        volumes = [
+            rar(rar_file('movie.mkv', 'first ', size=18,
+                         flags=readers.RAR_SPLIT_AFTER)),
+            rar(rar_file('movie.mkv', 'second ', size=18,
+                         flags=readers.RAR_SPLIT_BEFORE |
+                         readers.RAR_SPLIT_AFTER)),
+            rar(rar_file('movie.mkv', 'third', size=18,
+                         flags=readers.RAR_SPLIT_BEFORE)),
+        ]
+        for index, volume in enumerate(volumes):
+            path = os.path.join(self.directory,
+                                'movie.part%d.rar' % (index + 1))
+            with open(path, 'wb') as f:
+                f.write(volume)
+        self.location = os.path.join(self.directory, 'movie.part1.rar')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_split_member(self):
+        self.assertEqual(readers.archive_members(self.location),
+                         [self.location + '/movie.mkv'])
+        with readers.open_reader(self.location + '/movie.mkv') as reader:
+            self.assertEqual(reader.size, 18)
+            self.assertEqual(reader.read(0, 18), 'first second third')
+            self.assertEqual(reader.read(4, 6), 't seco')
+
+    def test_missing_volume(self):
+        os.remove(os.path.join(self.directory, 'movie.part3.rar'))
+        self.assertRaises(Exception, readers.open_reader,
+                          self.location + '/movie.mkv')
+
+
+def zip_archive(members, compression=zipfile.ZIP_STORED):
+    """
+    @param members: List of (name, data)
+    @return: Zip archive holding members
+    """
+    data = StringIO.StringIO()
+    archive = zipfile.ZipFile(data, 'w', compression)
+    for name, member in members:
+        archive.writestr(name, member)
+    archive.close()
+    return data.getvalue()
+
+
+class RangeHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Serve the files of the server, honoring ranges as its mode says
+    """
+    def do_GET(self):
+        data = self.server.files.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        self.server.requests.append(self.headers.get('Range'))
+
+        match = re.match(r'bytes=(\d+)-(\d+)$', self.headers.get('Range', ''))
+        if not match or self.server.mode == 'full':
+            self.send_response(200)
+            body = data
+        else:
+            first, last = int(match.group(1)), int(match.group(2))
+            if self.server.mode == 'short':
+                last = min(last, first + self.server.chunk - 1)
+            body = data[first:last + 1]
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes %d-%d/%d' % (
+                first, first + len(body) - 1, len(data)))
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPReaderTest(unittest.TestCase):
+    DATA = ''.join(chr(index % 251) for index in range(10000))
+
+    def setUp(self):
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0),
+                                                RangeHandler)
+        self.server.mode = 'range'
+        self.server.chunk = 1000
+        self.server.requests = []
+        self.server.files = {
+            '/movie.mkv': self.DATA,
+            '/archive.zip': zip_archive([('movie.mkv', self.DATA),
+                                         ('other.avi', 'other')]),
+        }
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       args=(0.05,))
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = 'http://127.0.0.1:%d' % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_ranges(self):
+        with readers.open_reader(self.url + '/movie.mkv') as reader:
+            self.assertEqual(reader.size, len(self.DATA))
+            self.assertEqual(reader.read(0, 100), self.DATA[:100])
+            self.assertEqual(reader.read(9000, 500), self.DATA[9000:9500])
+        self.assertEqual(self.server.requests,
+                         ['bytes=0-0', 'bytes=0-99', 'bytes=9000-9499'])
+
+    def test_read_past_end(self):
+        with readers.open_reader(self.url + '/movie.mkv') as reader:
+            self.assertEqual(reader.read(9900, 500), self.DATA[9900:])
+            self.assertEqual(reader.read(20000, 10), '')
+
+    def test_short_answers(self):
+        self.server.mode = 'short'
+        with readers.open_reader(self.url + '/movie.mkv') as reader:
+            self.assertEqual(reader.read(500, 2500), self.DATA[500:3000])
+        self.assertEqual(self.server.requests[1:], [
+            'bytes=500-2999', 'bytes=1500-2999', 'bytes=2500-2999'])
+
+    def test_ranges_not_supported(self):
+        self.server.mode = 'full'
+        self.assertRaises(Exception, readers.open_reader,
+                          self.url + '/movie.mkv')
+
+    def test_zip_member(self):
+        location = self.url + '/archive.zip'
+        self.assertEqual(readers.archive_members(location),
+                         [location + '/movie.mkv', location + '/other.avi'])
+        with readers.open_reader(location + '/movie.mkv') as reader:
+            self.assertEqual(reader.size, len(self.DATA))
+            self.assertEqual(reader.read(0, 64), self.DATA[:64])
+            self.assertEqual(reader.read(9936, 64), self.DATA[-64:])
+
+
+class ZipTest(unittest.TestCase):
+    def test_stored_member(self):
+        reader = readers.BytesReader(zip_archive([('a.mkv', 'first'),
+                                                  ('b.mkv', 'second')]))
+        self.assertEqual(readers.zip_members(reader), ['a.mkv', 'b.mkv'])
+        member = readers.SegmentsReader(readers.zip_member(reader, 'b.mkv'))
+        self.assertEqual(member.read(0, member.size), 'second')
+
+    def test_compressed_member(self):
+        reader = readers.BytesReader(zip_archive(
+            [('a.mkv', 'a' * 1000)], zipfile.ZIP_DEFLATED))
+        self.assertEqual(readers.zip_members(reader), [])
+        self.assertRaises(Exception, readers.zip_member, reader, 'a.mkv')
+
+
+if __name__ == '__main__':
+    unittest.main()
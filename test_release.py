@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import release
+
+NAMES = [
+    ('Show.Name.S01E02E03.720p.HDTV.x264-GROUP.mkv',
+     ('Show Name', None, 1, (2, 3), '720p', 'GROUP')),
+    ('Movie Name (2010) 1080p BluRay.avi',
+     ('Movie Name', 2010, None, (), '1080p', None)),
+    ('blade.runner.2049.2017.1080p.mkv',
+     ('blade runner 2049', 2017, None, (), '1080p', None)),
+    ('Blade Runner 2049 (2017) 1080p BluRay-GRP.mkv',
+     ('Blade Runner 2049', 2017, None, (), '1080p', 'GRP')),
+    ('Space.1999.1975.S01E01.mkv',
+     ('Space 1999', 1975, 1, (1,), None, None)),
+    ('Movie.2010-GRP.mkv', ('Movie', 2010, None, (), None, 'GRP')),
+    ('2012.2009.720p.mkv', ('2012', 2009, None, (), '720p', None)),
+    ('Show.S01E01.2019.mkv', ('Show', 2019, 1, (1,), None, None)),
+    ('show_name_s02e10_hdtv.avi', ('show name', None, 2, (10,), None, None)),
+    ('Show Name - 3x07-08 - Title.avi',
+     ('Show Name', None, 3, (7, 8), None, None)),
+    ('[SubGroup] Show Name - 1x05 [720p].mkv',
+     ('Show Name', None, 1, (5,), '720p', 'SubGroup')),
+    ('Spider-Man.mkv', ('Spider-Man', None, None, (), None, None)),
+    ('Movie.Name.4k.WEB-DL.mkv', ('Movie Name', None, None, (), '4k', None)),
+    ('Movie.Without.Extension',
+     ('Movie Without Extension', None, None, (), None, None)),
+]
+"Release names and their expected fields"
+
+
+class ParseTest(unittest.TestCase):
+    def test_names(self):
+        for name, expected in NAMES:
+            self.assertEqual(tuple(release.parse(name)), expected, name)
+
+    def test_directories_ignored(self):
+        self.assertEqual(release.parse('/media/Show.S01E01/Other.S02E03.mkv'),
+                         release.parse('Other.S02E03.mkv'))
+
+    def test_memoized(self):
+        name = 'Cached.Movie.2011.mkv'
+        self.assertIs(release.parse(name), release.parse(name))
+
+    def test_cache_bounded(self):
+        for index in range(release.CACHE_SIZE + 10):
+            release.parse('Movie.%d.mkv' % index)
+        self.assertTrue(len(release._cache) <= release.CACHE_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import misses
+import quota
+import subgetter
+import tvsubtitles
+
+
+def element(identifier, body):
+    """
+    @return: EBML element, its size on 8 bytes
+    """
+    return (struct.pack('>I', identifier).lstrip('\0') +
+            struct.pack('>Q', len(body) | 1 << 56) + body)
+
+
+def matroska(subtitle_languages, padding=200000):
+    """
+    @return: Matroska file with a video track, and a subtitle track in each
+    language
+    """
+    tracks = element(0xAE, element(0x83, '\x01'))
+    for language in subtitle_languages:
+        tracks += element(0xAE, element(0x83, '\x11') +
+                          element(0x22B59C, language))
+    segment = (element(0x1654AE6B, tracks) +
+               element(0x1F43B675, '\0' * padding))
+    return (element(0x1A45DFA3, element(0x4282, 'matroska')) +
+            element(0x18538067, segment))
+
+
+class FakeOpenSubtitles(object):
+    """
+    Finds a subtitle in every language, or none, and remembers what was
+    searched
+    """
+    def __init__(self, found=True):
+        self.quota = quota.Quota()
+        self.found = found
+        self.searched = []
+
+    def check_hashes(self, hashes):
+        return {}
+
+    def search_on_imdb_names(self, names):
+        return dict((name, []) for name in names)
+
+    def download_subtitles_languages(self, movies, languages):
+        self.searched.extend((movie['name'], language)
+                             for movie in movies for language in languages)
+        if not self.found:
+            return {}
+        return dict(((movie['hash'], language), 'subtitle in ' + language)
+                    for movie in movies for language in languages)
+
+
+def osdb_info(name, kind, imdbid, season=0, episode=0):
+    """
+    @return: check_hashes info of a movie
+    """
+    return {'MovieName': name, 'MovieKind': kind, 'MovieImdbID': str(imdbid),
+            'MovieYear': '2010', 'SeriesSeason': str(season),
+            'SeriesEpisode': str(episode)}
+
+
+class IdentifyEpisodesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.moviefiles = []
+        for episode in range(1, 4):
+            path = os.path.join(self.directory,
+                                'Show.Name.S01E%02d.avi' % episode)
+            with open(path, 'wb') as f:
+                # Distinct hashes, without writing whole files
+                f.write(struct.pack('<q', episode))
+                f.truncate(256 * 1024)
+            self.moviefiles.append(subgetter.MovieFile(path))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def identify(self, infos):
+        movies_info = dict((moviefile.hash, info) for moviefile, info
+                           in zip(self.moviefiles, infos) if info)
+        subgetter.identify_episodes(self.moviefiles, movies_info,
+                                    subgetter.AutomaticAsker(0.7))
+        return [(moviefile.name, moviefile.season, moviefile.episode,
+                 moviefile.imdbid) for moviefile in self.moviefiles]
+
+    def test_show_from_first_identified_episode(self):
+        # The first file osdb knows is a movie that doesn't match
+        self.assertEqual(self.identify([
+            [osdb_info('Unrelated Feature', 'movie', 11)],
+            [osdb_info('"Show: Name" Second', 'episode', 12, 1, 2)],
+            None,
+        ]), [
+            ('Show: Name', 1, 1, 0),
+            ('Show: Name', 1, 2, 12),
+            ('Show: Name', 1, 3, 0),
+        ])
+
+    def test_sibling_of_another_show_kept(self):
+        self.assertEqual(self.identify([
+            [osdb_info('"Show Name" First', 'episode', 11, 1, 1)],
+            None,
+            [osdb_info('"Other Show" Third', 'episode', 13, 1, 3)],
+        ]), [
+            ('Show Name', 1, 1, 11),
+            ('Show Name', 1, 2, 0),
+            ('Other Show', 1, 3, 13),
+        ])
+
+    def test_show_guessed(self):
+        self.assertEqual(self.identify([None, None, None]), [
+            ('Show Name', 1, 1, 0),
+            ('Show Name', 1, 2, 0),
+            ('Show Name', 1, 3, 0),
+        ])
+
+
+class EmbeddedSubtitlesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'movie.mkv')
+        with open(self.path, 'wb') as f:
+            f.write(matroska(['eng']))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_pipeline(self, languages):
+        osdb = FakeOpenSubtitles()
+        files = subgetter.build_pipeline(
+            osdb, subgetter.AutomaticAsker(0.7),
+            subgetter.select_languages(languages))
+        written = []
+        files.run([self.path], output=written.append)
+        return osdb, written
+
+    def test_embedded_language_not_downloaded(self):
+        osdb, written = self.run_pipeline('eng,fre')
+        self.assertEqual(osdb.searched, [('movie.mkv', 'fre')])
+        self.assertEqual([language for _, language, _ in written], ['fre'])
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['movie.fr.srt', 'movie.mkv'])
+
+    def test_all_embedded(self):
+        osdb, written = self.run_pipeline('eng')
+        self.assertEqual(osdb.searched, [])
+        self.assertEqual(written, [])
+        self.assertEqual(os.listdir(self.directory), ['movie.mkv'])
+
+
+class MissesTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'Show.S01E01.avi')
+        with open(path, 'wb') as f:
+            f.truncate(256 * 1024)
+        self.moviefile = subgetter.MovieFile(path)
+        self.moviefile.update_info(
+            subgetter.Movie('Show', subgetter.Movie.EPISODE, 0, 1, 1))
+        self.misses = misses.MissCache(os.path.join(self.directory,
+                                                    'misses'))
+        self.download_subtitles = tvsubtitles.download_subtitles
+
+    def tearDown(self):
+        tvsubtitles.download_subtitles = self.download_subtitles
+        shutil.rmtree(self.directory)
+
+    def download(self, tvsub):
+        tvsubtitles.download_subtitles = lambda episodes: dict(
+            (episode, tvsub) for episode in episodes)
+        (download,) = subgetter.download_subtitles(
+            [self.moviefile], FakeOpenSubtitles(found=False),
+            subgetter.select_languages('eng'), self.misses)
+        return download[3]
+
+    def test_not_found(self):
+        self.assertIsNone(self.download(None))
+        self.assertTrue(self.misses.should_skip(self.moviefile.hash, 'eng'))
+
+    def test_search_failed(self):
+        self.assertIs(self.download(tvsubtitles.FAILED), tvsubtitles.FAILED)
+        self.assertFalse(self.misses.should_skip(self.moviefile.hash,
+                                                 'eng'))
+
+    def test_found(self):
+        self.misses.missed(self.moviefile.hash, 'eng')
+        self.misses.retry = True
+        self.assertEqual(self.download('subtitle'), 'subtitle')
+        self.assertEqual(self.misses.retry_time(self.moviefile.hash, 'eng'),
+                         0)
+
+
+class MoviesOnlyTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.download_subtitles = tvsubtitles.download_subtitles
+
+    def tearDown(self):
+        tvsubtitles.download_subtitles = self.download_subtitles
+        shutil.rmtree(self.directory)
+
+    def test_tvsubtitles_not_called(self):
+        def download_subtitles(episodes):
+            self.fail('tvsubtitles called without episodes')
+
+        path = os.path.join(self.directory, 'Movie.avi')
+        with open(path, 'wb') as f:
+            f.truncate(256 * 1024)
+        moviefile = subgetter.MovieFile(path)
+        moviefile.update_info(subgetter.Movie('Movie'))
+        tvsubtitles.download_subtitles = download_subtitles
+        (download,) = subgetter.download_subtitles(
+            [moviefile], FakeOpenSubtitles(found=False),
+            subgetter.select_languages('eng'))
+        self.assertIsNone(download[3])
+
+
+class TVSubtitlesFailureTest(unittest.TestCase):
+    EPISODE = ('Show', 1, 1, 'en')
+
+    def setUp(self):
+        self.find_tvshow = tvsubtitles.find_tvshow
+
+    def tearDown(self):
+        tvsubtitles.find_tvshow = self.find_tvshow
+
+    def test_no_show(self):
+        tvsubtitles.find_tvshow = lambda tvshow: None
+        self.assertEqual(tvsubtitles.download_subtitles([self.EPISODE]),
+                         {self.EPISODE: None})
+
+    def test_request_failed(self):
+        def fail(tvshow):
+            raise IOError('Network is unreachable')
+
+        tvsubtitles.find_tvshow = fail
+        logger = logging.getLogger('tvsubtitles')
+        logger.disabled = True
+        try:
+            subs = tvsubtitles.download_subtitles([self.EPISODE])
+        finally:
+            logger.disabled = False
+        self.assertEqual(subs, {self.EPISODE: tvsubtitles.FAILED})
+
+
+if __name__ == '__main__':
+    unittest.main()
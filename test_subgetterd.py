@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+import pipeline
+import subgetterd
+
+
+class JobServerTest(unittest.TestCase):
+    ITEMS = 100000
+    "Items of a job, far more than the socket buffers hold as events"
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'subgetter.sock')
+        self.finished = threading.Event()
+        self.files = None
+        self.server = subgetterd.JobServer(self.path, self.run_job)
+        thread = threading.Thread(target=self.server.serve_forever,
+                                  args=(0.05,))
+        thread.daemon = True
+        thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def run_job(self, job, emit, cancelled):
+        def report(item):
+            emit({'event': 'subtitle', 'path': str(item), 'language': 'eng',
+                  'subtitle': None})
+
+        self.files = pipeline.Pipeline([
+            pipeline.Stage('echo', lambda batch: batch, batch_size=10,
+                           queue_size=4)])
+        try:
+            self.files.run(range(job['count']), output=report,
+                           cancelled=cancelled)
+        finally:
+            self.finished.set()
+
+    def test_events(self):
+        events = list(subgetterd.submit(self.path, {'count': 20}))
+        self.assertEqual(sorted(int(event['path']) for event in events),
+                         range(20))
+        self.assertTrue(self.finished.wait(10))
+        self.assertFalse(self.files.cancelled.is_set())
+
+    def test_client_gone(self):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(self.path)
+        client.sendall(json.dumps({'count': self.ITEMS}) + '\n')
+        stream = client.makefile()
+        self.assertEqual(json.loads(stream.readline())['event'], 'subtitle')
+        stream.close()
+        client.close()
+
+        # The job stops instead of blocking its pipeline for ever
+        self.assertTrue(self.finished.wait(10), 'The job never finished')
+        self.assertTrue(self.files.cancelled.is_set())
+        self.assertTrue(
+            self.files.metrics()[0][1]['processed'] < self.ITEMS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import xmlrpclib
+
+import xmlrpcstream
+
+
+def answer(*params):
+    """
+    @return: XML-RPC answer with params, as sent by a server
+    """
+    return xmlrpclib.dumps(params, methodresponse=True, allow_none=True)
+
+
+SEARCH = answer({
+    'status': '200 OK',
+    'seconds': 0.25,
+    'data': [
+        {'IDSubtitleFile': str(index), 'MovieHash': 'abcdef%02d' % index,
+         'SubFileName': 'Movie.%d.srt' % index, 'SubRating': 8.5,
+         'SubDownloadsCnt': index * 10,
+         'Extra': {'nested': [1, 2, {'deep': 'value'}]}}
+        for index in range(5)
+    ],
+})
+"Search answer, its results holding more members than we use"
+
+
+class LoadsTest(unittest.TestCase):
+    def test_same_as_xmlrpclib(self):
+        values = [
+            'plain',
+            u'unicodé',
+            '',
+            42,
+            -7,
+            True,
+            False,
+            1.5,
+            None,
+            xmlrpclib.DateTime('20101010T10:10:10'),
+            xmlrpclib.Binary('\0binary\xff'),
+            [],
+            {},
+            [1, ['nested', {'in': 'array'}], {'a': [{'b': 2}]}],
+            {'struct': {'in': {'struct': [None, 'x']}}},
+        ]
+        for value in values:
+            data = answer(value)
+            self.assertEqual(xmlrpcstream.loads(data),
+                             xmlrpclib.loads(data)[0], value)
+        self.assertEqual(xmlrpcstream.loads(SEARCH),
+                         xmlrpclib.loads(SEARCH)[0])
+
+    def test_untyped_value(self):
+        data = ('<?xml version="1.0"?><methodResponse><params><param>'
+                '<value>untyped</value></param></params></methodResponse>')
+        self.assertEqual(xmlrpcstream.loads(data), xmlrpclib.loads(data)[0])
+
+    def test_fed_in_chunks(self):
+        for size in (1, 7, 100):
+            unmarshaller = xmlrpcstream.Unmarshaller()
+            for offset in range(0, len(SEARCH), size):
+                unmarshaller.feed(SEARCH[offset:offset + size])
+            self.assertEqual(unmarshaller.close(),
+                             xmlrpclib.loads(SEARCH)[0])
+
+    def test_fault(self):
+        data = xmlrpclib.dumps(xmlrpclib.Fault(4, 'Failed'),
+                               methodresponse=True)
+        try:
+            xmlrpcstream.loads(data)
+        except xmlrpclib.Fault as fault:
+            self.assertEqual((fault.faultCode, fault.faultString),
+                             (4, 'Failed'))
+        else:
+            self.fail('No fault raised')
+
+
+class FieldsTest(unittest.TestCase):
+    def test_array_structs_filtered(self):
+        (result,) = xmlrpcstream.loads(SEARCH,
+                                       ['IDSubtitleFile', 'MovieHash'])
+        # The answer struct itself is kept whole
+        self.assertEqual(sorted(result), ['data', 'seconds', 'status'])
+        self.assertEqual(result['data'], [
+            {'IDSubtitleFile': str(index), 'MovieHash': 'abcdef%02d' % index}
+            for index in range(5)
+        ])
+
+    def test_no_fields_kept(self):
+        (result,) = xmlrpcstream.loads(SEARCH, [])
+        self.assertEqual(result['data'], [{}] * 5)
+
+    def test_other_values_of_arrays_kept(self):
+        data = answer({'data': ['string', 1, [{'kept': 1, 'dropped': 2}]]})
+        (result,) = xmlrpcstream.loads(data, ['kept'])
+        self.assertEqual(result['data'], ['string', 1, [{'kept': 1}]])
+
+
+class EnoughTest(unittest.TestCase):
+    def test_stop_early(self):
+        seen = []
+
+        def enough(result):
+            seen.append(result['IDSubtitleFile'])
+            return len(seen) == 2
+
+        (result,) = xmlrpcstream.loads(SEARCH, ['IDSubtitleFile'], enough)
+        self.assertEqual(seen, ['0', '1'])
+        self.assertEqual(result['data'], [{'IDSubtitleFile': '0'},
+                                          {'IDSubtitleFile': '1'}])
+        # What follows the array is still decoded
+        self.assertEqual(result['status'], '200 OK')
+        self.assertEqual(result['seconds'], 0.25)
+
+    def test_never_enough(self):
+        (result,) = xmlrpcstream.loads(SEARCH, None, lambda result: False)
+        self.assertEqual(result, xmlrpclib.loads(SEARCH)[0][0])
+
+    def test_getparser(self):
+        parser, unmarshaller = xmlrpcstream.getparser(
+            ['MovieHash'], lambda result: True)
+        parser.feed(SEARCH)
+        parser.close()
+        (result,) = unmarshaller.close()
+        self.assertEqual(result['data'], [{'MovieHash': 'abcdef00'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
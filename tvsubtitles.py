@@ -7,17 +7,22 @@ This module can be used as an interface to TVSubtitles.net.
 Currently it uses some regex rather than html/xml parsing to find
 the values we need when downloading the pages.
 
-The main function to be called is L{download_subtitle}.
+The main function to be called is L{download_subtitle}, or
+L{download_subtitles} to get many episodes at once.
 """
 
 import argparse
+import logging
+import multiprocessing.pool
 import re
 import StringIO
+import threading
 import urllib
 import urlparse
 import zipfile
 
 import misc
+import network
 
 __author__ = "Antoine Pelisse"
 __copyright__ = "Copyright 2012, Antoine Pelisse"
@@ -28,6 +33,123 @@ __contact__ = "apelisse@gmail.com"
 BASE_URL = 'http://www.tvsubtitles.net'
 MINIMUM_COEF = 0.6
 "Minimum coefficient used to make sure found tv show matches"
+PROVIDER = 'tvsubtitles'
+"Name of the provider in the subtitle store"
+STORE = None
+"L{store.SubtitleStore} checked before downloading subtitles, if set"
+CACHE = None
+"L{httpcache.HTTPCache} used for season and episode pages, if set"
+CASSETTE = None
+"L{cassette.Cassette} recording or replaying every request, if set"
+MAX_CONNECTIONS = 4
+"Maximum number of concurrent connections to a single host"
+CONNECT_TIMEOUT = network.DEFAULT_CONNECT_TIMEOUT
+"Seconds to wait for a connection to tvsubtitles"
+READ_TIMEOUT = network.DEFAULT_READ_TIMEOUT
+"Seconds to wait for data from tvsubtitles"
+HEDGER = None
+"L{network.Hedger} used to hedge slow requests, if set"
+
+
+class Failed(object):
+    """
+    Placeholder of a subtitle we know nothing about, as a request failed
+    """
+    def __repr__(self):
+        return 'FAILED'
+
+    def __nonzero__(self):
+        # Not a subtitle we can write
+        return False
+
+
+FAILED = Failed()
+"Placeholder of the subtitles whose search failed, e.g. on a network error"
+
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+
+
+def _host_slot(url):
+    """
+    Get the semaphore limiting concurrent connections to the host of url
+
+    @param url: Url about to be requested
+    @return: Semaphore shared by all requests to that host
+    """
+    host = urlparse.urlparse(url).netloc
+    with _host_slots_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(MAX_CONNECTIONS)
+        return _host_slots[host]
+
+
+def _open(request, data=None):
+    """
+    Send a request to tvsubtitles, and read the whole answer
+
+    Requests are sent with L{CONNECT_TIMEOUT} and L{READ_TIMEOUT}, and
+    hedged through L{HEDGER} if it is set: every request we send to
+    tvsubtitles is a read, so it is safe to send it twice.
+
+    @param request: Url or C{urllib2.Request}
+    @param data: Urlencoded body for a POST request, None for GET
+    @return: Response, already read in memory
+    @raise urllib2.URLError: The request failed or timed out
+    """
+    if isinstance(request, basestring):
+        url = request
+    else:
+        url = request.get_full_url()
+
+    def attempt():
+        with _host_slot(url):
+            opener = network.build_opener(CONNECT_TIMEOUT, READ_TIMEOUT)
+            response = opener.open(request, data)
+            return urllib.addinfourl(StringIO.StringIO(response.read()),
+                                     response.info(),
+                                     response.geturl(),
+                                     response.getcode())
+
+    if HEDGER:
+        # Hedge latencies per kind of page: search, season, episode...
+        key = re.sub(r'\d+', '', urlparse.urlparse(url).path)
+        return HEDGER.call(key, attempt)
+
+    return attempt()
+
+
+def _urlopen(url, data=None):
+    """
+    Send a request to tvsubtitles, through the cassette if one is set
+
+    @param url: Url of the request
+    @param data: Urlencoded body for a POST request, None for GET
+    @return: Content of the answer
+    """
+    fetch = lambda: _open(url, data).read()
+
+    if CASSETTE:
+        return CASSETTE.play('http', url, data, fetch)
+
+    return fetch()
+
+
+def _fetch_page(url):
+    """
+    Get a listing page, through the HTTP cache if one is set
+
+    Listing pages (seasons, episodes) rarely change, so they are worth
+    revalidating rather than downloading again. The cache is bypassed
+    when a cassette is set, so that every exchange is recorded.
+
+    @param url: Url of the page
+    @return: Content of the page
+    """
+    if CACHE and not CASSETTE:
+        return CACHE.fetch(url, opener=_open)
+
+    return _urlopen(url)
 
 
 def search_tvshow(tvshow):
@@ -48,7 +170,7 @@ def search_tvshow(tvshow):
     search_path = urlparse.urljoin(BASE_URL, 'search.php')
     data = urllib.urlencode({'q': tvshow})
 
-    result = urllib.urlopen(search_path, data).read()
+    result = _urlopen(search_path, data)
 
     pattern = re.compile("""
     href=\"/tvshow-(?P<tvshowid>\d+)\.html\">
@@ -66,21 +188,41 @@ def search_episode(tvshowid, season, episode):
     @param tvshowid: Id of the tvshow in tvs database
     @param season: Season number you are interested in
     @param episode: Episode number you are looking for
-    @return: Id of the episode
+    @return: Id of the episode, None if not found
+    """
+    return _parse_episode(_fetch_season(tvshowid, season), season, episode)
+
+
+def _fetch_season(tvshowid, season):
     """
-    tvshowid = int(tvshowid)
-    season = int(season)
-    episode = int(episode)
+    Get the page listing the episodes of a season
 
+    @param tvshowid: Id of the tvshow in tvs database
+    @param season: Season number
+    @return: Content of the page
+    """
     search_path = urlparse.urljoin(BASE_URL, 'tvshow-%d-%d.html' % (
-        tvshowid, season))
+        int(tvshowid), int(season)))
+
+    return _fetch_page(search_path)
+
 
-    result = urllib.urlopen(search_path).read()
+def _parse_episode(page, season, episode):
+    """
+    Find episode id in a season page
 
+    @param page: Season page, as returned by L{_fetch_season}
+    @param season: Season number
+    @param episode: Episode number
+    @return: Id of the episode, None if not found
+    """
     match = re.search("""
     %dx%02d.*?href=\"episode-(?P<episodeid>\d+)\.html\">
-    """ % (season, episode), result, re.MULTILINE | re.VERBOSE | re.DOTALL)
+    """ % (int(season), int(episode)), page,
+        re.MULTILINE | re.VERBOSE | re.DOTALL)
 
+    if not match:
+        return None
     return match.group('episodeid')
 
 
@@ -95,17 +237,35 @@ def search_subtitles(episodeid, language):
     @param language: Language of the subtitles
     @return: List of all Subtitles Id
     """
-    episodeid = int(episodeid)
+    return _parse_subtitles(_fetch_episode(episodeid), language)
+
+
+def _fetch_episode(episodeid):
+    """
+    Get the page listing the subtitles of an episode, in all languages
+
+    @param episodeid: Episode of interest
+    @return: Content of the page
+    """
+    search_path = urlparse.urljoin(BASE_URL,
+                                   "episode-%d.html" % int(episodeid))
+
+    return _fetch_page(search_path)
 
-    search_path = urlparse.urljoin(BASE_URL, "episode-%d.html" % episodeid)
 
-    result = urllib.urlopen(search_path).read()
+def _parse_subtitles(page, language):
+    """
+    Find subtitles of a language in an episode page
 
+    @param page: Episode page, as returned by L{_fetch_episode}
+    @param language: Language of the subtitles
+    @return: List of all Subtitles Id
+    """
     matches = re.findall("""
     subtitle-(?P<subid>\d+).html
     .*?
     flags/(?P<language>\w+).gif
-    """, result, re.VERBOSE | re.MULTILINE | re.DOTALL)
+    """, page, re.VERBOSE | re.MULTILINE | re.DOTALL)
 
     return [subid for subid, lang in matches if lang == language]
 
@@ -119,7 +279,17 @@ def download_subid(subid):
     """
     subid = int(subid)
 
-    return _download_file(subid)
+    if STORE:
+        sub = STORE.get(PROVIDER, subid)
+        if sub is not None:
+            return sub
+
+    sub = _download_file(subid)
+
+    if STORE:
+        STORE.put(PROVIDER, subid, sub)
+
+    return sub
 
 
 def _download_subid(subid):
@@ -137,7 +307,7 @@ def _download_subid(subid):
         self.base_url,
         "subtitle-%d.html" % subid)
 
-    result = urllib.urlopen(search_path).read()
+    result = _urlopen(search_path)
 
     match = re.search("href=\"download-(\d+).html\"", result)
 
@@ -153,7 +323,7 @@ def _download_file(fileid):
     """
     download_path = urlparse.urljoin(BASE_URL, "download-%d.html" % fileid)
 
-    result = urllib.urlopen(download_path).read()
+    result = _urlopen(download_path)
 
     fzip = zipfile.ZipFile(StringIO.StringIO(result))
 
@@ -187,26 +357,125 @@ def download_subtitle(tvshow, season, episode, language):
     @param episode: Episode number
     @param language: Language of the subtitle required
     """
+    tvid = find_tvshow(tvshow)
+    if not tvid:
+        return None
+
+    episodeid = search_episode(tvid, season, episode)
+    if not episodeid:
+        return None
+
+    subid = search_subtitles(episodeid, language)
+
+    if not subid:
+        return None
+    return download_subid(subid[0])
+
+
+def find_tvshow(tvshow):
+    """
+    Find the id of the tvshow that matches the best the given name
+
+    @param tvshow: Tvshow name
+    @return: Id of the tvshow, None if nothing matches well enough
+    """
     tvshowids = search_tvshow(tvshow)
 
     # Let's find the tv show that matches the best
+    query = misc.bigram_profile(tvshow)
     tvid = None
     best_match = 0
     for showid, showname in tvshowids:
-        match = misc.dice_coefficient(showname, tvshow, ignore_case=True)
+        match = misc.BigramProfile(showname).dice(query)
         if match > best_match and match > MINIMUM_COEF:
             best_match = match
             tvid = showid
 
-    if not tvid:
-        return None
+    return tvid
 
-    episodeid = search_episode(tvid, season, episode)
-    subid = search_subtitles(episodeid, language)
 
-    if not subid:
-        return None
-    return download_subid(subid[0])
+def _pool_map(pool, func, keys):
+    """
+    Apply func to every key, concurrently, and keep going on failures
+
+    @param pool: Thread pool to run func in
+    @param func: Function to apply
+    @param keys: Iterable of arguments
+    @return: Dict {key: result}, result is L{FAILED} if func failed
+    """
+    logger = logging.getLogger(__name__)
+
+    def safe(key):
+        try:
+            return func(*key) if isinstance(key, tuple) else func(key)
+        except Exception:
+            logger.exception('Request failed for %s', key)
+            return FAILED
+
+    keys = list(set(keys))
+    return dict(zip(keys, pool.map(safe, keys)))
+
+
+def download_subtitles(episodes, workers=MAX_CONNECTIONS):
+    """
+    Download subtitles for many episodes at once.
+
+    This runs the same steps as L{download_subtitle}, but each step is run
+    once for all episodes: shows and seasons shared by several episodes are
+    only looked up once, and independent requests of a step are sent
+    concurrently (still limited to L{MAX_CONNECTIONS} per host).
+
+    @param episodes: List of tuples (tvshow, season, episode, language)
+    @param workers: Number of concurrent requests
+    @return: Dict {(tvshow, season, episode, language): subtitle}, subtitle
+    is None when not found, L{FAILED} when a request it needed failed
+    """
+    episodes = [(tvshow, int(season), int(episode), language)
+                for tvshow, season, episode, language in episodes]
+
+    pool = multiprocessing.pool.ThreadPool(max(1, workers))
+    try:
+        tvids = _pool_map(pool, find_tvshow,
+                          [tvshow for tvshow, _, _, _ in episodes])
+
+        seasons = _pool_map(pool, _fetch_season,
+                            [(tvids[tvshow], season)
+                             for tvshow, season, _, _ in episodes
+                             if tvids[tvshow]])
+
+        episodeids = {}
+        for key in episodes:
+            tvshow, season, episode, _ = key
+            page = seasons.get((tvids[tvshow], season))
+            if page:
+                episodeids[key] = _parse_episode(page, season, episode)
+
+        # One page lists the subtitles of an episode in every language
+        pages = _pool_map(pool, _fetch_episode,
+                          [episodeid for episodeid in episodeids.values()
+                           if episodeid])
+
+        chosen = {}
+        for key, episodeid in episodeids.items():
+            if not pages.get(episodeid):
+                continue
+            found = _parse_subtitles(pages[episodeid], key[3])
+            if found:
+                chosen[key] = found[0]
+
+        subs = _pool_map(pool, download_subid, chosen.values())
+    finally:
+        pool.close()
+        pool.join()
+
+    results = {}
+    for key in episodes:
+        tvshow, season, _, _ = key
+        steps = (tvids[tvshow], seasons.get((tvids[tvshow], season)),
+                 pages.get(episodeids.get(key)), subs.get(chosen.get(key)))
+        # Nothing found after a failed step doesn't mean there is nothing
+        results[key] = FAILED if FAILED in steps else steps[-1]
+    return results
 
 
 def main():
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""
+Streaming decoder of XML-RPC answers, keeping only what we use.
+
+C{xmlrpclib} builds every member of every struct of an answer. Search
+answers list dozens of fields per result, and we only read a few of them,
+so L{Unmarshaller} drops the other members of the structs found in arrays
+as soon as their name is parsed, without decoding their value. It can also
+be told when it has enough results: the rest of the array is then skipped
+over without being decoded.
+
+It is driven by C{expat} directly and can be used in place of the parser
+and unmarshaller of C{xmlrpclib}, see L{network.TimeoutTransport.decoder}::
+
+    transport.decoder = lambda: getparser(['MovieHash', 'IDSubtitleFile'])
+"""
+
+import base64
+import xmlrpclib
+from xml.parsers import expat
+
+SCALARS = ('string', 'int', 'i4', 'i8', 'boolean', 'double',
+           'dateTime.iso8601', 'base64', 'nil')
+"Tags of the scalar types"
+
+
+def _string(text):
+    # Like xmlrpclib: plain strings when ascii, unicode otherwise
+    try:
+        text.decode('ascii')
+        return text
+    except UnicodeError:
+        return text.decode('utf-8')
+
+
+def _boolean(text):
+    if text not in ('0', '1'):
+        raise TypeError('Bad boolean value: %s' % text)
+    return text == '1'
+
+
+def _base64(text):
+    return xmlrpclib.Binary(base64.decodestring(text))
+
+
+CONVERTERS = {
+    'string': _string,
+    'int': int,
+    'i4': int,
+    'i8': int,
+    'boolean': _boolean,
+    'double': float,
+    'dateTime.iso8601': xmlrpclib.DateTime,
+    'base64': _base64,
+    'nil': lambda text: None,
+}
+
+
+class Unmarshaller(object):
+    """
+    Decode an XML-RPC answer fed in chunks.
+
+    It is both the parser and the unmarshaller returned by L{getparser}:
+    call L{feed} with the chunks of the answer, then L{close}.
+    """
+    def __init__(self, fields=None, enough=None):
+        """
+        Create decoder
+
+        @param fields: Names of the members kept in the structs that are
+        items of an array, None to keep them all. Structs outside of arrays
+        are always kept whole
+        @param enough: Optional function called with each struct decoded
+        in an array, returning True when the following items of the array
+        aren't needed
+        """
+        self.fields = None if fields is None else frozenset(fields)
+        self.enough = enough
+        self.params = []
+        self.fault = False
+        # Containers being built: [list or dict, filtered, member name]
+        self.stack = []
+        self.text = []
+        self.value = None
+        self.typed = False
+        # Elements left to close before decoding again, see __skip
+        self.skipped = 0
+
+        self.parser = expat.ParserCreate(None, None)
+        self.parser.returns_unicode = False
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self.__start
+        self.parser.EndElementHandler = self.__end
+        # Only set inside names and values: the whitespace between elements
+        # never reaches us
+        self.parser.CharacterDataHandler = None
+
+    def __skip(self):
+        """
+        Ignore everything until the end of the current element
+        """
+        self.skipped = 1
+
+    def __data(self, text):
+        self.text.append(text)
+
+    def __start(self, tag, attrs):
+        if self.skipped:
+            self.skipped += 1
+        elif tag == 'value':
+            self.text = []
+            self.typed = False
+            self.parser.CharacterDataHandler = self.__data
+        elif tag == 'name':
+            self.text = []
+            self.parser.CharacterDataHandler = self.__data
+        elif tag in SCALARS:
+            self.text = []
+        elif tag == 'struct' or tag == 'array':
+            self.parser.CharacterDataHandler = None
+            container = {} if tag == 'struct' else []
+            filtered = bool(tag == 'struct' and self.fields is not None and
+                            self.stack and
+                            isinstance(self.stack[-1][0], list))
+            self.stack.append([container, filtered, None])
+        elif tag == 'fault':
+            self.fault = True
+
+    def __end(self, tag):
+        if self.skipped:
+            self.skipped -= 1
+        elif tag == 'value':
+            self.parser.CharacterDataHandler = None
+            if not self.typed:
+                # No type means string
+                self.value = _string(''.join(self.text))
+            self.__add(self.value)
+        elif tag == 'name':
+            self.parser.CharacterDataHandler = None
+            name = ''.join(self.text)
+            top = self.stack[-1]
+            if top[1] and name not in self.fields:
+                # The value of the member isn't even decoded
+                self.__skip()
+            else:
+                top[2] = _string(name)
+        elif tag in CONVERTERS:
+            self.parser.CharacterDataHandler = None
+            self.value = CONVERTERS[tag](''.join(self.text))
+            self.typed = True
+        elif tag == 'struct' or tag == 'array':
+            self.value = self.stack.pop()[0]
+            self.typed = True
+
+    def __add(self, value):
+        if not self.stack:
+            self.params.append(value)
+            return
+
+        container, _, name = self.stack[-1]
+        if name is None:
+            container.append(value)
+            if (self.enough and isinstance(value, dict) and
+                    self.enough(value)):
+                # Skip the other items, up to the end of the array data
+                self.__skip()
+        else:
+            container[name] = value
+
+    def feed(self, data):
+        """
+        @param data: Next chunk of the answer
+        """
+        self.parser.Parse(data, False)
+
+    def close(self):
+        """
+        Finish decoding (can be called more than once)
+
+        @return: Tuple of the parameters of the answer
+        @raise xmlrpclib.Fault: The answer is a fault
+        """
+        if self.parser:
+            self.parser.Parse('', True)
+            # Get rid of the circular references through the handlers
+            self.parser = None
+
+        if self.fault:
+            raise xmlrpclib.Fault(**self.params[0])
+        return tuple(self.params)
+
+
+def getparser(fields=None, enough=None):
+    """
+    Same as C{xmlrpclib.getparser}, with a L{Unmarshaller}
+
+    @param fields: See L{Unmarshaller}
+    @param enough: See L{Unmarshaller}
+    @return: Tuple (parser, unmarshaller)
+    """
+    unmarshaller = Unmarshaller(fields, enough)
+    return unmarshaller, unmarshaller
+
+
+def loads(data, fields=None, enough=None):
+    """
+    Decode a whole answer, like C{xmlrpclib.loads} without the method name
+
+    @param data: XML-RPC answer
+    @param fields: See L{Unmarshaller}
+    @param enough: See L{Unmarshaller}
+    @return: Tuple of the parameters of the answer
+    """
+    unmarshaller = Unmarshaller(fields, enough)
+    unmarshaller.feed(data)
+    return unmarshaller.close()